@@ -1,8 +1,10 @@
 import tkinter as tk
 import datetime
+import os
 from model import Study
 from controller import TimeTracker
 from view import TimeTrackerGUI
+from diagnostics import run_mainloop
 
 
 if __name__ == "__main__":
@@ -16,4 +18,7 @@ if __name__ == "__main__":
 
     # view
     view = TimeTrackerGUI(root, controller)
-    root.mainloop()
+
+    # TIMETRACKER_PROFILE=cprofile or sampling profiles the whole session
+    run_mainloop(root, os.environ.get("TIMETRACKER_PROFILE"),
+                 os.environ.get("TIMETRACKER_PROFILE_FILE", "profile_report.txt"))
@@ -0,0 +1,178 @@
+import argparse
+import contextlib
+import datetime
+import json
+import os
+import sys
+import tempfile
+import timeit
+from model import Study
+from controller import TimeTracker
+from study_generator import generate_study
+
+# number of entries per module, the studies have 6 semesters with 6 modules
+SIZES = (10, 100, 1000)
+# reference baseline in the repository, see README
+BASELINE = os.path.join(os.path.dirname(
+    os.path.abspath(__file__)), "benchmark_baseline.json")
+# allowed slowdown compared to the baseline
+THRESHOLD = 0.2
+
+
+def get_benchmarks(study, tracker, tmp_dir):
+    '''gets the benchmarks of the hot paths
+
+    study: the generated study
+    tracker: a tracker holding the study
+    tmp_dir: directory for the files of the export and import
+
+    returns: dict of name -> function to benchmark
+    '''
+    semester = study.semesters[-1]
+    module = semester.modules[-1]
+    module_id = tracker.get_object_id(module)
+    semester_id = tracker.get_object_id(semester)
+    data = study.to_json()
+    filename = os.path.join(tmp_dir, "study.json")
+    tracker.export_to_json(filename)
+    empty_study = Study(180, 30, datetime.datetime.now())
+
+    return {
+        # a new study is used, so the benchmarked study does not grow
+        "Study.add_entry": lambda: empty_study.add_entry(semester.name, module.name, "Benchmark"),
+        "Study.get_durations": study.get_durations,
+        "Semester.get_durations": semester.get_durations,
+        "Module.get_durations": module.get_durations,
+        "get_filtered_data_list": lambda: tracker.get_filtered_data_list("", "", ""),
+        "get_filtered_data_list (filtered)": lambda: tracker.get_filtered_data_list(
+            semester.name, module.name, "Reading"),
+        "get_object_by_id": lambda: tracker.get_object_by_id(
+            module_id, tracker.get_object_by_id(semester_id)),
+        "Study.to_json": study.to_json,
+        "Study.from_json": lambda: Study.from_json(data),
+        "export_to_json": lambda: tracker.export_to_json(filename),
+        "import_from_json": lambda: tracker.import_from_json(filename),
+        "_get_burndown_chart_data": lambda: tracker._get_burndown_chart_data(study),
+        "get_rollup (week)": lambda: tracker.get_rollup(study, "week"),
+    }
+
+
+def measure(func, repeat=5):
+    '''measures the time of a function like timeit
+
+    the number of calls per round is chosen automatically
+
+    func: the function
+    repeat: the number of rounds
+
+    returns: dict with the minimum and the mean time per call in seconds
+    '''
+    timer = timeit.Timer(func)
+    number, _ = timer.autorange()
+    times = [t / number for t in timer.repeat(repeat, number)]
+    return {"min": min(times), "mean": sum(times) / len(times)}
+
+
+def run(sizes=SIZES, repeat=5, names=None):
+    '''runs the benchmarks
+
+    the settings and the study files are written to a temporary directory
+
+    sizes: the number of entries per module of the studies
+    repeat: the number of rounds of each benchmark
+    names: the names of the benchmarks to run, all if None
+
+    returns: dict of "name[entries]" -> result of measure
+    '''
+    results = {}
+    cwd = os.getcwd()
+    with tempfile.TemporaryDirectory() as tmp_dir, open(os.devnull, 'w') as devnull:
+        os.chdir(tmp_dir)
+        try:
+            for size in sizes:
+                study = generate_study(6, 6, size)
+                tracker = TimeTracker(study)
+                entries = size * 36
+                # the export and import print a message at every call
+                with contextlib.redirect_stdout(devnull):
+                    benchmarks = get_benchmarks(study, tracker, tmp_dir)
+                for name, func in benchmarks.items():
+                    if names and name not in names:
+                        continue
+                    with contextlib.redirect_stdout(devnull):
+                        result = measure(func, repeat)
+                    results[f"{name}[{entries}]"] = result
+                    print(f"{name + f'[{entries}]':<45}{result['min'] * 1e6:14.1f} us")
+        finally:
+            os.chdir(cwd)
+    return results
+
+
+def compare(results, baseline, threshold=THRESHOLD):
+    '''compares the results with a baseline
+
+    results: the results of run
+    baseline: the results of a previous run
+    threshold: the allowed slowdown (0.2 = 20%)
+
+    returns: list of (name, baseline time, time) of the regressions
+    '''
+    regressions = []
+    for name, result in results.items():
+        if name not in baseline:
+            continue
+        reference = baseline[name]["min"]
+        if result["min"] > reference * (1 + threshold):
+            regressions.append((name, reference, result["min"]))
+    return regressions
+
+
+def main(argv=None):
+    '''runs the benchmarks and compares them with the baseline
+
+    argv: the arguments, sys.argv is used if None
+
+    returns: 1 if there are regressions, 0 otherwise
+    '''
+    parser = argparse.ArgumentParser(
+        description="Benchmarks of the model and controller hot paths")
+    parser.add_argument("--sizes", nargs="+", type=int, default=list(SIZES),
+                        help="the number of entries per module")
+    parser.add_argument("--repeat", type=int, default=5,
+                        help="the number of rounds of each benchmark")
+    parser.add_argument("--names", nargs="+", help="the benchmarks to run")
+    parser.add_argument("--baseline", default=BASELINE,
+                        help="the file of the baseline")
+    parser.add_argument("--save", action="store_true",
+                        help="save the results as new baseline")
+    parser.add_argument("--threshold", type=float, default=THRESHOLD,
+                        help="the allowed slowdown compared to the baseline")
+    args = parser.parse_args(argv)
+    baseline_file = os.path.abspath(args.baseline)
+
+    results = run(args.sizes, args.repeat, args.names)
+
+    if args.save:
+        with open(baseline_file, 'w') as file:
+            json.dump(results, file, indent=4)
+        print(f"Baseline was successfully written to {baseline_file}.")
+        return 0
+
+    if not os.path.exists(baseline_file):
+        print(f"Baseline {baseline_file} not found, nothing to compare with. "
+              "Use --save to write it.")
+        return 1
+
+    with open(baseline_file, 'r') as file:
+        baseline = json.load(file)
+    regressions = compare(results, baseline, args.threshold)
+    for name, reference, current in regressions:
+        print(f"Regression {name}: {reference * 1e6:.1f} us -> {current * 1e6:.1f} us "
+              f"({current / reference - 1:+.0%})")
+    if not regressions:
+        print(f"No regressions compared to {baseline_file}.")
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,54 @@
+import unittest
+import json
+import os
+import tempfile
+import benchmark_hot_paths
+from controller import TimeTracker
+from settings import Settings
+from study_generator import generate_study
+
+
+class BenchmarkHotPathsTest(unittest.TestCase):
+
+    def test_compare(self):
+        baseline = {"a[10]": {"min": 1.0, "mean": 1.0},
+                    "b[10]": {"min": 1.0, "mean": 1.0}}
+        results = {"a[10]": {"min": 1.1, "mean": 1.2},
+                   "b[10]": {"min": 1.5, "mean": 1.5},
+                   "c[10]": {"min": 9.0, "mean": 9.0}}
+
+        # unknown benchmarks are no regression
+        self.assertEqual(benchmark_hot_paths.compare(results, baseline, 0.2),
+                         [("b[10]", 1.0, 1.5)])
+        self.assertEqual(len(benchmark_hot_paths.compare(results, baseline, 0.05)), 2)
+
+    def test_run(self):
+        results = benchmark_hot_paths.run(
+            sizes=[1], repeat=1, names=["Module.get_durations", "import_from_json"])
+        self.assertEqual(set(results), {"Module.get_durations[36]",
+                                        "import_from_json[36]"})
+        for result in results.values():
+            self.assertGreater(result["min"], 0)
+            self.assertGreaterEqual(result["mean"], result["min"])
+
+    def test_baseline(self):
+        '''tests if the committed baseline covers all benchmarks and sizes'''
+        with open(benchmark_hot_paths.BASELINE, 'r') as file:
+            baseline = json.load(file)
+        study = generate_study(1, 1, 1)
+        tracker = TimeTracker(study, settings=Settings(filename=None))
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            names = benchmark_hot_paths.get_benchmarks(study, tracker, tmp_dir)
+        self.assertEqual(set(baseline), {f"{name}[{size * 36}]" for name in names
+                                         for size in benchmark_hot_paths.SIZES})
+
+    def test_missing_baseline(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            result = benchmark_hot_paths.main(
+                ["--sizes", "1", "--repeat", "1", "--names", "Module.get_durations",
+                 "--baseline", os.path.join(tmp_dir, "baseline.json")])
+        self.assertEqual(result, 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,172 @@
+import argparse
+import datetime
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from study_generator import generate_study, write_study
+
+SIZES = (1000, 10000, 100000)
+SEMESTERS = 6
+MODULES_PER_SEMESTER = 6
+# modules whose import time is reported
+MODULES = ("view", "controller", "model", "settings", "my_accordion",
+           "date_time_frame", "chart_type", "charts", "matplotlib", "numpy", "tkcalendar")
+# the import at the startup and the deferred imports after it
+STARTUP_IMPORT = "import view"
+DEFERRED_IMPORTS = {
+    "Analyse view": "from charts import ChartCanvas",
+    "edit dialog": "from tkcalendar import DateEntry",
+}
+REPO_DIR = os.path.dirname(os.path.abspath(__file__))
+
+
+def measure_imports():
+    '''measures the import time of the modules at the startup and at the
+    first use of the Analyse view and the edit dialog
+
+    each step is measured in a new interpreter after the startup import,
+    so a module is reported for the step which imports it first
+
+    returns: dict of step -> dict of module name -> cumulative import time
+             in seconds
+    '''
+    results = {"startup": measure_import_step(STARTUP_IMPORT)}
+    for step, statement in DEFERRED_IMPORTS.items():
+        results[step] = measure_import_step(statement, STARTUP_IMPORT)
+    return results
+
+
+def measure_import_step(statement, setup=None):
+    '''measures the import time of the modules in a new interpreter
+
+    uses python -X importtime
+
+    statement: the import statement to measure
+    setup: import statement executed before, its modules are not reported
+
+    returns: dict of module name -> cumulative import time in seconds
+    '''
+    code = statement
+    if setup is not None:
+        code = f"{setup}\nimport sys\nprint('-', file=sys.stderr)\n{statement}"
+    result = subprocess.run([sys.executable, "-X", "importtime", "-c", code],
+                            capture_output=True, text=True, cwd=REPO_DIR)
+    lines = result.stderr.splitlines()
+    if setup is not None and "-" in lines:
+        lines = lines[lines.index("-") + 1:]
+    times = {}
+    for line in lines:
+        # import time: self [us] | cumulative | imported package
+        parts = line.split("|")
+        if len(parts) != 3 or not parts[1].strip().isdigit():
+            continue
+        name = parts[2].strip()
+        if name in MODULES:
+            times[name] = int(parts[1]) / 1e6
+    return times
+
+
+def measure_load(filename, gui=True):
+    '''measures the steps of the initial load
+
+    filename: the study file
+    gui: if True the treeview and the accordion are measured
+
+    returns: dict of step -> time in seconds
+    '''
+    from model import Study
+    from controller import TimeTracker
+
+    times = {}
+    tracker = TimeTracker(Study(180, 30, datetime.datetime.now()))
+    begin = time.perf_counter()
+    tracker.import_from_json(filename)
+    times["import_from_json"] = time.perf_counter() - begin
+    if not gui:
+        return times
+
+    import tkinter as tk
+    from view import TimeTrackerGUI
+
+    root = tk.Tk()
+    root.withdraw()
+    try:
+        begin = time.perf_counter()
+        app = TimeTrackerGUI(root, tracker)
+        times["gui_init"] = time.perf_counter() - begin
+
+        # initial_load is scheduled with after, the steps are called directly
+        begin = time.perf_counter()
+        app.update_treeview()
+        times["update_treeview"] = time.perf_counter() - begin
+
+        begin = time.perf_counter()
+        app.generate_accordion(app.accordion_frame)
+        times["generate_accordion"] = time.perf_counter() - begin
+
+        begin = time.perf_counter()
+        root.update_idletasks()
+        times["layout"] = time.perf_counter() - begin
+    finally:
+        root.destroy()
+    return times
+
+
+def run(sizes=SIZES, gui=True):
+    '''runs the benchmark
+
+    the settings and study files are written to a temporary directory,
+    so the settings of the user are not changed
+
+    sizes: the number of entries of the synthetic studies, rounded up to
+        the same number of entries for each module
+    gui: if True the GUI steps are measured
+
+    returns: dict with the import times and the load times per number of entries
+    '''
+    results = {"imports": measure_imports(), "load": {}}
+    cwd = os.getcwd()
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        os.chdir(tmp_dir)
+        try:
+            for size in sizes:
+                modules = SEMESTERS * MODULES_PER_SEMESTER
+                entries = max(-(-size // modules), 1)
+                filename = os.path.join(tmp_dir, f"study_{entries * modules}.json")
+                write_study(generate_study(
+                    SEMESTERS, MODULES_PER_SEMESTER, entries), filename)
+                results["load"][entries * modules] = measure_load(filename, gui)
+        finally:
+            os.chdir(cwd)
+    return results
+
+
+def main(argv=None):
+    '''runs the benchmark and prints the results
+
+    argv: the arguments, sys.argv is used if None
+    '''
+    parser = argparse.ArgumentParser(description="Startup benchmark")
+    parser.add_argument("--sizes", nargs="+", type=int, default=list(SIZES),
+                        help="the number of entries of the synthetic studies")
+    parser.add_argument("--no-gui", action="store_true",
+                        help="measure only the import and the loading of the data")
+    args = parser.parse_args(argv)
+
+    results = run(args.sizes, not args.no_gui)
+
+    print("import time (cumulative):")
+    for step, times in results["imports"].items():
+        print(f"  {step}:")
+        for name, seconds in sorted(times.items(), key=lambda item: -item[1]):
+            print(f"    {name:<18}{seconds * 1000:10.1f} ms")
+    for size, times in results["load"].items():
+        print(f"{size} entries:")
+        for step, seconds in times.items():
+            print(f"  {step:<20}{seconds * 1000:10.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
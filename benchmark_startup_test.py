@@ -0,0 +1,33 @@
+import unittest
+import benchmark_startup
+
+
+class BenchmarkStartupTest(unittest.TestCase):
+
+    def test_measure_imports(self):
+        results = benchmark_startup.measure_imports()
+        self.assertEqual(set(results), {"startup", "Analyse view", "edit dialog"})
+        self.assertIn("view", results["startup"])
+
+        # matplotlib is imported at the first chart, not at the startup
+        self.assertNotIn("matplotlib", results["startup"])
+        self.assertIn("charts", results["Analyse view"])
+        self.assertIn("matplotlib", results["Analyse view"])
+        self.assertNotIn("view", results["Analyse view"])
+        self.assertIn("tkcalendar", results["edit dialog"])
+        for times in results.values():
+            for seconds in times.values():
+                self.assertGreater(seconds, 0)
+
+    def test_run(self):
+        results = benchmark_startup.run(sizes=[36], gui=False)
+        self.assertEqual(set(results["load"]), {36})
+        self.assertGreater(results["load"][36]["import_from_json"], 0)
+
+        # the size is rounded up to the same number of entries per module
+        results = benchmark_startup.run(sizes=[40], gui=False)
+        self.assertEqual(set(results["load"]), {72})
+
+
+if __name__ == '__main__':
+    unittest.main()
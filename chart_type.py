@@ -0,0 +1,11 @@
+from enum import Enum
+
+
+class ChartType(Enum):
+    ''' the types of the charts
+
+    kept apart from the charts, so the type can be used without importing
+    matplotlib and numpy
+    '''
+    BURNDOWN = 'burndown'
+    PIE = 'pie'
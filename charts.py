@@ -1,16 +1,16 @@
+import base64
 import datetime
+import io
+import threading
 import numpy as np
 import tkinter as tk
 import matplotlib.pyplot as plt
 import matplotlib.dates as mdates
+from matplotlib.figure import Figure
 from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
+from matplotlib.backends.backend_agg import FigureCanvasAgg
 from abc import ABC, abstractmethod
-from enum import Enum
-
-
-class ChartType(Enum):
-    BURNDOWN = 'burndown'
-    PIE = 'pie'
+from chart_type import ChartType
 
 
 class Chart(ABC):
@@ -18,12 +18,39 @@ class Chart(ABC):
 
     def __init__(self):
         self.figure = None
+        self.ax = None
+
+    @abstractmethod
+    def draw(self, fig):
+        ''' abstract method to draw the chart into a figure
+
+        fig: the matplotlib figure
+        '''
+        pass
 
     @abstractmethod
-    def plot(self):
-        ''' abstract method to plot '''
+    def update(self, *data):
+        ''' abstract method to update the data of the chart
+
+        the artists of a drawn chart are changed in place
+
+        data: the data in the same order as for the constructor
+        '''
         pass
 
+    def plot(self, frame):
+        ''' plots the chart into a new figure
+
+        frame: the frame where the figure should be shown
+        '''
+        fig = plt.figure(figsize=(5, 5))
+        self.draw(fig)
+        self._create_canvas(fig, frame)
+
+    def _redraw(self):
+        ''' request a redraw of the figure when the GUI is idle '''
+        self.figure.canvas.draw_idle()
+
     def _create_canvas(self, fig, frame):
         ''' draw the Matplot figure to a frame 
 
@@ -67,35 +94,47 @@ class BurndownChart(Chart):
         '''
         super().__init__()
         self.title = title
-        self.dates = date_lst
-        self.remaining_work = []
-        remaining = total_work
-        for ects in work_lst:
-            remaining -= ects
-            self.remaining_work.append(remaining)
-
-        plan_days = max((planned_end - date_lst[0]).days, 1)
-        self.plan_x = [
-            date_lst[0] + datetime.timedelta(days=i) for i in range(plan_days + 1)]
-        self.plan_y = [
-            total_work - (total_work / plan_days) * i for i in range(plan_days + 1)]
+        self._calculate(date_lst, work_lst, total_work, planned_end)
+
+    def _calculate(self, date_lst, work_lst, total_work, planned_end):
+        ''' calculates the remaining_work and the target line (planned)
+
+        the dates are converted to a datetime64 array, so matplotlib does not
+        have to convert each date. The target line is straight and therefore
+        represented by its start and end point.
+
+        date_lst: list of dates
+        work_lst: corresponding lst of done work
+        total_work: the total amount of work
+        planned_end: the planned end
+        '''
+        one_day = np.timedelta64(1, 'D')
+        self.dates = np.asarray(date_lst, dtype='datetime64[s]')
+        self.remaining_work = total_work - np.cumsum(work_lst)
+
+        start = self.dates[0]
+        end = np.datetime64(planned_end, 's')
+        plan_days = max(int((end - start) // one_day), 1)
+        self.plan_x = np.array([start, start + plan_days * one_day])
+        self.plan_y = np.array([total_work, 0.0])
 
         # calculate interval for 10 ticks
-        max_date = max(date_lst + [planned_end])
-        total_days = (max_date - date_lst[0]).days
+        max_date = max(self.dates.max(), end)
+        total_days = int((max_date - start) // one_day)
         self.interval = int(max(round(total_days / 10, 0), 1))
 
-    def plot(self, frame):
-        ''' plots a burndown chart
+    def draw(self, fig):
+        ''' draws a burndown chart
 
-        frame: the frame where the figure should be shown
+        fig: the figure where the chart should be drawn
         '''
-        fig, ax = plt.subplots(figsize=(5, 5))
+        ax = fig.subplots()
         # plot burndown rate
-        ax.plot(self.dates, self.remaining_work,
-                marker='o', linestyle='-', color='b')
+        self._work_line, = ax.plot(self.dates, self.remaining_work,
+                                   marker='o', linestyle='-', color='b')
         # plot target line
-        ax.plot(self.plan_x, self.plan_y, linestyle='--', color='g')
+        self._plan_line, = ax.plot(
+            self.plan_x, self.plan_y, linestyle='--', color='g')
 
         # ticks for interval days and year-month format
         ax.xaxis.set_major_locator(mdates.DayLocator(interval=self.interval))
@@ -109,7 +148,30 @@ class BurndownChart(Chart):
         ax.set_ylabel('Remaining Work')
         ax.grid(True)
 
-        self._create_canvas(fig, frame)
+        self.figure = fig
+        self.ax = ax
+
+    def update(self, date_lst, work_lst, total_work, planned_end):
+        ''' updates the burndown chart
+
+        sets the data of the existing lines and rescales the axes
+
+        date_lst: list of dates
+        work_lst: corresponding lst of done work
+        total_work: the total amount of work
+        planned_end: the planned end
+        '''
+        self._calculate(date_lst, work_lst, total_work, planned_end)
+        if self.ax is None:
+            return
+
+        self._work_line.set_data(self.dates, self.remaining_work)
+        self._plan_line.set_data(self.plan_x, self.plan_y)
+        self.ax.xaxis.set_major_locator(
+            mdates.DayLocator(interval=self.interval))
+        self.ax.relim()
+        self.ax.autoscale_view()
+        self._redraw()
 
 
 class PieChart(Chart):
@@ -119,6 +181,10 @@ class PieChart(Chart):
     implements plot function for pie charts
     '''
 
+    # parameters of the pie
+    START_ANGLE = 0
+    PCT_DISTANCE = 0.6
+
     def __init__(self, title, labels, sizes):
         ''' init a pie chart
 
@@ -129,33 +195,296 @@ class PieChart(Chart):
         '''
         super().__init__()
         self.title = title
-        self.labels = labels
+        self._calculate(labels, sizes)
+
+    def _calculate(self, labels, sizes):
+        ''' calculates the relative sizes
+
+        labels: different categories
+        sizes: the absolute sizes of the categories
+        '''
         sum = np.sum(sizes)
         if sum == 0.0:
             raise ValueError("sum of sizes is zero")
 
+        self.labels = labels
         self.rel_sizes = [100 * size / sum for size in sizes]
 
-    def plot(self, frame):
-        ''' plots a pie chart
+    def _get_legend_labels(self):
+        ''' get the labels of the legend including the percentage '''
+        return [f'{label} - {size:.1f}%' for label,
+                size in zip(self.labels, self.rel_sizes)]
 
-        frame: the frame where the figure should be shown
+    def draw(self, fig):
+        ''' draws a pie chart
+
+        fig: the figure where the chart should be drawn
         '''
-        fig, ax = plt.subplots(figsize=(5, 5))
-        wedges, _, _ = ax.pie(self.rel_sizes,
-                              autopct='%1.1f%%', startangle=0)
+        ax = fig.subplots()
+        wedges, _, pct_texts = ax.pie(self.rel_sizes,
+                                      autopct='%1.1f%%', startangle=self.START_ANGLE,
+                                      pctdistance=self.PCT_DISTANCE)
         ax.set_title(self.title)
         # Equal aspect ratio ensures that pie is drawn as a circle.
         ax.axis('equal')
 
         # Create legend with percentage
-        labels_with_pct = [f'{label} - {size:.1f}%' for label,
-                           size in zip(self.labels, self.rel_sizes)]
+        self._legend = ax.legend(wedges, self._get_legend_labels(), loc="lower left",
+                                 bbox_to_anchor=(-0.15, -0.15, 0, 0))
 
-        ax.legend(wedges, labels_with_pct, loc="lower left",
-                  bbox_to_anchor=(-0.15, -0.15, 0, 0))
+        self._wedges = wedges
+        self._pct_texts = pct_texts
+        self.figure = fig
+        self.ax = ax
 
-        self._create_canvas(fig, frame)
+    def update(self, labels, sizes):
+        ''' updates the pie chart
+
+        changes the angles of the wedges, the percentages and the legend.
+        The chart is drawn again if the number of wedges changed.
+
+        labels: different categories
+        sizes: the absolute sizes of the categories
+        '''
+        self._calculate(labels, sizes)
+        if self.ax is None:
+            return
+
+        if len(self.rel_sizes) != len(self._wedges):
+            fig = self.figure
+            fig.clear()
+            self.draw(fig)
+            self._redraw()
+            return
+
+        theta1 = self.START_ANGLE
+        for wedge, text, size in zip(self._wedges, self._pct_texts, self.rel_sizes):
+            theta2 = theta1 + 360 * size / 100
+            wedge.set_theta1(theta1)
+            wedge.set_theta2(theta2)
+
+            # place the percentage in the middle of the wedge
+            angle = np.deg2rad((theta1 + theta2) / 2)
+            radius = wedge.r * self.PCT_DISTANCE
+            text.set_position((wedge.center[0] + radius * np.cos(angle),
+                               wedge.center[1] + radius * np.sin(angle)))
+            text.set_text(f'{size:.1f}%')
+            theta1 = theta2
+
+        for text, label in zip(self._legend.get_texts(), self._get_legend_labels()):
+            text.set_text(label)
+
+        self._redraw()
+
+
+class ChartCanvas:
+    ''' persistent figure and canvas to show charts
+
+    all charts are drawn into the same figure, so switching the chart
+    neither creates a new figure nor new tkinter widgets
+    '''
+
+    def __init__(self, frame, figsize=(5, 5)):
+        ''' creates the figure and the canvas
+
+        the figure is not registered in pyplot, so it does not have to be closed
+
+        frame: the tkinter frame where the canvas is placed
+        figsize: the size of the figure
+        '''
+        self.frame = frame
+        self.figure = Figure(figsize=figsize)
+        self._subplotpars = {key: getattr(self.figure.subplotpars, key) for key in (
+            'left', 'right', 'bottom', 'top', 'wspace', 'hspace')}
+        self.canvas = FigureCanvasTkAgg(self.figure, master=frame)
+        self.canvas.get_tk_widget().pack(fill=tk.NONE, expand=True)
+        self.chart = None
+        # label and image of a prerendered chart
+        self.image_label = None
+        self.image = None
+
+    def show(self, chart):
+        ''' draws a chart into the figure
+
+        chart: the chart to show
+        '''
+        self._hide_image()
+        self._reset_figure()
+        chart.draw(self.figure)
+        chart.figure = self.figure
+        self.chart = chart
+        self.canvas.draw_idle()
+
+    def show_image(self, png):
+        ''' shows a prerendered chart instead of the figure
+
+        png: the chart rendered as png
+        '''
+        if self.image_label is None:
+            self.image_label = tk.Label(self.frame)
+        self.image = tk.PhotoImage(data=base64.b64encode(png))
+        self.image_label.config(image=self.image)
+        if self.image_label.winfo_manager() == "":
+            self.canvas.get_tk_widget().pack_forget()
+            self.image_label.pack(fill=tk.NONE, expand=True)
+        self.chart = None
+
+    def _hide_image(self):
+        ''' shows the figure again if a prerendered chart is shown '''
+        if self.image is None:
+            return
+        self.image_label.pack_forget()
+        self.image_label.config(image="")
+        self.image = None
+        self.canvas.get_tk_widget().pack(fill=tk.NONE, expand=True)
+
+    def clear(self):
+        ''' removes the shown chart '''
+        self._hide_image()
+        self._reset_figure()
+        self.chart = None
+        self.canvas.draw_idle()
+
+    def _reset_figure(self):
+        ''' removes all axes and restores the default layout of the figure '''
+        self.figure.clear()
+        # autofmt_xdate of the burndown chart changes the layout
+        self.figure.subplots_adjust(**self._subplotpars)
+
+    def destroy(self):
+        ''' destroy the canvas widget and clear the figure '''
+        if self.image_label is not None:
+            self.image_label.destroy()
+            self.image = None
+        self.canvas.get_tk_widget().destroy()
+        self.figure.clear()
+        self.chart = None
+
+
+def render_chart(chart, figsize=(5, 5), dpi=100, fmt='png'):
+    ''' renders a chart off-screen
+
+    a new figure with an Agg canvas is used, so no GUI is needed and the
+    chart can be rendered in a background thread
+
+    chart: the chart to render
+    figsize: the size of the figure
+    dpi: the resolution of the figure
+    fmt: the file format (e.g. png, svg)
+
+    returns: the rendered chart
+    '''
+    fig = Figure(figsize=figsize, dpi=dpi)
+    canvas = FigureCanvasAgg(fig)
+    chart.draw(fig)
+    buffer = io.BytesIO()
+    canvas.print_figure(buffer, format=fmt)
+    return buffer.getvalue()
+
+
+class ChartPrerenderer:
+    ''' renders charts in a background thread and caches the bitmaps
+
+    the bitmaps belong to a version of the data. A new submit replaces the
+    pending charts and invalidates the bitmaps of the older version.
+    '''
+
+    def __init__(self, figsize=(5, 5), dpi=100):
+        ''' creates the prerenderer, the thread is started at the first submit
+
+        figsize: the size of the rendered figures
+        dpi: the resolution of the rendered figures
+        '''
+        self.figsize = figsize
+        self.dpi = dpi
+        self._condition = threading.Condition()
+        self._thread = None
+        self._pending = None
+        self._busy = False
+        self._stopped = False
+        self._version = None
+        self._bitmaps = {}
+
+    def submit(self, version, charts):
+        ''' renders the charts of a version in the background
+
+        version: the version of the data
+        charts: list of (key, chart)
+        '''
+        with self._condition:
+            if self._stopped:
+                return
+            self._version = version
+            self._bitmaps = {}
+            self._pending = (version, list(charts))
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, daemon=True)
+                self._thread.start()
+            self._condition.notify_all()
+
+    def get(self, key, version):
+        ''' gets a prerendered chart
+
+        key: the key of the chart
+        version: the current version of the data
+
+        returns: the png or None if the chart is not rendered for the version
+        '''
+        with self._condition:
+            if version != self._version:
+                return None
+            return self._bitmaps.get(key)
+
+    def wait(self, timeout=None):
+        ''' waits until all submitted charts are rendered
+
+        timeout: the maximum time to wait in seconds
+
+        returns: True if all charts are rendered
+        '''
+        with self._condition:
+            return self._condition.wait_for(
+                lambda: (self._pending is None and not self._busy) or self._stopped,
+                timeout)
+
+    def stop(self):
+        ''' stops the background thread and drops the bitmaps '''
+        with self._condition:
+            self._stopped = True
+            self._pending = None
+            self._bitmaps = {}
+            self._condition.notify_all()
+
+    def _run(self):
+        ''' renders the pending charts until the prerenderer is stopped '''
+        while True:
+            with self._condition:
+                self._condition.wait_for(
+                    lambda: self._pending is not None or self._stopped)
+                if self._stopped:
+                    return
+                version, charts = self._pending
+                self._pending = None
+                self._busy = True
+
+            for key, chart in charts:
+                with self._condition:
+                    # a newer version replaces the remaining charts
+                    if self._pending is not None or self._stopped:
+                        break
+                try:
+                    png = render_chart(chart, self.figsize, self.dpi)
+                except Exception:
+                    # the chart is drawn on the Tk thread when it is shown,
+                    # which reports the error
+                    continue
+                with self._condition:
+                    if version == self._version:
+                        self._bitmaps[key] = png
+
+            with self._condition:
+                self._busy = False
+                self._condition.notify_all()
 
 
 class ChartFactory:
@@ -1,7 +1,11 @@
 import unittest
 import datetime
-from charts import BurndownChart, PieChart
+import io
+import numpy as np
+from charts import BurndownChart, PieChart, ChartCanvas, ChartPrerenderer, render_chart
+from matplotlib.figure import Figure
 import tkinter as tk
+from unittest.mock import patch
 
 
 class TestBurndownChart(unittest.TestCase):
@@ -21,18 +25,32 @@ class TestBurndownChart(unittest.TestCase):
                               self.work_lst, self.total_work, self.planned_end)
 
         expected_remaining_work = [90, 80, 70, 60, 50, 40, 30, 20, 10, 0]
-        expected_plan_x = [self.dates[0] +
-                           datetime.timedelta(days=i) for i in range(10)]
-        expected_plan_y = [self.total_work -
-                           (self.total_work / 9) * i for i in range(10)]
+        # the target line is represented by its start and end point
+        expected_plan_x = np.array(
+            [self.dates[0], self.dates[-1]], dtype='datetime64[s]')
+        expected_plan_y = [self.total_work, 0]
         expected_interval = 1  # 10 days / 10 ticks
 
         self.assertEqual(chart.title, "title")
-        self.assertEqual(chart.remaining_work, expected_remaining_work)
-        self.assertEqual(chart.plan_x, expected_plan_x)
-        self.assertEqual(chart.plan_y, expected_plan_y)
+        self.assertEqual(chart.remaining_work.tolist(),
+                         expected_remaining_work)
+        np.testing.assert_array_equal(chart.plan_x, expected_plan_x)
+        self.assertEqual(chart.plan_y.tolist(), expected_plan_y)
         self.assertEqual(chart.interval, expected_interval)
 
+    def test_init_datetimes(self):
+        dates = [datetime.datetime(2024, 1, 1, 8, 30),
+                 datetime.datetime(2024, 3, 1, 12, 0)]
+        planned_end = datetime.datetime(2024, 12, 31, 18, 0)
+        chart = BurndownChart("title", dates, [0, 5], 30, planned_end)
+
+        self.assertEqual(chart.remaining_work.tolist(), [30, 25])
+        # partial days are not part of the plan (like timedelta.days)
+        self.assertEqual(chart.plan_x[1] - chart.plan_x[0],
+                         np.timedelta64((planned_end - dates[0]).days, 'D'))
+        self.assertEqual(chart.interval,
+                         round((planned_end - dates[0]).days / 10))
+
     def test_plot(self):
         chart = BurndownChart("title", self.dates,
                               self.work_lst, self.total_work, self.planned_end)
@@ -133,5 +151,184 @@ class TestChart(unittest.TestCase):
         frame.destroy()
 
 
+class TestChartDraw(unittest.TestCase):
+
+    def test_draw(self):
+        fig = Figure()
+        chart = PieChart("pie", ['Apples', 'Bananas'], [15, 30])
+        chart.draw(fig)
+        self.assertEqual(len(fig.axes), 1)
+        self.assertEqual(fig.axes[0].get_title(), 'pie')
+
+        fig.clear()
+        dates = [datetime.date(2024, 6, i) for i in range(1, 11)]
+        chart = BurndownChart("burndown", dates, [10] * 10, 100, dates[-1])
+        chart.draw(fig)
+        self.assertEqual(len(fig.axes), 1)
+        self.assertEqual(fig.axes[0].get_title(), 'burndown')
+        self.assertEqual(fig.axes[0].get_ylabel(), 'Remaining Work')
+
+    def test_update_burndown(self):
+        fig = Figure()
+        dates = [datetime.date(2024, 6, i) for i in range(1, 11)]
+        chart = BurndownChart("burndown", dates, [10] * 10, 100, dates[-1])
+        chart.draw(fig)
+        line = fig.axes[0].lines[0]
+
+        new_dates = [datetime.date(2024, 6, i) for i in range(1, 4)]
+        chart.update(new_dates, [0, 20, 30], 50, datetime.date(2024, 6, 30))
+
+        # existing artists are updated
+        self.assertIs(fig.axes[0].lines[0], line)
+        self.assertEqual(len(fig.axes), 1)
+        self.assertEqual(list(line.get_ydata()), [50, 30, 0])
+        np.testing.assert_array_equal(
+            line.get_xdata(), np.array(new_dates, dtype='datetime64[s]'))
+        self.assertEqual(chart.plan_y[0], 50)
+        self.assertEqual(chart.plan_y[-1], 0)
+
+    def test_update_pie(self):
+        fig = Figure()
+        chart = PieChart("pie", ['Apples', 'Bananas'], [15, 45])
+        chart.draw(fig)
+        wedges = list(fig.axes[0].patches)
+
+        chart.update(['Apples', 'Cherries'], [45, 15])
+        self.assertEqual(list(fig.axes[0].patches), wedges)
+        self.assertAlmostEqual(wedges[0].theta2, 270)
+        self.assertAlmostEqual(wedges[1].theta1, 270)
+        self.assertEqual([t.get_text() for t in chart._pct_texts],
+                         ['75.0%', '25.0%'])
+        self.assertEqual([t.get_text() for t in fig.axes[0].legend_.texts],
+                         ['Apples - 75.0%', 'Cherries - 25.0%'])
+
+        # a different number of wedges draws the chart again
+        chart.update(['Apples', 'Bananas', 'Cherries'], [10, 10, 20])
+        self.assertEqual(len(fig.axes), 1)
+        self.assertEqual(len(fig.axes[0].patches), 3)
+
+        with self.assertRaises(ValueError):
+            chart.update(['Apples'], [0])
+
+
+class TestChartPrerenderer(unittest.TestCase):
+
+    def setUp(self):
+        self.prerenderer = ChartPrerenderer(figsize=(2, 2), dpi=50)
+
+    def tearDown(self):
+        self.prerenderer.stop()
+
+    def test_render_chart(self):
+        png = render_chart(PieChart("pie", ['Apples', 'Bananas'], [15, 30]),
+                           figsize=(2, 2), dpi=50)
+        self.assertTrue(png.startswith(b'\x89PNG'))
+
+    def test_submit(self):
+        dates = [datetime.date(2024, 6, i) for i in range(1, 11)]
+        charts = [("pie", PieChart("pie", ['Apples', 'Bananas'], [15, 30])),
+                  ("burndown", BurndownChart("burndown", dates, [10] * 10, 100, dates[-1]))]
+        self.prerenderer.submit(1, charts)
+        self.assertTrue(self.prerenderer.wait(timeout=30))
+
+        self.assertTrue(self.prerenderer.get("pie", 1).startswith(b'\x89PNG'))
+        self.assertTrue(self.prerenderer.get(
+            "burndown", 1).startswith(b'\x89PNG'))
+        self.assertIsNone(self.prerenderer.get("unknown", 1))
+        # bitmaps of another version are stale
+        self.assertIsNone(self.prerenderer.get("pie", 2))
+
+        # a new version drops the old bitmaps
+        self.prerenderer.submit(2, charts[:1])
+        self.assertTrue(self.prerenderer.wait(timeout=30))
+        self.assertIsNotNone(self.prerenderer.get("pie", 2))
+        self.assertIsNone(self.prerenderer.get("burndown", 2))
+        self.assertIsNone(self.prerenderer.get("pie", 1))
+
+    def test_render_error(self):
+        broken = PieChart("broken", ['Apples'], [15])
+        broken.draw = lambda fig: 1 / 0
+        charts = [("broken", broken),
+                  ("pie", PieChart("pie", ['Apples', 'Bananas'], [15, 30]))]
+        with patch('sys.stdout', new_callable=io.StringIO) as stdout:
+            self.prerenderer.submit(1, charts)
+            self.assertTrue(self.prerenderer.wait(timeout=30))
+
+        # the failed chart is skipped without output from the worker
+        self.assertIsNone(self.prerenderer.get("broken", 1))
+        self.assertIsNotNone(self.prerenderer.get("pie", 1))
+        self.assertEqual(stdout.getvalue(), "")
+
+    def test_stop(self):
+        self.prerenderer.submit(
+            1, [("pie", PieChart("pie", ['Apples', 'Bananas'], [15, 30]))])
+        self.prerenderer.stop()
+        self.assertTrue(self.prerenderer.wait(timeout=30))
+        self.assertIsNone(self.prerenderer.get("pie", 1))
+
+        # nothing is rendered after stop
+        self.prerenderer.submit(
+            2, [("pie", PieChart("pie", ['Apples', 'Bananas'], [15, 30]))])
+        self.assertIsNone(self.prerenderer.get("pie", 2))
+
+
+class TestChartCanvas(unittest.TestCase):
+
+    def setUp(self):
+        self.root = tk.Tk()
+        self.frame = tk.Frame(self.root)
+
+    def tearDown(self):
+        self.root.destroy()
+
+    def test_show(self):
+        chart_canvas = ChartCanvas(self.frame)
+        figure = chart_canvas.figure
+        widget = chart_canvas.canvas.get_tk_widget()
+
+        dates = [datetime.date(2024, 6, i) for i in range(1, 11)]
+        burndown = BurndownChart("burndown", dates, [10] * 10, 100, dates[-1])
+        chart_canvas.show(burndown)
+        self.assertIs(burndown.figure, figure)
+        self.assertEqual(figure.axes[0].get_title(), 'burndown')
+
+        pie = PieChart("pie", ['Apples', 'Bananas'], [15, 30])
+        chart_canvas.show(pie)
+
+        # figure and widget are reused
+        self.assertIs(chart_canvas.figure, figure)
+        self.assertIs(chart_canvas.canvas.get_tk_widget(), widget)
+        self.assertEqual(len(self.frame.winfo_children()), 1)
+        self.assertEqual(len(figure.axes), 1)
+        self.assertEqual(figure.axes[0].get_title(), 'pie')
+        self.assertIs(chart_canvas.chart, pie)
+
+        chart_canvas.clear()
+        self.assertEqual(len(figure.axes), 0)
+        self.assertIsNone(chart_canvas.chart)
+
+        chart_canvas.destroy()
+        self.assertEqual(len(self.frame.winfo_children()), 0)
+
+    def test_show_image(self):
+        chart_canvas = ChartCanvas(self.frame)
+        widget = chart_canvas.canvas.get_tk_widget()
+        png = render_chart(PieChart("pie", ['Apples', 'Bananas'], [15, 30]))
+
+        chart_canvas.show_image(png)
+        self.assertIsNotNone(chart_canvas.image)
+        self.assertEqual(chart_canvas.image_label.winfo_manager(), 'pack')
+        self.assertEqual(widget.winfo_manager(), '')
+
+        # a drawn chart replaces the image
+        chart_canvas.show(PieChart("pie", ['Apples', 'Bananas'], [15, 30]))
+        self.assertIsNone(chart_canvas.image)
+        self.assertEqual(chart_canvas.image_label.winfo_manager(), '')
+        self.assertEqual(widget.winfo_manager(), 'pack')
+
+        chart_canvas.destroy()
+        self.assertEqual(len(self.frame.winfo_children()), 0)
+
+
 if __name__ == '__main__':
     unittest.main()
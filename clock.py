@@ -0,0 +1,51 @@
+import datetime
+
+
+class SystemClock:
+    '''Clock using the system time'''
+
+    def now(self):
+        '''gets the current time
+
+        returns: the current local time as datetime
+        '''
+        return datetime.datetime.now()
+
+
+class FakeClock:
+    '''Clock with a manually controlled time
+
+    used instead of the SystemClock to simulate the time in tests and
+    benchmarks without waiting
+    '''
+
+    def __init__(self, start=datetime.datetime(2024, 1, 1, 8, 0)):
+        '''creates the clock
+
+        start: the initial time of the clock
+        '''
+        self.time = start
+
+    def now(self):
+        '''gets the current time of the clock
+
+        returns: the time as datetime
+        '''
+        return self.time
+
+    def advance(self, delta=None, **kwargs):
+        '''advances the time of the clock
+
+        delta: the timedelta to advance
+        **kwargs: arguments of a timedelta if no delta is given (e.g. seconds=10)
+        '''
+        if delta is None:
+            delta = datetime.timedelta(**kwargs)
+        self.time += delta
+
+    def set(self, time):
+        '''sets the time of the clock
+
+        time: the new time as datetime
+        '''
+        self.time = time
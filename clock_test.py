@@ -0,0 +1,29 @@
+import unittest
+import datetime
+from clock import SystemClock, FakeClock
+
+
+class ClockTest(unittest.TestCase):
+
+    def test_system_clock(self):
+        before = datetime.datetime.now()
+        now = SystemClock().now()
+        self.assertLessEqual(before, now)
+        self.assertLessEqual(now, datetime.datetime.now())
+
+    def test_fake_clock(self):
+        start = datetime.datetime(2024, 6, 1, 12, 0)
+        clock = FakeClock(start)
+        self.assertEqual(clock.now(), start)
+
+        clock.advance(minutes=30)
+        self.assertEqual(clock.now(), start + datetime.timedelta(minutes=30))
+        clock.advance(datetime.timedelta(hours=1))
+        self.assertEqual(clock.now(), start + datetime.timedelta(minutes=90))
+
+        clock.set(start)
+        self.assertEqual(clock.now(), start)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,12 +1,147 @@
 import os
+import csv
 import datetime
+import functools
 import threading
+import time
 import uuid
 import json
+from collections import Counter
+from contextlib import contextmanager
 from model import Study, Semester, Module, Entry
-from charts import ChartFactory, ChartType, Chart
+from chart_type import ChartType
 from settings import Settings
 
+# columns of the csv export and import of the entries
+CSV_COLUMNS = ("semester", "module", "category", "comment", "start", "stop")
+
+
+class Instrumentation:
+    '''Records call counts and latencies of the hot paths
+
+    disabled by default, it is enabled by the environment variable
+    TIMETRACKER_INSTRUMENTATION=1 or by enable()
+    '''
+    # upper bounds of the histogram buckets in seconds
+    BUCKETS = (0.001, 0.01, 0.1, 1.0)
+
+    def __init__(self, enabled=False):
+        '''creates the instrumentation
+
+        enabled: True to record the calls
+        '''
+        self.enabled = enabled
+        self._stats = {}
+        self._lock = threading.Lock()
+
+    def enable(self, enabled=True):
+        '''enables or disables the recording
+
+        enabled: True to record the calls
+        '''
+        self.enabled = enabled
+
+    def record(self, name, seconds):
+        '''records a call
+
+        name: the name of the measured code
+        seconds: the duration of the call
+        '''
+        with self._lock:
+            stats = self._stats.get(name)
+            if stats is None:
+                stats = {"count": 0, "total": 0.0, "max": 0.0,
+                         "histogram": [0] * (len(self.BUCKETS) + 1)}
+                self._stats[name] = stats
+            stats["count"] += 1
+            stats["total"] += seconds
+            stats["max"] = max(stats["max"], seconds)
+            bucket = len(self.BUCKETS)
+            for i, bound in enumerate(self.BUCKETS):
+                if seconds <= bound:
+                    bucket = i
+                    break
+            stats["histogram"][bucket] += 1
+
+    @contextmanager
+    def measure(self, name):
+        '''context manager to measure a block of code
+
+        name: the name of the measured code
+        '''
+        if not self.enabled:
+            yield
+            return
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(name, time.perf_counter() - start)
+
+    def timed(self, name):
+        '''decorator to measure the calls of a function
+
+        name: the name of the measured function
+
+        returns: the decorator
+        '''
+        def decorator(func):
+            @functools.wraps(func)
+            def wrapper(*args, **kwargs):
+                if not self.enabled:
+                    return func(*args, **kwargs)
+                start = time.perf_counter()
+                try:
+                    return func(*args, **kwargs)
+                finally:
+                    self.record(name, time.perf_counter() - start)
+            return wrapper
+        return decorator
+
+    def get_stats(self):
+        '''gets the recorded statistics
+
+        returns: dict of name -> count, total, max and histogram (seconds)
+        '''
+        with self._lock:
+            return {name: dict(stats, histogram=list(stats["histogram"]))
+                    for name, stats in self._stats.items()}
+
+    def reset(self):
+        '''removes the recorded statistics'''
+        with self._lock:
+            self._stats.clear()
+
+    def get_report(self):
+        '''gets the statistics as readable text
+
+        returns: the report
+        '''
+        labels = [f"<={bound * 1000:g}ms" for bound in self.BUCKETS]
+        labels.append(f">{self.BUCKETS[-1] * 1000:g}ms")
+        lines = [f"{'name':<40}{'count':>8}{'mean ms':>10}{'max ms':>10}  "
+                 + " ".join(f"{label:>9}" for label in labels)]
+        for name, stats in sorted(self.get_stats().items()):
+            mean = stats["total"] / stats["count"] * 1000
+            lines.append(f"{name:<40}{stats['count']:>8}{mean:>10.2f}{stats['max'] * 1000:>10.2f}  "
+                         + " ".join(f"{count:>9}" for count in stats["histogram"]))
+        return "\n".join(lines)
+
+    def dump(self, filename):
+        '''writes the statistics to a json file
+
+        filename: the name of the file
+        '''
+        with open(filename, 'w') as file:
+            json.dump({"buckets": self.BUCKETS, "stats": self.get_stats()},
+                      file, indent=4)
+        print(f"Instrumentation was successfully written to {filename}.")
+
+
+# instrumentation of the hot paths of the controller and the view
+instrumentation = Instrumentation(
+    os.environ.get("TIMETRACKER_INSTRUMENTATION") == "1")
+
 
 class TimeTracker:
     '''Main of the TimeTracker
@@ -16,20 +151,35 @@ class TimeTracker:
     Holds the lastEntry.
     '''
 
-    def __init__(self, study):
+    def __init__(self, study, clock=None, settings=None):
         '''creates a TimeTracker
 
         ECTS: number of total ECTS of the Study
         hoursPerECTS: defined number of hours used per ECTS (e.g. 30H/ECTS)
+        clock: optional clock to get the current time, the clock of the
+               study is used by default. Loaded and new studies use this clock.
+        settings: optional settings, the settings file in the current
+                  directory is used by default
         '''
         self._study = study
+        if clock is not None:
+            study.set_clock(clock)
+        self.clock = study.clock
         self.current_semester = None
         self.current_module = None
         self.current_entry = None
         self.on_status_change = None
         self._timer = None
+        # seconds between the status notifications
+        self.status_interval = 1.0
         self.on_treeview_update = None
-        self.settings = Settings()
+        self.on_entry_removed = None
+        self.study_version = 0
+        self._chart_data_cache = {}
+        self._chart_data_version = 0
+        # (module id, period) -> (module, revision, buckets, running entries)
+        self._rollup_cache = {}
+        self.settings = settings if settings is not None else Settings()
 
     def start_tracking(self, semesterName, moduleName, category, comment=""):
         '''starts the tracking.
@@ -50,6 +200,7 @@ class TimeTracker:
             self.current_module.set_plannedEnd(
                 self.settings.get("module_duration"))
 
+        self._notify_study_change()
         self._start_timer()
 
     def stop_tracking(self):
@@ -59,11 +210,13 @@ class TimeTracker:
             raise RuntimeError("Currrently no tracking is active")
 
         self.current_entry.stop()
+        self.current_module.touch()
         self._study.set_last_information(
             self.current_semester, self.current_module, self.current_entry)
         self.current_semester = None
         self.current_module = None
         self.current_entry = None
+        self._notify_study_change()
 
         # stop cyclic updates
         self._stop_timer()
@@ -90,9 +243,6 @@ class TimeTracker:
             self.start_tracking(semester, module, category, comment)
             ret = True
 
-        if self.on_treeview_update:
-            self.on_treeview_update()
-
         return ret
 
     def get_last_tracking_information(self):
@@ -109,16 +259,29 @@ class TimeTracker:
 
         return semName, modName, category, comment
 
+    def _notify_study_change(self):
+        '''increments the study version and notifies the observer
+
+        the version can be used by observers to detect if cached data
+        of the study is outdated
+        '''
+        self.study_version += 1
+        if self.on_treeview_update:
+            self.on_treeview_update()
+
     def _start_timer(self):
         """starts a timer for cyclic notification of observer"""
-        def update():
-            if self.current_entry and self.on_status_change:
-                elapsed = datetime.datetime.now() - self.current_entry.start_time
-                self.on_status_change(elapsed)  # notfy the GUI
-            self._timer = threading.Timer(1.0, update)
-            self._timer.start()
-
-        update()    # start first notification
+        self._update_status()    # start first notification
+
+    def _update_status(self):
+        """notifies the observer and schedules the next notification"""
+        if self.current_entry and self.on_status_change:
+            elapsed = self.clock.now() - self.current_entry.start_time
+            self.on_status_change(elapsed)  # notfy the GUI
+        self._timer = threading.Timer(self.status_interval, self._update_status)
+        # a running timer must not keep the application alive
+        self._timer.daemon = True
+        self._timer.start()
 
     def _stop_timer(self):
         """Stops the timer for cyclic notifications"""
@@ -185,6 +348,7 @@ class TimeTracker:
                             return entry
         return None
 
+    @instrumentation.timed("TimeTracker.get_filtered_data_list")
     def get_filtered_data_list(self, selected_semester, selected_module, selected_category):
         '''gets a list of filtered data based on the selected semester, module and category
 
@@ -252,8 +416,7 @@ class TimeTracker:
         sem = self.get_semester(semester_name)
         mod = sem.get_module(module_name)
         mod.finish_module()
-        if self.on_treeview_update:
-            self.on_treeview_update()
+        self._notify_study_change()
 
     def add_new_entry(self, semester_name, module_name, category, comment, start_time, stop_time):
         '''adds a new entry
@@ -269,16 +432,45 @@ class TimeTracker:
             semester_name, module_name, category, comment)
         entry.start_time = start_time
         entry.stop_time = stop_time
+        mod.touch()
 
         if mod.ECTS == 0:
             mod.ECTS = self.settings.get("module_ECTS")
         if mod.plannedEnd == mod.start:
             mod.set_plannedEnd(self.settings.get("module_duration"))
 
-        if self.on_treeview_update:
-            self.on_treeview_update()
+        self._notify_study_change()
         return sem, mod, entry
 
+    @instrumentation.timed("TimeTracker.add_entries_bulk")
+    def add_entries_bulk(self, entries):
+        '''adds several finished entries with a single notification
+
+        the default ECTS and duration of new modules are read once. If the
+        iterable raises, the entries added before are kept and the defaults
+        and the notification are applied to them before the error is raised.
+
+        entries: iterable of (semester name, module name, category, comment,
+                 start time, stop time)
+
+        returns: list of (semester, module) which got new entries
+        '''
+        modules = {}
+        try:
+            self._study.add_entries(entries, modules)
+        finally:
+            module_ECTS = self.settings.get("module_ECTS")
+            module_duration = self.settings.get("module_duration")
+            for _, mod in modules.values():
+                if mod.ECTS == 0:
+                    mod.ECTS = module_ECTS
+                if mod.plannedEnd == mod.start:
+                    mod.set_plannedEnd(module_duration)
+
+            if modules:
+                self._notify_study_change()
+        return list(modules.values())
+
     def remove_entry(self, semester, module, entry):
         '''removes an entry
 
@@ -289,9 +481,11 @@ class TimeTracker:
         entry: the entry to remove'''
         self._study.remove_entry(semester, module, entry)
 
-        if self.on_treeview_update:
-            self.on_treeview_update()
+        if self.on_entry_removed:
+            self.on_entry_removed(entry)
+        self._notify_study_change()
 
+    @instrumentation.timed("TimeTracker.edit_entry")
     def edit_entry(self, semester, module, entry, edit_semester_name, edit_module_name, edit_category, edit_comment, edit_start_time, edit_stop_time, edit_module_start, edit_module_stop, edit_module_ects, edit_module_duration):
         '''edits an entry
 
@@ -319,7 +513,8 @@ class TimeTracker:
 
         self.remove_entry(semester, module, entry)
 
-    def generate_chart(self, scope, chart_type=ChartType.PIE) -> Chart:
+    @instrumentation.timed("TimeTracker.generate_chart")
+    def generate_chart(self, scope, chart_type=ChartType.PIE):
         '''generates a chart
 
         scope: the data (study, Semester, Module) which will be printed
@@ -327,6 +522,8 @@ class TimeTracker:
 
         returns: the chart
         '''
+        # matplotlib is imported at the first chart
+        from charts import ChartFactory
 
         if (isinstance(scope, Module) and chart_type == ChartType.BURNDOWN):
             raise ValueError("Burndown chart is not supported for modules")
@@ -349,19 +546,93 @@ class TimeTracker:
         chart = ChartFactory.create_chart(chart_type, title, *data)
         return chart
 
+    def generate_all_charts(self):
+        '''generates the charts of all chart types for the study, each semester
+        and each module
+
+        charts which can not be generated with the data are skipped
+
+        returns: list of (key, chart) with the key of get_chart_key
+        '''
+        scopes = [self._study]
+        for semester in self._study.semesters:
+            scopes.append(semester)
+            scopes.extend(semester.modules)
+
+        charts = []
+        for scope in scopes:
+            for chart_type in ChartType:
+                try:
+                    chart = self.generate_chart(scope, chart_type)
+                except ValueError:
+                    continue
+                charts.append((self.get_chart_key(scope, chart_type), chart))
+        return charts
+
+    def get_chart_key(self, scope, chart_type=ChartType.PIE):
+        '''gets a key for the chart of a scope
+
+        scope: the data (study, Semester, Module) which will be printed
+        chart_type: the type of the chart
+
+        returns: the key
+        '''
+        return (self._get_scope_key(scope), chart_type)
+
+    def update_chart(self, chart, scope, chart_type=ChartType.PIE):
+        '''updates the data of an existing chart in place
+
+        chart: the chart generated by generate_chart
+        scope: the data (study, Semester, Module) which is printed
+        chart_type: the type of the chart
+        '''
+        chart.update(*self._get_chart_data(scope, chart_type))
+
     def _get_chart_data(self, scope, chart_tpe=ChartType.PIE):
         '''gets the data for a chart
 
+        the data is cached by the scope, the chart type and the study version.
+        Changes of the study increment the version and invalidate the cache.
+
         scope: the data (study, Semester, Module) which will be printed
         chart_tpe: the type of the chart
 
         returns: the data for the chart
         '''
 
+        # drop the data of older versions
+        if self._chart_data_version != self.study_version:
+            self._chart_data_cache.clear()
+            self._chart_data_version = self.study_version
+
+        key = (self._get_scope_key(scope), chart_tpe, self.study_version)
+        if key in self._chart_data_cache:
+            return self._chart_data_cache[key]
+
         if chart_tpe == ChartType.PIE:
-            return self._get_pie_chart_data(scope)
+            data = self._get_pie_chart_data(scope)
         elif chart_tpe == ChartType.BURNDOWN:
-            return self._get_burndown_chart_data(scope)
+            data = self._get_burndown_chart_data(scope)
+        else:
+            return None
+
+        # durations of a running entry change without a new study version
+        if chart_tpe == ChartType.PIE and self.current_entry is not None:
+            return data
+
+        self._chart_data_cache[key] = data
+        return data
+
+    def _get_scope_key(self, scope):
+        '''gets a key for the scope of a chart
+
+        scope: the data (study, Semester, Module) which will be printed
+
+        returns: the key
+        '''
+        if isinstance(scope, Study):
+            return "study"
+        return self.get_object_id(scope)
 
     def _get_pie_chart_data(self, scope):
         '''gets the data for a pie chart
@@ -396,6 +667,9 @@ class TimeTracker:
         elif isinstance(scope, Module):
             return
 
+        if len(modules) == 0:
+            raise ValueError("No modules for the burndown chart")
+
         start = []
         end = []
         stop_times_values = []
@@ -420,6 +694,69 @@ class TimeTracker:
 
         return list(stop_times), list(values), total_work, planned_end
 
+    @instrumentation.timed("TimeTracker.get_rollup")
+    def get_rollup(self, scope, period="day"):
+        '''gets the tracked time per day, week or month
+
+        entries which cross the boundary of a bucket are split. The buckets
+        of the finished entries are cached per module until its entries
+        change, running entries are added up to the current time.
+
+        scope: the data (study, Semester, Module) which is summed up
+        period: day, week (starting on monday) or month
+
+        raises ValueError if the period is not supported
+
+        returns: the starts of the buckets (datetime) and the durations
+                 (timedelta) sorted by the start
+        '''
+        # imported here to keep the startup fast
+        from rollups import PERIODS, rollup, merge_rollups, to_series
+
+        if period not in PERIODS:
+            raise ValueError(f"Period {period} is not supported.")
+        if isinstance(scope, Study):
+            modules = [mod for sem in scope.semesters for mod in sem.modules]
+        elif isinstance(scope, Semester):
+            modules = scope.modules
+        else:
+            modules = [scope]
+
+        buckets = []
+        running = []
+        for mod in modules:
+            module_buckets, module_running = self._get_module_rollup(
+                mod, period)
+            buckets.append(module_buckets)
+            running.extend(module_running)
+        if running:
+            now = self.clock.now()
+            buckets.append(rollup([entry.start_time for entry in running],
+                                  [now] * len(running), period))
+        return to_series(merge_rollups(buckets), period)
+
+    def _get_module_rollup(self, module, period):
+        '''gets the cached rollup of the finished entries of a module
+
+        module: the module
+        period: day, week or month
+
+        returns: dict of bucket index -> seconds and the list of running entries
+        '''
+        from rollups import rollup
+
+        key = (module.id, period)
+        cached = self._rollup_cache.get(key)
+        if cached is not None and cached[0] is module and cached[1] == module.revision:
+            return cached[2], cached[3]
+
+        finished = [entry for entry in module.entries if entry.stop_time is not None]
+        running = [entry for entry in module.entries if entry.stop_time is None]
+        buckets = rollup([entry.start_time for entry in finished],
+                         [entry.stop_time for entry in finished], period)
+        self._rollup_cache[key] = (module, module.revision, buckets, running)
+        return buckets, running
+
     def update_study(self, ECTS, hoursPerECTS, plannedEnd):
         '''updates the study
 
@@ -430,8 +767,7 @@ class TimeTracker:
         self._study.ECTS = ECTS
         self._study.hoursPerECTS = hoursPerECTS
         self._study.plannedEnd = plannedEnd
-        if self.on_treeview_update:
-            self.on_treeview_update()
+        self._notify_study_change()
 
     def create_new_study(self, ECTS, hoursPerECTS, plannedEnd):
         '''creates a new study
@@ -440,9 +776,9 @@ class TimeTracker:
         hoursPerECTS: the new hours per ECTS
         plannedEnd: the new planned end
         '''
-        self._study = Study(ECTS, hoursPerECTS, plannedEnd)
-        if self.on_treeview_update:
-            self.on_treeview_update()
+        self._study = Study(ECTS, hoursPerECTS, plannedEnd, self.clock)
+        self._rollup_cache.clear()
+        self._notify_study_change()
 
         return self._study
 
@@ -479,10 +815,137 @@ class TimeTracker:
                 else:
                     raise ValueError(
                         "Invalid date format! Enter the plannedEnd in one of the following formats: " + '; '.join(formats).replace('%', ''))
+            self._notify_study_change()
             return semester
         else:
             raise ValueError("Semester not found")
 
+    @instrumentation.timed("TimeTracker.export_to_csv")
+    def export_to_csv(self, filename):
+        '''exports the entries to a csv file
+
+        the rows are written while the study is iterated, so no list of
+        all entries is built. The stop of a running entry is empty.
+
+        filename: the name of the file
+        '''
+        with open(filename, 'w', newline='') as file:
+            writer = csv.writer(file)
+            writer.writerow(CSV_COLUMNS)
+            writer.writerows(self._get_csv_rows())
+        print(f"Entries were successfully written to {filename}.")
+
+    def _get_csv_rows(self):
+        '''gets the rows of the csv export
+
+        returns: generator of the rows
+        '''
+        for sem, mod, entry in self._study.iter_entries():
+            yield (sem.name, mod.name, entry.category, entry.comment,
+                   entry.start_time.isoformat() if entry.start_time else "",
+                   entry.stop_time.isoformat() if entry.stop_time else "")
+
+    @instrumentation.timed("TimeTracker.export_to_npz")
+    def export_to_npz(self, filename):
+        '''exports the entries as columns to a compressed numpy file
+
+        the file holds a flat table of the entries: the codes of the
+        semester, module and category refer to the name arrays, the times
+        are int64 seconds since the epoch (the minimum int64 for the stop of
+        a running entry). It can be loaded with numpy.load.
+
+        filename: the name of the file
+        '''
+        # imported here to keep the startup fast
+        import numpy as np
+
+        semester_codes = {}
+        module_codes = {}
+        category_codes = {}
+        columns = ([], [], [], [], [], [])
+        for sem, mod, entry in self._study.iter_entries():
+            semester = semester_codes.setdefault(sem.name, len(semester_codes))
+            module = module_codes.setdefault(
+                (sem.name, mod.name), len(module_codes))
+            category = category_codes.setdefault(
+                entry.category, len(category_codes))
+            for column, value in zip(columns, (semester, module, category, entry.comment,
+                                               entry.start_time, entry.stop_time)):
+                column.append(value)
+        semesters, modules, categories, comments, starts, stops = columns
+
+        np.savez_compressed(
+            filename,
+            semester=np.array(semesters, dtype=np.int32),
+            module=np.array(modules, dtype=np.int32),
+            category=np.array(categories, dtype=np.int32),
+            comment=np.array(comments, dtype=str),
+            # None is converted to NaT, which is the minimum int64
+            start=np.array(starts, dtype='datetime64[s]').astype(np.int64),
+            stop=np.array(stops, dtype='datetime64[s]').astype(np.int64),
+            semester_names=np.array(list(semester_codes), dtype=str),
+            module_names=np.array([name for _, name in module_codes], dtype=str),
+            module_semester=np.array(
+                [semester_codes[sem] for sem, _ in module_codes], dtype=np.int32),
+            category_names=np.array(list(category_codes), dtype=str))
+        print(f"Entries were successfully written to {filename}.")
+
+    @instrumentation.timed("TimeTracker.import_from_csv")
+    def import_from_csv(self, filename):
+        '''imports entries from a csv file into the study
+
+        the file needs a header with the columns semester, module, category,
+        start and stop, comment is optional and further columns are ignored.
+        The file is read twice without building a list of the rows: all rows
+        are validated first, so an invalid file adds no entries, then they
+        are added. Entries without a stop are skipped.
+
+        filename: the name of the file
+
+        raises ValueError if a column is missing or a time is invalid
+
+        returns: the number of imported entries
+        '''
+        with open(filename, 'r', newline='') as file:
+            reader = csv.DictReader(file)
+            missing = [column for column in CSV_COLUMNS
+                       if column != "comment" and column not in (reader.fieldnames or [])]
+            if missing:
+                raise ValueError(f"Missing columns in {filename}: {', '.join(missing)}")
+            # validate all rows before anything is added
+            for _ in self._parse_csv_rows(reader, Counter()):
+                pass
+            file.seek(0)
+            reader = csv.DictReader(file)
+            counts = Counter()
+            self.add_entries_bulk(self._parse_csv_rows(reader, counts))
+        print(f"{counts['imported']} entries were successfully read from {filename}, "
+              f"{counts['skipped']} running entries were skipped.")
+        return counts['imported']
+
+    def _parse_csv_rows(self, reader, counts):
+        '''parses the rows of a csv reader lazily
+
+        reader: a csv.DictReader
+        counts: Counter of the imported and skipped rows, updated while iterating
+
+        returns: generator of the rows for add_entries_bulk
+        '''
+        for row in reader:
+            try:
+                start = datetime.datetime.fromisoformat(row["start"])
+                stop = datetime.datetime.fromisoformat(
+                    row["stop"]) if row["stop"] else None
+            except (TypeError, ValueError) as e:
+                raise ValueError(f"Invalid time in line {reader.line_num}: {e}")
+            if stop is None:
+                counts["skipped"] += 1
+                continue
+            counts["imported"] += 1
+            yield (row["semester"], row["module"], row["category"],
+                   row.get("comment") or "", start, stop)
+
+    @instrumentation.timed("TimeTracker.export_to_json")
     def export_to_json(self, filename):
         '''exports the study to a json file
 
@@ -496,6 +959,7 @@ class TimeTracker:
         self.settings.set("last_filename", filename)
         print(f"Data was successfully written to {filename}.")
 
+    @instrumentation.timed("TimeTracker.import_from_json")
     def import_from_json(self, filename):
         '''imports the study from a json file
 
@@ -507,7 +971,9 @@ class TimeTracker:
         if filename and os.path.exists(filename):
             with open(filename, 'r') as file:
                 data = json.load(file)
-            self._study = Study.from_json(data)
+            self._study = Study.from_json(data, self.clock)
+            self._rollup_cache.clear()
+            self.study_version += 1
             self.settings.set("last_filename", filename)
             print(f"Data was successfully read from {filename}.")
         else:
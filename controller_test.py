@@ -2,17 +2,27 @@ import unittest
 import model
 import datetime
 import controller
-from time import sleep
 import tempfile
 import os
 import json
+from unittest.mock import patch
 from charts import ChartType, PieChart, BurndownChart
+from study_generator import generate_study
+from clock import FakeClock
+from settings import Settings
 
 
 class TimeTrackerUnitTest(unittest.TestCase):
     def setUp(self):
         self.study = model.Study(
             ECTS=180, hoursPerECTS=30, plannedEnd=datetime.datetime.now())
+        # the settings file is written to a temporary directory
+        tmp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp_dir.cleanup)
+        settings_file = os.path.join(tmp_dir.name, "settings.json")
+        patcher = patch('controller.Settings', lambda: Settings(settings_file))
+        patcher.start()
+        self.addCleanup(patcher.stop)
 
     def test_init(self):
         '''test the constructor of TimeTracker'''
@@ -81,9 +91,97 @@ class TimeTrackerUnitTest(unittest.TestCase):
         self.assertAlmostEqual(first=ref_stop, second=stop, delta=datetime.timedelta(milliseconds=200),
                                msg="Stop time of currently stopped entry is not close to datetime.now()")
 
+    def test_clock(self):
+        '''test the tracking with a fake clock'''
+        clock = FakeClock()
+        timeTracker = controller.TimeTracker(
+            model.Study(180, 30, clock.now(), clock=clock))
+        self.assertIs(timeTracker.clock, clock)
+
+        timeTracker.start_tracking("sem", "mod", "cat")
+        timeTracker._stop_timer()
+        entry = timeTracker.current_entry
+        self.assertEqual(entry.start_time, clock.now())
+
+        clock.advance(minutes=90)
+        timeTracker.stop_tracking()
+        self.assertEqual(entry.get_duration(), datetime.timedelta(minutes=90))
+
+        # loaded and new studies use the clock of the tracker
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            filename = os.path.join(tmp_dir, "study.json")
+            with open(filename, 'w') as file:
+                json.dump(timeTracker._study.to_json(), file)
+            with patch.object(timeTracker.settings, 'set'):
+                timeTracker.import_from_json(filename)
+        self.assertIs(timeTracker._study.semesters[0].modules[0].clock, clock)
+        self.assertIs(timeTracker.create_new_study(
+            180, 30, clock.now()).clock, clock)
+
+    def test_instrumentation(self):
+        '''test the recording of the Instrumentation'''
+        instrumentation = controller.Instrumentation()
+
+        @instrumentation.timed("func")
+        def func(value):
+            return value * 2
+
+        # nothing is recorded if disabled
+        self.assertEqual(func(2), 4)
+        with instrumentation.measure("block"):
+            pass
+        self.assertEqual(instrumentation.get_stats(), {})
+
+        instrumentation.enable()
+        self.assertEqual(func(3), 6)
+        with instrumentation.measure("block"):
+            pass
+        instrumentation.record("block", 0.05)
+        instrumentation.record("block", 5)
+
+        stats = instrumentation.get_stats()
+        self.assertEqual(stats["func"]["count"], 1)
+        self.assertEqual(stats["block"]["count"], 3)
+        self.assertEqual(stats["block"]["max"], 5)
+        self.assertEqual(stats["block"]["histogram"], [1, 0, 1, 0, 1])
+        self.assertIn("block", instrumentation.get_report())
+
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            filename = os.path.join(tmp_dir, "instrumentation.json")
+            instrumentation.dump(filename)
+            with open(filename, 'r') as file:
+                data = json.load(file)
+        self.assertEqual(data["stats"]["block"]["count"], 3)
+
+        instrumentation.reset()
+        self.assertEqual(instrumentation.get_stats(), {})
+
+    def test_instrumentation_hot_paths(self):
+        '''test if the hot paths of the tracker are instrumented'''
+        timeTracker = controller.TimeTracker(self.study)
+        enabled = controller.instrumentation.enabled
+        controller.instrumentation.reset()
+        controller.instrumentation.enable()
+        try:
+            timeTracker.get_filtered_data_list("", "", "")
+            with self.assertRaises(ValueError):
+                timeTracker.generate_chart(
+                    model.Module("mod"), ChartType.BURNDOWN)
+            stats = controller.instrumentation.get_stats()
+        finally:
+            controller.instrumentation.enable(enabled)
+            controller.instrumentation.reset()
+
+        self.assertEqual(stats["TimeTracker.get_filtered_data_list"]["count"], 1)
+        # failed calls are recorded too
+        self.assertEqual(stats["TimeTracker.generate_chart"]["count"], 1)
+
     def test_timer_updates_status(self):
         '''test if the observer is called correctly'''
-        timeTracker = controller.TimeTracker(self.study)
+        clock = FakeClock()
+        timeTracker = controller.TimeTracker(self.study, clock)
+        # the notifications are triggered by the test
+        timeTracker.status_interval = 3600
 
         updates = []
 
@@ -93,13 +191,16 @@ class TimeTrackerUnitTest(unittest.TestCase):
         timeTracker.on_status_change = mock_status_change
 
         timeTracker.toggle_tracking("Sem", "Mod", "Cat", "")
-        sleep(2.5)
+        for _ in range(2):
+            clock.advance(seconds=1)
+            timeTracker._stop_timer()
+            timeTracker._update_status()
         timeTracker.toggle_tracking("Sem", "Mod", "Cat", "")
-        sleep(2)
 
         # start, 2 updates, stop
         self.assertEqual(
-            len(updates), 4, "observer was not called 3 times within 3 seconds")
+            len(updates), 4, "observer was not called 4 times")
+        self.assertIsNone(timeTracker._timer)
 
         for i in range(len(updates)):
             self.assertIsInstance(
@@ -109,6 +210,25 @@ class TimeTrackerUnitTest(unittest.TestCase):
             else:
                 self.assertEqual(updates[i].seconds, 0)
 
+    def test_injected_clock(self):
+        '''test if an injected clock is used by the given study'''
+        study = generate_study(1, 1, 1, running_entries=1)
+        clock = FakeClock(datetime.datetime(2020, 1, 1, 10, 0))
+        timeTracker = controller.TimeTracker(study, clock)
+        self.assertIs(study.clock, clock)
+        self.assertIs(study.last_entry.clock, clock)
+        self.assertIs(study.semesters[0].modules[0].entries[0].clock, clock)
+
+        timeTracker.start_tracking("sem", "mod", "cat")
+        timeTracker._stop_timer()
+        entry = timeTracker.current_entry
+        self.assertEqual(entry.start_time, datetime.datetime(2020, 1, 1, 10, 0))
+        clock.advance(minutes=45)
+        timeTracker.stop_tracking()
+        self.assertEqual(entry.stop_time, datetime.datetime(2020, 1, 1, 10, 45))
+        self.assertEqual(study.get_semester("sem").get_module("mod").start,
+                         datetime.datetime(2020, 1, 1, 10, 0))
+
     def test_get_object_id(self):
         '''test the get_object_id method'''
         timeTracker = controller.TimeTracker(self.study)
@@ -218,6 +338,30 @@ class TimeTrackerUnitTest(unittest.TestCase):
         self.assertEqual(entry.category, category)
         self.assertEqual(entry.comment, comment)
 
+    def test_add_entries_bulk(self):
+        '''test the add_entries_bulk method'''
+        timeTracker = controller.TimeTracker(self.study)
+        notifications = []
+        timeTracker.on_treeview_update = lambda: notifications.append(1)
+        start = datetime.datetime(2024, 1, 1, 10)
+        stop = start + datetime.timedelta(hours=1)
+
+        rows = [("sem", f"mod{i % 3}", "cat", "", start, stop)
+                for i in range(30)]
+        modules = timeTracker.add_entries_bulk(rows)
+
+        self.assertEqual(len(notifications), 1)
+        self.assertEqual(len(modules), 3)
+        for _, mod in modules:
+            self.assertEqual(len(mod.entries), 10)
+            self.assertEqual(mod.ECTS, timeTracker.settings.get("module_ECTS"))
+            self.assertEqual(mod.plannedEnd - mod.start, datetime.timedelta(
+                weeks=timeTracker.settings.get("module_duration")))
+
+        # no notification without entries
+        timeTracker.add_entries_bulk([])
+        self.assertEqual(len(notifications), 1)
+
     def test_remove_entry(self):
         '''test the remove_entry method'''
         timeTracker = controller.TimeTracker(self.study)
@@ -230,9 +374,14 @@ class TimeTrackerUnitTest(unittest.TestCase):
         semester.modules.append(module)
         module.entries.append(entry)
 
+        removed = []
+        timeTracker.on_entry_removed = lambda e: removed.append(e)
+
         timeTracker.remove_entry(semester, module, entry)
 
         self.assertEqual(len(module.entries), 0)
+        self.assertEqual(removed, [entry],
+                         "on_entry_removed was not called with the entry")
 
     def test_edit_entry(self):
         '''test the edit_entry method'''
@@ -374,6 +523,25 @@ class TimeTrackerUnitTest(unittest.TestCase):
         # Assertions
         self.assertIsNone(result)
 
+    def test_get_burndown_chart_data_update(self):
+        '''test if the burndown data follows the changes of the modules'''
+        timeTracker = controller.TimeTracker(self.study)
+        start = datetime.datetime(2024, 1, 1)
+        sem, mod, _ = timeTracker.add_new_entry(
+            "sem", "mod", "cat", "", start, start + datetime.timedelta(hours=1))
+        mod.start = start
+        stop_times, values, _, _ = timeTracker._get_burndown_chart_data(sem)
+        self.assertEqual(stop_times, [start])
+
+        # the data is returned as new lists
+        stop_times.append(None)
+        self.assertEqual(timeTracker._get_burndown_chart_data(sem)[0], [start])
+
+        timeTracker.finish_module("sem", "mod")
+        stop_times, values, _, _ = timeTracker._get_burndown_chart_data(sem)
+        self.assertEqual(stop_times, [start, mod.stop])
+        self.assertEqual(values, [0, mod.ECTS])
+
     def test_export_to_json(self):
         '''test the export_to_json method'''
         timeTracker = controller.TimeTracker(self.study)
@@ -468,6 +636,167 @@ class TimeTrackerUnitTest(unittest.TestCase):
         # Reset the last_filename
         timeTracker.settings.set("last_filename", prev_last_filename)
 
+    def test_export_import_csv(self):
+        '''test the export_to_csv and import_from_csv methods'''
+        study = generate_study(2, 2, 5, running_entries=1)
+        timeTracker = controller.TimeTracker(study)
+
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            filename = os.path.join(tmp_dir, "entries.csv")
+            timeTracker.export_to_csv(filename)
+            with open(filename, "r") as file:
+                lines = file.read().splitlines()
+            self.assertEqual(lines[0], ",".join(controller.CSV_COLUMNS))
+            # 20 finished and one running entry
+            self.assertEqual(len(lines), 22)
+            self.assertTrue(lines[-1].endswith(","))
+
+            new_timeTracker = controller.TimeTracker(model.Study(
+                ECTS=0, hoursPerECTS=0, plannedEnd=datetime.datetime.now()))
+            # the running entry is skipped
+            self.assertEqual(new_timeTracker.import_from_csv(filename), 20)
+            imported = [(s.name, m.name, e.category, e.start_time, e.stop_time)
+                        for s, m, e in new_timeTracker._study.iter_entries()]
+            expected = [(s.name, m.name, e.category, e.start_time, e.stop_time)
+                        for s, m, e in study.iter_entries() if e.stop_time]
+            self.assertEqual(imported, expected)
+
+    def test_import_csv_other_tracker(self):
+        '''test importing a csv file with other columns'''
+        timeTracker = controller.TimeTracker(self.study)
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            filename = os.path.join(tmp_dir, "entries.csv")
+            with open(filename, "w") as file:
+                file.write("project,start,stop,semester,module,category\n"
+                           "x,2024-01-01T10:00:00,2024-01-01T11:30:00,sem,mod,cat\n")
+            self.assertEqual(timeTracker.import_from_csv(filename), 1)
+            entry = self.study.semesters[0].modules[0].entries[0]
+            self.assertEqual(entry.comment, "")
+            self.assertEqual(entry.get_duration(),
+                             datetime.timedelta(minutes=90))
+
+            with open(filename, "w") as file:
+                file.write("semester,module,start,stop\n")
+            with self.assertRaises(ValueError):
+                timeTracker.import_from_csv(filename)
+
+            with open(filename, "w") as file:
+                file.write("semester,module,category,start,stop\n"
+                           "sem,mod,cat,yesterday,\n")
+            with self.assertRaises(ValueError):
+                timeTracker.import_from_csv(filename)
+
+    def test_import_csv_invalid_row(self):
+        '''test that a file with an invalid row in the middle adds nothing'''
+        timeTracker = controller.TimeTracker(self.study)
+        notifications = []
+        timeTracker.on_treeview_update = lambda: notifications.append(1)
+        version = timeTracker.study_version
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            filename = os.path.join(tmp_dir, "entries.csv")
+            with open(filename, "w") as file:
+                file.write("semester,module,category,start,stop\n"
+                           "S,M,cat,2024-01-01T10:00:00,2024-01-01T11:00:00\n"
+                           "S,M,cat,invalid,2024-01-01T12:00:00\n"
+                           "S,M2,cat,2024-01-01T12:00:00,2024-01-01T13:00:00\n")
+            with self.assertRaises(ValueError):
+                timeTracker.import_from_csv(filename)
+
+        self.assertEqual(self.study.semesters, [])
+        self.assertEqual(timeTracker.study_version, version)
+        self.assertEqual(notifications, [])
+
+    def test_add_entries_bulk_error(self):
+        '''test that added entries are finalized if the rows raise'''
+        timeTracker = controller.TimeTracker(self.study)
+        notifications = []
+        timeTracker.on_treeview_update = lambda: notifications.append(1)
+        version = timeTracker.study_version
+        start = datetime.datetime(2024, 1, 1, 10)
+
+        def rows():
+            yield ("S", "M", "cat", "", start, start + datetime.timedelta(hours=1))
+            raise ValueError("invalid row")
+
+        with self.assertRaises(ValueError):
+            timeTracker.add_entries_bulk(rows())
+        mod = self.study.semesters[0].modules[0]
+        self.assertEqual(len(mod.entries), 1)
+        self.assertEqual(mod.ECTS, timeTracker.settings.get("module_ECTS"))
+        self.assertGreater(timeTracker.study_version, version)
+        self.assertEqual(notifications, [1])
+
+    def test_export_to_npz(self):
+        '''test the export_to_npz method'''
+        import numpy as np
+        study = generate_study(2, 2, 5, running_entries=1)
+        timeTracker = controller.TimeTracker(study)
+
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            filename = os.path.join(tmp_dir, "entries.npz")
+            timeTracker.export_to_npz(filename)
+            with np.load(filename) as data:
+                columns = {name: data[name] for name in data.files}
+
+        entries = list(study.iter_entries())
+        self.assertEqual(len(columns["start"]), 21)
+        for i, (sem, mod, entry) in enumerate(entries):
+            self.assertEqual(
+                columns["semester_names"][columns["semester"][i]], sem.name)
+            module = columns["module"][i]
+            self.assertEqual(columns["module_names"][module], mod.name)
+            self.assertEqual(columns["semester_names"][columns["module_semester"][module]],
+                             sem.name)
+            self.assertEqual(
+                columns["category_names"][columns["category"][i]], entry.category)
+            self.assertEqual(datetime.datetime(1970, 1, 1) + datetime.timedelta(
+                seconds=int(columns["start"][i])), entry.start_time)
+        self.assertEqual(columns["start"].dtype, np.int64)
+        # running entry
+        self.assertEqual(columns["stop"][-1], np.iinfo(np.int64).min)
+
+    def test_get_rollup(self):
+        '''test the get_rollup method'''
+        clock = FakeClock(datetime.datetime(2024, 2, 1, 12, 0))
+        timeTracker = controller.TimeTracker(
+            model.Study(180, 30, clock.now(), clock=clock))
+        start = datetime.datetime(2024, 1, 31, 23, 0)
+        sem, mod, _ = timeTracker.add_new_entry(
+            "sem", "mod", "cat", "", start, start + datetime.timedelta(hours=2))
+        timeTracker.add_new_entry("sem", "mod2", "cat", "", start,
+                                  start + datetime.timedelta(minutes=30))
+
+        starts, durations = timeTracker.get_rollup(sem, "day")
+        self.assertEqual(starts, [datetime.datetime(2024, 1, 31),
+                                  datetime.datetime(2024, 2, 1)])
+        self.assertEqual(durations, [datetime.timedelta(minutes=90),
+                                     datetime.timedelta(hours=1)])
+        self.assertEqual(timeTracker.get_rollup(mod, "month")[1],
+                         [datetime.timedelta(hours=1), datetime.timedelta(hours=1)])
+
+        # the cache of a module is invalidated by changes of its entries
+        cached = timeTracker._rollup_cache[(mod.id, "day")]
+        timeTracker.get_rollup(timeTracker._study, "day")
+        self.assertIs(timeTracker._rollup_cache[(mod.id, "day")], cached)
+        mod.entries[0].stop_time = start + datetime.timedelta(hours=3)
+        mod.touch()
+        self.assertEqual(timeTracker.get_rollup(mod, "day")[1],
+                         [datetime.timedelta(hours=1), datetime.timedelta(hours=2)])
+
+        # running entries are counted up to the current time
+        timeTracker.start_tracking("sem", "mod", "cat")
+        timeTracker._stop_timer()
+        clock.advance(minutes=30)
+        self.assertEqual(timeTracker.get_rollup(mod, "week")[1],
+                         [datetime.timedelta(hours=3, minutes=30)])
+        clock.advance(minutes=30)
+        timeTracker.stop_tracking()
+        self.assertEqual(timeTracker.get_rollup(mod, "week")[1],
+                         [datetime.timedelta(hours=4)])
+
+        with self.assertRaises(ValueError):
+            timeTracker.get_rollup(mod, "year")
+
     def test_update_semester(self):
         '''test the update_semester method'''
         timeTracker = controller.TimeTracker(self.study)
@@ -671,8 +1000,9 @@ class TimeTrackerUnitTest(unittest.TestCase):
         module.start = datetime.datetime(2023, 1, 1)
         module.plannedEnd = datetime.datetime(2023, 6, 30)
         module.stop = datetime.datetime(2023, 6, 30)
-        entry = model.Entry(category="cat", comment="com")
-        sleep(1)
+        clock = FakeClock()
+        entry = model.Entry(category="cat", comment="com", clock=clock)
+        clock.advance(seconds=1)
         entry.stop()
 
         module.entries.append(entry)
@@ -700,8 +1030,9 @@ class TimeTrackerUnitTest(unittest.TestCase):
         module.start = datetime.datetime(2023, 1, 1)
         module.plannedEnd = datetime.datetime(2023, 5, 30)
         module.stop = datetime.datetime(2023, 6, 30)
-        entry = model.Entry(category="cat", comment="com")
-        sleep(1)
+        clock = FakeClock()
+        entry = model.Entry(category="cat", comment="com", clock=clock)
+        clock.advance(seconds=1)
         entry.stop()
         module.entries.append(entry)
         semester.modules.append(module)
@@ -714,8 +1045,49 @@ class TimeTrackerUnitTest(unittest.TestCase):
         self.assertIsNotNone(chart)
         self.assertEqual(chart.title, "Burndown Chart")
         self.assertIsInstance(chart, BurndownChart)
-        self.assertEqual(chart.dates, [module.start, module.stop])
-        self.assertEqual(chart.remaining_work, [180, 175])
+        self.assertEqual(chart.dates.tolist(), [module.start, module.stop])
+        self.assertEqual(chart.remaining_work.tolist(), [180, 175])
+
+    def test_generate_all_charts(self):
+        '''test the generate_all_charts method'''
+        timeTracker = controller.TimeTracker(self.study)
+        start = datetime.datetime(2024, 1, 1, 10, 0)
+        sem, mod, _ = timeTracker.add_new_entry(
+            "sem", "mod", "cat", "", start, start + datetime.timedelta(hours=1))
+        timeTracker.add_new_entry(
+            "sem", "empty", "cat", "", start, start)
+
+        charts = dict(timeTracker.generate_all_charts())
+
+        # burndown charts of modules and pie charts without work are skipped
+        self.assertEqual(set(charts), {
+            ("study", ChartType.PIE), ("study", ChartType.BURNDOWN),
+            (timeTracker.get_object_id(sem), ChartType.PIE),
+            (timeTracker.get_object_id(sem), ChartType.BURNDOWN),
+            (timeTracker.get_object_id(mod), ChartType.PIE)})
+        self.assertIsInstance(charts[("study", ChartType.PIE)], PieChart)
+        self.assertEqual(timeTracker.get_chart_key(mod, ChartType.PIE),
+                         (timeTracker.get_object_id(mod), ChartType.PIE))
+
+    def test_generated_study(self):
+        '''test the tracker with a large generated study'''
+        study = generate_study(semesters=6, modules_per_semester=6,
+                               entries_per_module=200)
+        timeTracker = controller.TimeTracker(study)
+
+        self.assertEqual(
+            len(timeTracker.get_filtered_data_list("", "", "")), 7200)
+        self.assertEqual(
+            len(timeTracker.get_filtered_data_list("Semester 2", "", "")), 1200)
+
+        sem = study.semesters[1]
+        mod = sem.modules[2]
+        self.assertIs(timeTracker.get_object_by_id(
+            timeTracker.get_object_id(mod), sem), mod)
+
+        charts = timeTracker.generate_all_charts()
+        # pie charts of all scopes and burndown charts of the study and semesters
+        self.assertEqual(len(charts), 1 + 6 + 36 + 1 + 6)
 
     def test_generate_chart_scope(self):
         '''test the generate_chart method with different scopes'''
@@ -728,8 +1100,9 @@ class TimeTrackerUnitTest(unittest.TestCase):
         module.start = datetime.datetime(2023, 1, 1)
         module.plannedEnd = datetime.datetime(2023, 5, 30)
         module.stop = datetime.datetime(2023, 6, 30)
-        entry = model.Entry(category="cat", comment="com")
-        sleep(1)
+        clock = FakeClock()
+        entry = model.Entry(category="cat", comment="com", clock=clock)
+        clock.advance(seconds=1)
         entry.stop()
         module.entries.append(entry)
         semester.modules.append(module)
@@ -751,6 +1124,57 @@ class TimeTrackerUnitTest(unittest.TestCase):
         with self.assertRaises(ValueError, msg="BURNDOWN chart for module should raise an error"):
             chart = timeTracker.generate_chart(module, ChartType.BURNDOWN)
 
+    def test_chart_data_cache(self):
+        '''test the caching of the chart data'''
+        timeTracker = controller.TimeTracker(self.study)
+        start = datetime.datetime(2024, 1, 1, 10, 0)
+        stop = datetime.datetime(2024, 1, 1, 11, 0)
+        sem, _, _ = timeTracker.add_new_entry(
+            "sem", "mod", "cat", "com", start, stop)
+
+        with patch.object(timeTracker, '_get_pie_chart_data',
+                          wraps=timeTracker._get_pie_chart_data) as mock_pie:
+            # same scope and chart type is computed once
+            data = timeTracker._get_chart_data(sem, ChartType.PIE)
+            self.assertEqual(
+                timeTracker._get_chart_data(sem, ChartType.PIE), data)
+            self.assertEqual(mock_pie.call_count, 1)
+
+            # different scopes are cached separately
+            timeTracker._get_chart_data(self.study, ChartType.PIE)
+            self.assertEqual(mock_pie.call_count, 2)
+            timeTracker._get_chart_data(self.study, ChartType.PIE)
+            self.assertEqual(mock_pie.call_count, 2)
+
+            # a change of the study invalidates the cache
+            timeTracker.add_new_entry("sem", "mod", "cat", "com", start, stop)
+            new_data = timeTracker._get_chart_data(sem, ChartType.PIE)
+            self.assertEqual(mock_pie.call_count, 3)
+            self.assertEqual(new_data[1], [2 * data[1][0]])
+
+            # data is not cached while tracking is running
+            timeTracker.start_tracking("sem", "mod", "cat")
+            timeTracker._get_chart_data(sem, ChartType.PIE)
+            timeTracker._get_chart_data(sem, ChartType.PIE)
+            self.assertEqual(mock_pie.call_count, 5)
+            timeTracker.stop_tracking()
+
+    def test_update_chart(self):
+        '''test the update_chart method'''
+        timeTracker = controller.TimeTracker(self.study)
+        start = datetime.datetime(2024, 1, 1, 10, 0)
+        sem, _, _ = timeTracker.add_new_entry(
+            "sem", "mod", "cat", "com", start, start + datetime.timedelta(hours=1))
+
+        chart = timeTracker.generate_chart(sem, ChartType.PIE)
+        self.assertEqual(chart.labels, ["mod"])
+
+        timeTracker.add_new_entry(
+            "sem", "mod2", "cat", "com", start, start + datetime.timedelta(hours=3))
+        timeTracker.update_chart(chart, sem, ChartType.PIE)
+        self.assertEqual(chart.labels, ["mod", "mod2"])
+        self.assertEqual(chart.rel_sizes, [25.0, 75.0])
+
     def test_update_study(self):
         '''test the update_study method'''
         timeTracker = controller.TimeTracker(self.study)
@@ -807,6 +1231,44 @@ class TimeTrackerUnitTest(unittest.TestCase):
         self.assertEqual(new_study.plannedEnd, new_plannedEnd)
         self.assertTrue(update_called, "on_treeview_update was not called")
 
+    def test_study_version(self):
+        '''test if the study version is incremented at changes'''
+        timeTracker = controller.TimeTracker(self.study)
+        version = timeTracker.study_version
+
+        sem, mod, entry = timeTracker.add_new_entry(
+            "sem", "mod", "cat", "com", datetime.datetime.now(), datetime.datetime.now())
+        self.assertGreater(timeTracker.study_version, version)
+
+        version = timeTracker.study_version
+        timeTracker.finish_module("sem", "mod")
+        self.assertGreater(timeTracker.study_version, version)
+
+        version = timeTracker.study_version
+        timeTracker.update_semester(sem, "ECTS", "10")
+        self.assertGreater(timeTracker.study_version, version)
+
+        version = timeTracker.study_version
+        timeTracker.remove_entry(sem, mod, entry)
+        self.assertGreater(timeTracker.study_version, version)
+
+        # tracking notifies the observer like the other changes
+        notifications = []
+        timeTracker.on_treeview_update = lambda: notifications.append(
+            timeTracker.study_version)
+        version = timeTracker.study_version
+        timeTracker.start_tracking("sem", "mod", "cat")
+        timeTracker._stop_timer()
+        self.assertEqual(notifications, [version + 1])
+        timeTracker.toggle_tracking("sem", "mod", "cat")
+        self.assertEqual(notifications, [version + 1, version + 2])
+
+        # reading data does not change the version
+        version = timeTracker.study_version
+        timeTracker.get_filtered_data_list("", "", "")
+        timeTracker.get_semester_names()
+        self.assertEqual(timeTracker.study_version, version)
+
     def test_get_last_tracking_information(self):
         '''test the get_last_tracking_information method'''
         timeTracker = controller.TimeTracker(self.study)
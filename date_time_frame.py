@@ -1,6 +1,5 @@
 import tkinter as tk
 from tkinter import ttk
-from tkcalendar import DateEntry
 import datetime
 
 
@@ -36,8 +35,12 @@ class DateTimeFrame(ttk.Frame):
         self.minute_entry.grid(row=0, column=5, sticky='w')
 
     def initialize_date_entry(self):
-        ''' Initialize the DateEntry widget '''
+        ''' Initialize the DateEntry widget
+
+        tkcalendar is imported at the first DateEntry
+        '''
         if not self.date_initialized:
+            from tkcalendar import DateEntry
             self.date = DateEntry(self, width=10)
             self.date.set_date(self.datetime)
             self.date_placeholder.destroy()
@@ -0,0 +1,439 @@
+import gc
+import io
+import os
+import sys
+import threading
+import time
+import traceback
+from collections import Counter, deque
+
+PROFILER_MODES = ("cprofile", "sampling")
+
+# the running profiler, only one profiler can profile the main thread
+_active_profiler = None
+
+
+def get_active_profiler():
+    '''gets the running session profiler
+
+    returns: the profiler or None if no profiler is running
+    '''
+    return _active_profiler
+
+
+class SessionProfiler:
+    '''Profiles a running session of the GUI
+
+    cprofile records all calls of the thread which starts the profiler.
+    sampling records the stack of that thread periodically from a background
+    thread, which has less overhead.
+    '''
+
+    def __init__(self, mode="cprofile", interval=0.005, limit=40):
+        '''creates the profiler
+
+        mode: cprofile or sampling
+        interval: the interval of the samples in seconds
+        limit: the number of functions in the report
+        '''
+        if mode not in PROFILER_MODES:
+            raise ValueError(f"Profiler mode {mode} is not supported.")
+        self.mode = mode
+        self.interval = interval
+        self.limit = limit
+        self.running = False
+        self._profile = None
+        self._thread = None
+        self._stop_event = threading.Event()
+        self._samples = 0
+        self._self_counts = Counter()
+        self._total_counts = Counter()
+        self._start_time = 0
+        self._duration = 0
+
+    def start(self):
+        '''starts the profiling of the current thread
+
+        raises RuntimeError if this or another profiler is already running
+        '''
+        global _active_profiler
+        if self.running:
+            raise RuntimeError("Profiler is already running")
+        if _active_profiler is not None:
+            raise RuntimeError("Another profiler is already running")
+        _active_profiler = self
+        self.running = True
+        self._start_time = time.perf_counter()
+        if self.mode == "cprofile":
+            # imported here to keep the startup fast
+            import cProfile
+            self._profile = cProfile.Profile()
+            self._profile.enable()
+        else:
+            self._samples = 0
+            self._self_counts.clear()
+            self._total_counts.clear()
+            self._stop_event.clear()
+            self._thread = threading.Thread(
+                target=self._sample, args=(threading.get_ident(),), daemon=True)
+            self._thread.start()
+
+    def stop(self):
+        '''stops the profiling
+
+        raises RuntimeError if the profiler is not running
+
+        returns: the report
+        '''
+        global _active_profiler
+        if not self.running:
+            raise RuntimeError("Profiler is not running")
+        if self.mode == "cprofile":
+            self._profile.disable()
+        else:
+            self._stop_event.set()
+            self._thread.join()
+            self._thread = None
+        self._duration = time.perf_counter() - self._start_time
+        self.running = False
+        _active_profiler = None
+        return self.get_report()
+
+    def get_report(self):
+        '''gets the report of the last profiling
+
+        returns: the report as text
+        '''
+        header = f"{self.mode} profile of {self._duration:.1f} s\n"
+        if self.mode == "cprofile":
+            if self._profile is None:
+                return header
+            import pstats
+            stream = io.StringIO()
+            stats = pstats.Stats(self._profile, stream=stream)
+            stats.sort_stats("cumulative").print_stats(self.limit)
+            return header + stream.getvalue()
+
+        lines = [header + f"{self._samples} samples every {self.interval * 1000:g} ms",
+                 f"{'self %':>8}{'total %':>9}  function"]
+        samples = max(self._samples, 1)
+        for function, count in self._total_counts.most_common(self.limit):
+            lines.append(f"{self._self_counts[function] / samples:>8.1%}"
+                         f"{count / samples:>9.1%}  {function}")
+        return "\n".join(lines)
+
+    def write_report(self, filename):
+        '''writes the report of the last profiling to a file
+
+        filename: the name of the file
+        '''
+        with open(filename, 'w') as file:
+            file.write(self.get_report())
+        print(f"Profile was successfully written to {filename}.")
+
+    def _sample(self, thread_id):
+        '''records the stack of the profiled thread until the profiler is stopped
+
+        thread_id: the id of the profiled thread
+        '''
+        while not self._stop_event.wait(self.interval):
+            frame = sys._current_frames().get(thread_id)
+            if frame is None:
+                continue
+            self._samples += 1
+            self._self_counts[self._get_function(frame)] += 1
+            # count recursive functions only once per sample
+            functions = set()
+            while frame is not None:
+                functions.add(self._get_function(frame))
+                frame = frame.f_back
+            self._total_counts.update(functions)
+
+    @staticmethod
+    def _get_function(frame):
+        '''gets a readable name of the function of a frame
+
+        frame: the frame
+
+        returns: the name as file:line(function)
+        '''
+        code = frame.f_code
+        return f"{os.path.basename(code.co_filename)}:{code.co_firstlineno}({code.co_name})"
+
+
+def run_mainloop(root, mode=None, filename="profile_report.txt"):
+    '''runs the Tk main loop, profiled if a mode is given
+
+    root: the Tk root window
+    mode: the profiler mode (cprofile, sampling), None to run without profiler
+    filename: the file of the report
+    '''
+    if not mode:
+        root.mainloop()
+        return
+
+    profiler = SessionProfiler(mode)
+    profiler.start()
+    try:
+        root.mainloop()
+    finally:
+        profiler.stop()
+        profiler.write_report(filename)
+
+
+class StallDetector:
+    '''Detects stalls of the Tk main loop
+
+    a callback is scheduled periodically with after. Its delay is the latency
+    of the event loop. A watchdog thread captures the stack of the main thread
+    while a stall lasts, so the handler which blocks the loop can be logged.
+    '''
+
+    def __init__(self, root, interval=0.1, threshold=0.25, history=50):
+        '''creates the detector
+
+        root: the Tk root window
+        interval: the interval of the callbacks in seconds
+        threshold: the latency in seconds which is logged as stall
+        history: the number of stalls which are kept
+        '''
+        self.root = root
+        self.interval = interval
+        self.threshold = threshold
+        self.running = False
+        self.stalls = deque(maxlen=history)
+        self._job = None
+        self._thread = None
+        self._stop_event = threading.Event()
+        self._main_thread_id = None
+        self._expected = 0
+        self._stack = None
+        self._ticks = 0
+        self._total_latency = 0.0
+        self._max_latency = 0.0
+        self._stall_count = 0
+        self._stall_time = 0.0
+
+    def start(self):
+        '''starts the detector, must be called from the Tk thread'''
+        if self.running:
+            return
+        self.running = True
+        self._main_thread_id = threading.get_ident()
+        self._stop_event.clear()
+        self._schedule()
+        self._thread = threading.Thread(target=self._watch, daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        '''stops the detector'''
+        if not self.running:
+            return
+        self.running = False
+        if self._job is not None:
+            self.root.after_cancel(self._job)
+            self._job = None
+        self._stop_event.set()
+        self._thread.join()
+        self._thread = None
+
+    def record(self, latency, stack=None):
+        '''records the latency of a callback
+
+        latency: the delay of the callback in seconds
+        stack: the stack of the main thread during the stall
+        '''
+        self._ticks += 1
+        self._total_latency += latency
+        self._max_latency = max(self._max_latency, latency)
+        if latency < self.threshold:
+            return
+        self._stall_count += 1
+        self._stall_time += latency
+        self.stalls.append({"time": time.time(), "latency": latency,
+                            "stack": stack})
+        print(f"Main loop stalled for {latency * 1000:.0f} ms")
+        if stack:
+            print("".join(stack))
+
+    def get_stats(self):
+        '''gets the statistics of the event loop latency
+
+        returns: dict with the number of callbacks, mean and max latency,
+                 number and total time of the stalls (in seconds)
+        '''
+        return {"ticks": self._ticks,
+                "mean_latency": self._total_latency / max(self._ticks, 1),
+                "max_latency": self._max_latency,
+                "stalls": self._stall_count,
+                "stall_time": self._stall_time}
+
+    def _schedule(self):
+        '''schedules the next callback'''
+        self._expected = time.perf_counter() + self.interval
+        self._job = self.root.after(int(self.interval * 1000), self._tick)
+
+    def _tick(self):
+        '''callback in the main loop, records the latency'''
+        self._job = None
+        latency = max(time.perf_counter() - self._expected, 0)
+        stack, self._stack = self._stack, None
+        self.record(latency, stack)
+        if self.running:
+            self._schedule()
+
+    def _watch(self):
+        '''captures the stack of the main thread if a stall lasts'''
+        while not self._stop_event.wait(self.interval):
+            if self._stack is not None:
+                continue
+            if time.perf_counter() - self._expected < self.threshold:
+                continue
+            frame = sys._current_frames().get(self._main_thread_id)
+            if frame is not None:
+                self._stack = traceback.format_stack(frame)
+
+
+def get_deep_size(obj, seen=None):
+    '''gets the memory size of an object including the objects it references
+
+    follows lists, tuples, sets, dicts and the attributes of objects,
+    objects which are referenced several times are counted once
+
+    obj: the object
+    seen: ids of the objects which are already counted
+
+    returns: the size in bytes
+    '''
+    if seen is None:
+        seen = set()
+    size = 0
+    stack = [obj]
+    while stack:
+        item = stack.pop()
+        if id(item) in seen or isinstance(item, type):
+            continue
+        seen.add(id(item))
+        size += sys.getsizeof(item)
+        if isinstance(item, dict):
+            stack.extend(item.keys())
+            stack.extend(item.values())
+        elif isinstance(item, (list, tuple, set, frozenset)):
+            stack.extend(item)
+        elif hasattr(item, "__dict__"):
+            stack.append(item.__dict__)
+    return size
+
+
+def get_study_memory(study):
+    '''gets the memory used by a study per semester and module
+
+    last_semester, last_module and last_entry of the study are loaded as
+    separate objects and are counted for the study
+
+    study: the study
+
+    returns: dict with the total size, the size per semester and module,
+             the number of entries and the mean size of an entry (bytes)
+    '''
+    seen = set()
+    semesters = {}
+    entries = 0
+    entry_bytes = 0
+    for semester in study.semesters:
+        modules = {}
+        for module in semester.modules:
+            module_entries = [get_deep_size(entry, seen)
+                              for entry in module.entries]
+            entries += len(module_entries)
+            entry_bytes += sum(module_entries)
+            modules[module.name] = sum(module_entries) + \
+                get_deep_size(module, seen)
+        semesters[semester.name] = {
+            "bytes": sum(modules.values()) + get_deep_size(semester, seen),
+            "modules": modules}
+
+    return {"bytes": sum(semester["bytes"] for semester in semesters.values())
+            + get_deep_size(study, seen),
+            "semesters": semesters,
+            "entries": entries,
+            "bytes_per_entry": entry_bytes / entries if entries else 0}
+
+
+def count_objects(classes):
+    '''counts the living objects of classes
+
+    classes: the classes to count
+
+    returns: dict of class name -> number of objects
+    '''
+    counts = dict.fromkeys((cls.__name__ for cls in classes), 0)
+    for obj in gc.get_objects():
+        for cls in classes:
+            if isinstance(obj, cls):
+                counts[cls.__name__] += 1
+    return counts
+
+
+def count_figures():
+    '''counts the matplotlib figures
+
+    matplotlib is not imported by this function
+
+    returns: dict with the number of figures registered in pyplot
+             and the number of all living figures
+    '''
+    if "matplotlib.figure" not in sys.modules:
+        return {"pyplot": 0, "total": 0}
+    from matplotlib.figure import Figure
+    pyplot = sys.modules.get("matplotlib.pyplot")
+    gc.collect()
+    return {"pyplot": len(pyplot.get_fignums()) if pyplot else 0,
+            "total": count_objects([Figure])["Figure"]}
+
+
+def start_memory_tracing():
+    '''starts tracemalloc, only allocations after the start are traced'''
+    import tracemalloc
+    if not tracemalloc.is_tracing():
+        tracemalloc.start()
+
+
+def get_memory_report(study=None, limit=10):
+    '''gets a report of the memory usage
+
+    study: the study to measure, None to skip the study
+    limit: the number of allocation sites of tracemalloc in the report
+
+    returns: the report as text
+    '''
+    import tracemalloc
+    from model import Study, Semester, Module, Entry
+
+    lines = []
+    if study is not None:
+        memory = get_study_memory(study)
+        lines.append(f"Study: {memory['bytes'] / 1024:.1f} KiB, {memory['entries']} entries, "
+                     f"{memory['bytes_per_entry']:.0f} bytes per entry")
+        for name, semester in memory["semesters"].items():
+            lines.append(f"  {name}: {semester['bytes'] / 1024:.1f} KiB")
+            for module_name, size in semester["modules"].items():
+                lines.append(f"    {module_name}: {size / 1024:.1f} KiB")
+
+    gc.collect()
+    counts = count_objects([Study, Semester, Module, Entry])
+    lines.append("Objects: " + ", ".join(f"{name} {count}"
+                                         for name, count in counts.items()))
+    figures = count_figures()
+    lines.append(f"Figures: {figures['total']} ({figures['pyplot']} open in pyplot)")
+
+    if tracemalloc.is_tracing():
+        current, peak = tracemalloc.get_traced_memory()
+        lines.append(f"Traced memory: {current / 1024 ** 2:.1f} MiB "
+                     f"(peak {peak / 1024 ** 2:.1f} MiB)")
+        snapshot = tracemalloc.take_snapshot()
+        for stat in snapshot.statistics("filename")[:limit]:
+            lines.append(f"  {stat}")
+    else:
+        lines.append("tracemalloc is not tracing")
+    return "\n".join(lines)
@@ -0,0 +1,175 @@
+import unittest
+import os
+import tempfile
+import time
+import tkinter as tk
+import tracemalloc
+import diagnostics
+from diagnostics import SessionProfiler, StallDetector
+from study_generator import generate_study
+from charts import PieChart, render_chart
+
+
+def busy_function(seconds):
+    end = time.perf_counter() + seconds
+    total = 0
+    while time.perf_counter() < end:
+        total += 1
+    return total
+
+
+class SessionProfilerTest(unittest.TestCase):
+
+    def test_cprofile(self):
+        profiler = SessionProfiler("cprofile")
+        profiler.start()
+        self.assertTrue(profiler.running)
+        busy_function(0.05)
+        report = profiler.stop()
+
+        self.assertFalse(profiler.running)
+        self.assertIn("busy_function", report)
+
+    def test_sampling(self):
+        profiler = SessionProfiler("sampling", interval=0.001)
+        profiler.start()
+        busy_function(0.3)
+        report = profiler.stop()
+
+        self.assertGreater(profiler._samples, 0)
+        self.assertIn("busy_function", report)
+
+    def test_start_stop(self):
+        profiler = SessionProfiler()
+        with self.assertRaises(RuntimeError):
+            profiler.stop()
+        profiler.start()
+        with self.assertRaises(RuntimeError):
+            profiler.start()
+        profiler.stop()
+
+        with self.assertRaises(ValueError):
+            SessionProfiler("unknown")
+
+    def test_active_profiler(self):
+        profiler = SessionProfiler()
+        self.assertIsNone(diagnostics.get_active_profiler())
+        profiler.start()
+        self.assertIs(diagnostics.get_active_profiler(), profiler)
+        # a second profiler must not profile the same thread
+        with self.assertRaises(RuntimeError):
+            SessionProfiler("sampling").start()
+        profiler.stop()
+        self.assertIsNone(diagnostics.get_active_profiler())
+
+    def test_write_report(self):
+        profiler = SessionProfiler()
+        profiler.start()
+        busy_function(0.01)
+        profiler.stop()
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            filename = os.path.join(tmp_dir, "profile.txt")
+            profiler.write_report(filename)
+            with open(filename, 'r') as file:
+                self.assertIn("busy_function", file.read())
+
+
+def blocking_handler():
+    time.sleep(0.5)
+
+
+class StallDetectorTest(unittest.TestCase):
+
+    def test_record(self):
+        detector = StallDetector(None, threshold=0.2)
+        detector.record(0.01)
+        detector.record(0.3, ["stack"])
+
+        stats = detector.get_stats()
+        self.assertEqual(stats["ticks"], 2)
+        self.assertEqual(stats["stalls"], 1)
+        self.assertAlmostEqual(stats["max_latency"], 0.3)
+        self.assertAlmostEqual(stats["mean_latency"], 0.155)
+        self.assertEqual(detector.stalls[0]["stack"], ["stack"])
+
+    def test_detect_stall(self):
+        root = tk.Tk()
+        root.withdraw()
+        try:
+            detector = StallDetector(root, interval=0.05, threshold=0.2)
+            detector.start()
+            root.after(100, blocking_handler)
+            end = time.perf_counter() + 1
+            while time.perf_counter() < end:
+                root.update()
+                time.sleep(0.01)
+            detector.stop()
+        finally:
+            root.destroy()
+
+        self.assertFalse(detector.running)
+        self.assertGreater(detector.get_stats()["ticks"], 5)
+        self.assertEqual(detector.get_stats()["stalls"], 1)
+        # the stack shows the blocking handler
+        self.assertIn("blocking_handler", "".join(detector.stalls[0]["stack"]))
+
+
+class MemoryTest(unittest.TestCase):
+
+    def test_get_deep_size(self):
+        shared = "x" * 1000
+        size = diagnostics.get_deep_size([shared])
+        self.assertGreater(size, 1000)
+        # referenced objects are counted once
+        self.assertLess(diagnostics.get_deep_size([shared, shared]), size + 100)
+
+    def test_get_study_memory(self):
+        study = generate_study(semesters=2, modules_per_semester=3,
+                               entries_per_module=50)
+        memory = diagnostics.get_study_memory(study)
+
+        self.assertEqual(memory["entries"], 300)
+        self.assertGreater(memory["bytes_per_entry"], 0)
+        self.assertEqual(list(memory["semesters"]), ["Semester 1", "Semester 2"])
+        semester = memory["semesters"]["Semester 1"]
+        self.assertEqual(len(semester["modules"]), 3)
+        self.assertGreater(semester["bytes"], sum(semester["modules"].values()))
+        self.assertGreater(memory["bytes"], 300 * memory["bytes_per_entry"])
+
+        # modules with the same number of entries have a similar size
+        sizes = [size for semester in memory["semesters"].values()
+                 for size in semester["modules"].values()]
+        self.assertLess(max(sizes), 2 * min(sizes))
+
+    def test_count_objects(self):
+        study = generate_study(1, 2, 10)
+        from model import Module, Entry
+        counts = diagnostics.count_objects([Module, Entry])
+        self.assertGreaterEqual(counts["Module"], 2)
+        self.assertGreaterEqual(counts["Entry"], 20)
+        del study
+
+    def test_no_figure_growth(self):
+        chart = PieChart("pie", ['Apples', 'Bananas'], [15, 30])
+        render_chart(chart, figsize=(2, 2), dpi=50)
+        before = diagnostics.count_figures()
+        for _ in range(10):
+            render_chart(chart, figsize=(2, 2), dpi=50)
+        self.assertEqual(diagnostics.count_figures(), before)
+
+    def test_get_memory_report(self):
+        study = generate_study(1, 1, 10)
+        report = diagnostics.get_memory_report(study)
+        self.assertIn("Semester 1", report)
+        self.assertIn("Figures", report)
+        self.assertIn("tracemalloc is not tracing", report)
+
+        diagnostics.start_memory_tracing()
+        try:
+            self.assertIn("Traced memory", diagnostics.get_memory_report())
+        finally:
+            tracemalloc.stop()
+
+
+if __name__ == '__main__':
+    unittest.main()
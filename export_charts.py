@@ -0,0 +1,162 @@
+import argparse
+import json
+import os
+import re
+from concurrent.futures import ProcessPoolExecutor
+import matplotlib
+from model import Study
+from controller import TimeTracker
+from settings import Settings
+from charts import ChartType, render_chart
+
+SCOPES = ("study", "semester", "module")
+FORMATS = ("png", "svg")
+
+
+def load_study(filename):
+    '''loads a study from a json file
+
+    the last filename of the settings is not changed
+
+    filename: the name of the file
+
+    returns: the study
+    '''
+    with open(filename, 'r') as file:
+        return Study.from_json(json.load(file))
+
+
+def get_scopes(study, scopes=SCOPES):
+    '''gets the scopes of the charts
+
+    study: the study
+    scopes: the kinds of scopes (study, semester, module)
+
+    returns: list of (name, scope), the name is unique within the study
+    '''
+    result = []
+    if "study" in scopes:
+        result.append(("study", study))
+    for semester in study.semesters:
+        if "semester" in scopes:
+            result.append((semester.name, semester))
+        if "module" in scopes:
+            for module in semester.modules:
+                result.append((f"{semester.name}_{module.name}", module))
+    return result
+
+
+def get_filename(name, chart_type, fmt):
+    '''gets the filename of an exported chart
+
+    name: the name of the scope
+    chart_type: the type of the chart
+    fmt: the file format
+
+    returns: the filename
+    '''
+    name = re.sub(r'[^\w-]', '_', name)
+    return f"{name}_{chart_type.value}.{fmt}"
+
+
+def render_to_file(task):
+    '''renders a chart to a file
+
+    runs in a worker process if the export is parallel
+
+    task: tuple of (chart, path, fmt, figsize, dpi)
+
+    returns: the path
+    '''
+    chart, path, fmt, figsize, dpi = task
+    data = render_chart(chart, figsize, dpi, fmt)
+    with open(path, 'wb') as file:
+        file.write(data)
+    return path
+
+
+def export_charts(filename, output_dir, formats=("png",), chart_types=tuple(ChartType),
+                  scopes=SCOPES, jobs=1, figsize=(5, 5), dpi=100):
+    '''exports the charts of a study
+
+    charts which can not be generated with the data are skipped
+
+    filename: the study file
+    output_dir: the directory of the exported charts
+    formats: the file formats
+    chart_types: the types of the charts
+    scopes: the kinds of scopes (study, semester, module)
+    jobs: the number of processes to render the charts
+    figsize: the size of the figures
+    dpi: the resolution of the figures
+
+    returns: list of the exported files
+    '''
+    study = load_study(filename)
+    # the defaults are kept in memory, the export must not write a settings file
+    tracker = TimeTracker(study, settings=Settings(filename=None))
+    os.makedirs(output_dir, exist_ok=True)
+
+    tasks = []
+    for name, scope in get_scopes(study, scopes):
+        for chart_type in chart_types:
+            try:
+                chart = tracker.generate_chart(scope, chart_type)
+            except ValueError as e:
+                print(f"Skipped {chart_type.value} chart of {name}: {e}")
+                continue
+            for fmt in formats:
+                path = os.path.join(
+                    output_dir, get_filename(name, chart_type, fmt))
+                tasks.append((chart, path, fmt, figsize, dpi))
+
+    if jobs > 1 and len(tasks) > 1:
+        with ProcessPoolExecutor(max_workers=jobs) as executor:
+            return list(executor.map(render_to_file, tasks))
+    return [render_to_file(task) for task in tasks]
+
+
+def parse_args(argv=None):
+    '''parses the command line arguments
+
+    argv: the arguments, sys.argv is used if None
+
+    returns: the parsed arguments
+    '''
+    parser = argparse.ArgumentParser(
+        description="Export the charts of a study without a display")
+    parser.add_argument("filename", help="the study file (json)")
+    parser.add_argument("-o", "--output", default="charts",
+                        help="the directory of the exported charts")
+    parser.add_argument("-f", "--formats", nargs="+", choices=FORMATS,
+                        default=["png"], help="the file formats")
+    parser.add_argument("-c", "--charts", nargs="+",
+                        choices=[chart_type.value for chart_type in ChartType],
+                        default=[chart_type.value for chart_type in ChartType],
+                        help="the chart types")
+    parser.add_argument("-s", "--scopes", nargs="+", choices=SCOPES,
+                        default=list(SCOPES), help="the scopes of the charts")
+    parser.add_argument("-j", "--jobs", type=int, default=1,
+                        help="the number of processes to render the charts")
+    parser.add_argument("--dpi", type=int, default=100,
+                        help="the resolution of the charts")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    '''exports the charts as defined by the command line arguments
+
+    argv: the arguments, sys.argv is used if None
+    '''
+    # the charts are rendered with Agg canvases, the backend of pyplot is
+    # set only for the command, so importing the module changes nothing
+    matplotlib.use('Agg')
+    args = parse_args(argv)
+    files = export_charts(args.filename, args.output, args.formats,
+                          [ChartType(chart) for chart in args.charts],
+                          args.scopes, args.jobs, dpi=args.dpi)
+    print(f"{len(files)} charts were exported to {args.output}.")
+
+
+if __name__ == "__main__":
+    main()
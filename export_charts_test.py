@@ -0,0 +1,95 @@
+import unittest
+import datetime
+import json
+import os
+import tempfile
+import export_charts
+from model import Study
+from controller import TimeTracker
+from charts import ChartType
+from settings import Settings
+
+
+class ExportChartsTest(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.output_dir = os.path.join(self.tmp_dir.name, "charts")
+        self.filename = os.path.join(self.tmp_dir.name, "study.json")
+
+        study = Study(ECTS=180, hoursPerECTS=30,
+                      plannedEnd=datetime.datetime(2026, 12, 31))
+        tracker = TimeTracker(study, settings=Settings(filename=None))
+        start = datetime.datetime(2024, 1, 1, 10, 0)
+        tracker.add_new_entry("Semester 1", "Module1", "Programming", "",
+                              start, start + datetime.timedelta(hours=1))
+        tracker.add_new_entry("Semester 1", "Module2", "Reading", "",
+                              start, start + datetime.timedelta(hours=2))
+        with open(self.filename, 'w') as file:
+            json.dump(study.to_json(), file)
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def test_get_scopes(self):
+        study = export_charts.load_study(self.filename)
+        names = [name for name, _ in export_charts.get_scopes(study)]
+        self.assertEqual(names, ["study", "Semester 1",
+                         "Semester 1_Module1", "Semester 1_Module2"])
+
+        names = [name for name, _ in export_charts.get_scopes(
+            study, ["module"])]
+        self.assertEqual(names, ["Semester 1_Module1", "Semester 1_Module2"])
+
+    def test_get_filename(self):
+        self.assertEqual(export_charts.get_filename(
+            "Semester 1/Module", ChartType.PIE, "svg"), "Semester_1_Module_pie.svg")
+
+    def test_export_charts(self):
+        files = export_charts.export_charts(
+            self.filename, self.output_dir, formats=["png", "svg"])
+
+        # burndown charts are not supported for modules
+        expected = {"study_burndown", "study_pie", "Semester_1_burndown", "Semester_1_pie",
+                    "Semester_1_Module1_pie", "Semester_1_Module2_pie"}
+        self.assertEqual(
+            {os.path.basename(file) for file in files},
+            {f"{name}.{fmt}" for name in expected for fmt in ["png", "svg"]})
+
+        with open(os.path.join(self.output_dir, "study_pie.png"), 'rb') as file:
+            self.assertTrue(file.read().startswith(b'\x89PNG'))
+        with open(os.path.join(self.output_dir, "study_pie.svg"), 'r') as file:
+            self.assertIn("<svg", file.read())
+
+    def test_export_charts_parallel(self):
+        files = export_charts.export_charts(
+            self.filename, self.output_dir, chart_types=[ChartType.PIE],
+            scopes=["semester", "module"], jobs=2)
+        self.assertEqual(sorted(os.path.basename(file) for file in files),
+                         ["Semester_1_Module1_pie.png", "Semester_1_Module2_pie.png",
+                          "Semester_1_pie.png"])
+        for file in files:
+            self.assertTrue(os.path.exists(file))
+
+    def test_no_settings_file(self):
+        '''tests that the export does not write files to the current directory'''
+        cwd = os.getcwd()
+        with tempfile.TemporaryDirectory() as work_dir:
+            os.chdir(work_dir)
+            try:
+                export_charts.export_charts(
+                    self.filename, self.output_dir, chart_types=[ChartType.PIE],
+                    scopes=["study"])
+                self.assertEqual(os.listdir(work_dir), [])
+            finally:
+                os.chdir(cwd)
+        self.assertEqual(os.listdir(self.output_dir), ["study_pie.png"])
+
+    def test_main(self):
+        export_charts.main([self.filename, "-o", self.output_dir,
+                            "-c", "burndown", "-s", "study", "-f", "svg"])
+        self.assertEqual(os.listdir(self.output_dir), ["study_burndown.svg"])
+
+
+if __name__ == '__main__':
+    unittest.main()
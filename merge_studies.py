@@ -0,0 +1,263 @@
+import argparse
+import datetime
+import json
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+
+def load_study_data(filename):
+    '''loads the json data of a study file
+
+    runs in a worker process if the files are loaded in parallel
+
+    filename: the study file
+
+    returns: the json data
+    '''
+    with open(filename, 'r') as file:
+        return json.load(file)
+
+
+def load_all(filenames, jobs=1):
+    '''loads study files in the order of the filenames
+
+    at most jobs files are loaded at the same time, so the memory is bounded
+    even for many large files
+
+    filenames: the study files
+    jobs: the number of worker processes, the files are loaded in this
+          process if 1
+
+    returns: generator of the json data of the files
+    '''
+    if jobs <= 1:
+        for filename in filenames:
+            yield load_study_data(filename)
+        return
+
+    with ProcessPoolExecutor(max_workers=jobs) as executor:
+        pending = deque()
+        for filename in filenames:
+            pending.append(executor.submit(load_study_data, filename))
+            if len(pending) >= jobs:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+
+
+def _parse(value):
+    '''parses an optional time of the json data
+
+    value: the time as iso string or None
+
+    returns: the datetime or None
+    '''
+    return datetime.datetime.fromisoformat(value) if value else None
+
+
+def _later(first, second):
+    '''gets the later of two optional times
+
+    first: a time as iso string or None
+    second: a time as iso string or None
+
+    returns: the later time, None only if both are None
+    '''
+    if not first or not second:
+        return first or second
+    return first if _parse(first) >= _parse(second) else second
+
+
+def _earlier(first, second):
+    '''gets the earlier of two optional times
+
+    first: a time as iso string or None
+    second: a time as iso string or None
+
+    returns: the earlier time, None only if both are None
+    '''
+    if not first or not second:
+        return first or second
+    return first if _parse(first) <= _parse(second) else second
+
+
+def _entry_rank(entry):
+    '''gets the rank of an entry for resolving conflicts
+
+    a finished entry wins over a running one, then the later stop,
+    the later start, the category and the comment decide
+
+    entry: the json data of the entry
+
+    returns: a sortable key
+    '''
+    stop = _parse(entry["stop_time"])
+    return (stop is not None, stop or datetime.datetime.min,
+            _parse(entry["start_time"]) or datetime.datetime.min,
+            entry["category"], entry["comment"])
+
+
+class StudyMerger:
+    '''Merges the json data of several studies
+
+    semesters and modules are matched by name, entries by id.
+    Conflicts are resolved independent of the order of the files:
+    the larger ECTS and hours per ECTS, the later planned end and stop,
+    the earlier module start, and the entry with the highest rank
+    (see _entry_rank). Semesters and modules keep the order in which they
+    were found, entries are sorted by their start.
+    '''
+
+    def __init__(self):
+        '''creates an empty merger'''
+        self.study = None
+        # semester name -> (semester data, {module name -> (module data, {entry id -> entry})})
+        self.semesters = {}
+        self.last = None
+        self.conflicts = 0
+
+    def add(self, data):
+        '''merges the json data of a study
+
+        data: the json data
+        '''
+        if self.study is None:
+            self.study = {key: data[key]
+                          for key in ("ECTS", "hoursPerECTS", "plannedEnd")}
+        else:
+            self.study["ECTS"] = max(self.study["ECTS"], data["ECTS"])
+            self.study["hoursPerECTS"] = max(
+                self.study["hoursPerECTS"], data["hoursPerECTS"])
+            self.study["plannedEnd"] = _later(
+                self.study["plannedEnd"], data["plannedEnd"])
+
+        for semester in data["semesters"]:
+            self._add_semester(semester)
+
+        # the most recent tracking is continued after the merge
+        last_entry = data.get("last_entry")
+        if not (last_entry and data.get("last_semester") and data.get("last_module")):
+            return
+        if self.last is None or _entry_rank(last_entry)[2:] > _entry_rank(self.last[2])[2:]:
+            self.last = (data["last_semester"]["name"],
+                         data["last_module"]["name"], last_entry)
+
+    def _add_semester(self, semester):
+        '''merges a semester
+
+        semester: the json data of the semester
+        '''
+        if semester["name"] not in self.semesters:
+            merged = {key: value for key, value in semester.items()
+                      if key != "modules"}
+            self.semesters[semester["name"]] = (merged, {})
+        else:
+            merged = self.semesters[semester["name"]][0]
+            merged["ECTS"] = max(merged["ECTS"], semester["ECTS"])
+            merged["plannedEnd"] = _later(
+                merged["plannedEnd"], semester["plannedEnd"])
+            merged["id"] = min(merged["id"], semester["id"])
+
+        modules = self.semesters[semester["name"]][1]
+        for module in semester["modules"]:
+            self._add_module(modules, module)
+
+    def _add_module(self, modules, module):
+        '''merges a module
+
+        modules: the merged modules of the semester
+        module: the json data of the module
+        '''
+        if module["name"] not in modules:
+            merged = {key: value for key, value in module.items()
+                      if key != "entries"}
+            modules[module["name"]] = (merged, {})
+        else:
+            merged = modules[module["name"]][0]
+            merged["ECTS"] = max(merged["ECTS"], module["ECTS"])
+            merged["start"] = _earlier(merged["start"], module["start"])
+            merged["stop"] = _later(merged["stop"], module["stop"])
+            merged["plannedEnd"] = _later(
+                merged["plannedEnd"], module["plannedEnd"])
+            merged["id"] = min(merged["id"], module["id"])
+
+        entries = modules[module["name"]][1]
+        for entry in module["entries"]:
+            existing = entries.get(entry["id"])
+            if existing is None:
+                entries[entry["id"]] = entry
+            elif existing != entry:
+                self.conflicts += 1
+                if _entry_rank(entry) > _entry_rank(existing):
+                    entries[entry["id"]] = entry
+
+    def to_json(self):
+        '''gets the merged study
+
+        returns: the json data of the merged study
+        '''
+        if self.study is None:
+            raise ValueError("No study to merge")
+        semesters = []
+        # (semester name, module name) -> (merged semester, merged module)
+        found = {}
+        for semester, modules in self.semesters.values():
+            merged_semester = dict(semester, modules=[])
+            for module, entries in modules.values():
+                merged_module = dict(module, entries=sorted(
+                    entries.values(), key=lambda entry: (
+                        _parse(entry["start_time"]) or datetime.datetime.min, entry["id"])))
+                merged_semester["modules"].append(merged_module)
+                found[(semester["name"], module["name"])] = (
+                    merged_semester, merged_module)
+            semesters.append(merged_semester)
+
+        data = dict(self.study, semesters=semesters, last_semester=None,
+                    last_module=None, last_entry=None)
+        if self.last is not None and self.last[:2] in found:
+            last_entry = self.last[2]
+            semester, module = found[self.last[:2]]
+            data["last_semester"] = semester
+            data["last_module"] = module
+            data["last_entry"] = next(
+                (entry for entry in module["entries"] if entry["id"] == last_entry["id"]),
+                last_entry)
+        return data
+
+
+def merge_studies(filenames, output, jobs=1):
+    '''merges study files into one study file
+
+    filenames: the study files
+    output: the merged study file
+    jobs: the number of worker processes which load the files
+
+    returns: the merger with the merged study
+    '''
+    merger = StudyMerger()
+    for data in load_all(filenames, jobs):
+        merger.add(data)
+    with open(output, 'w') as file:
+        json.dump(merger.to_json(), file, indent=4)
+    print(f"{len(filenames)} studies were merged into {output} "
+          f"({merger.conflicts} conflicting entries).")
+    return merger
+
+
+def main(argv=None):
+    '''merges the study files given by the command line arguments
+
+    argv: the arguments, sys.argv is used if None
+    '''
+    parser = argparse.ArgumentParser(description="Merge study files")
+    parser.add_argument("filenames", nargs="+", help="the study files (json)")
+    parser.add_argument("-o", "--output", required=True,
+                        help="the merged study file")
+    parser.add_argument("-j", "--jobs", type=int, default=1,
+                        help="the number of processes which load the files")
+    args = parser.parse_args(argv)
+    merge_studies(args.filenames, args.output, args.jobs)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,108 @@
+import unittest
+import copy
+import datetime
+import json
+import os
+import tempfile
+import merge_studies
+from model import Study
+from study_generator import generate_study, write_study
+
+
+class MergeStudiesTest(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.output = os.path.join(self.tmp_dir.name, "merged.json")
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def write(self, name, data):
+        filename = os.path.join(self.tmp_dir.name, name)
+        with open(filename, 'w') as file:
+            json.dump(data, file)
+        return filename
+
+    def test_merge_same_study(self):
+        '''tests if merging copies of a study gives the study'''
+        study = generate_study(2, 2, 5, running_entries=1)
+        filename = os.path.join(self.tmp_dir.name, "study.json")
+        write_study(study, filename)
+
+        merger = merge_studies.merge_studies(
+            [filename, filename, filename], self.output, jobs=2)
+        self.assertEqual(merger.conflicts, 0)
+        with open(self.output, 'r') as file:
+            merged = Study.from_json(json.load(file))
+        self.assertEqual(merged.to_json(), study.to_json())
+
+    def test_merge_devices(self):
+        '''tests if semesters, modules and entries of several devices are merged'''
+        study = generate_study(1, 2, 2)
+        data = study.to_json()
+
+        # device 2 has a new module, a new entry and an edited entry
+        device = copy.deepcopy(data)
+        semester = device["semesters"][0]
+        new_module = copy.deepcopy(semester["modules"][1])
+        new_module["name"] = "Module new"
+        new_module["start"] = "2019-12-01T00:00:00"
+        semester["modules"].append(new_module)
+        new_entry = dict(semester["modules"][0]["entries"][0],
+                         id="new", start_time="2019-01-01T10:00:00")
+        semester["modules"][0]["entries"].append(new_entry)
+        edited = semester["modules"][0]["entries"][1]
+        edited["stop_time"] = "2030-01-01T00:00:00"
+        device["ECTS"] = data["ECTS"] + 5
+        semester["modules"][1]["start"] = "2019-06-01T00:00:00"
+
+        files = [self.write("1.json", data), self.write("2.json", device)]
+        merger = merge_studies.StudyMerger()
+        for item in merge_studies.load_all(files):
+            merger.add(item)
+        merged = merger.to_json()
+
+        self.assertEqual(merger.conflicts, 1)
+        self.assertEqual(merged["ECTS"], data["ECTS"] + 5)
+        modules = merged["semesters"][0]["modules"]
+        self.assertEqual([module["name"] for module in modules],
+                         ["Module 1.1", "Module 1.2", "Module new"])
+        self.assertEqual(modules[1]["start"], "2019-06-01T00:00:00")
+        entries = modules[0]["entries"]
+        self.assertEqual(len(entries), 3)
+        # entries are sorted by start
+        self.assertEqual(entries[0]["id"], "new")
+        self.assertIn(edited, entries)
+
+        # the result does not depend on the order of the files
+        reverse = merge_studies.StudyMerger()
+        for item in merge_studies.load_all(files[::-1], jobs=2):
+            reverse.add(item)
+        reversed_modules = reverse.to_json()["semesters"][0]["modules"]
+        self.assertEqual(
+            sorted(reversed_modules, key=lambda module: module["name"]), modules)
+
+    def test_last_entry(self):
+        '''tests if the most recent running entry is continued'''
+        first = generate_study(1, 1, 2, running_entries=1, seed=1)
+        second = generate_study(1, 1, 2, running_entries=1, seed=2)
+        second.last_entry.start_time += datetime.timedelta(days=1)
+        files = [self.write("1.json", first.to_json()),
+                 self.write("2.json", second.to_json())]
+
+        merge_studies.main([*files, "-o", self.output])
+        with open(self.output, 'r') as file:
+            merged = Study.from_json(json.load(file))
+        self.assertEqual(merged.last_entry.id, second.last_entry.id)
+        self.assertIsNone(merged.last_entry.stop_time)
+        self.assertEqual(len(merged.semesters[0].modules[0].entries), 6)
+
+    def test_no_files(self):
+        '''tests that merging nothing fails'''
+        with self.assertRaises(ValueError):
+            merge_studies.StudyMerger().to_json()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,18 +1,25 @@
 import uuid
 import datetime
+from clock import SystemClock
 
 
 class Entry:
     '''Class Entry holds the information of an entry'''
 
-    def __init__(self, category, comment=""):
+    # clock to get the current time, replaced by a FakeClock in tests
+    clock = SystemClock()
+
+    def __init__(self, category, comment="", clock=None):
         '''creates and starts an entry
 
         category: category of the entry as string
         comment: optional comment as string
+        clock: optional clock to get the current time (default system time)
         '''
+        if clock is not None:
+            self.clock = clock
         self.id = str(uuid.uuid4())
-        self.start_time = datetime.datetime.now()
+        self.start_time = self.clock.now()
         self.stop_time = None
         self.category = category
         self.comment = comment
@@ -37,7 +44,7 @@ class Entry:
 
         return: duration
         '''
-        self.stop_time = datetime.datetime.now()
+        self.stop_time = self.clock.now()
         return self.get_duration()
 
     def get_duration(self):
@@ -45,7 +52,7 @@ class Entry:
 
         return: duration as timedelta'''
         if self.stop_time is None:
-            return datetime.datetime.now() - self.start_time
+            return self.clock.now() - self.start_time
         else:
             return self.stop_time - self.start_time
 
@@ -63,16 +70,18 @@ class Entry:
         }
 
     @classmethod
-    def from_json(cls, data):
+    def from_json(cls, data, clock=None):
         '''creates an Entry object from a json object
 
         data: json object
+        clock: optional clock to get the current time
 
         returns: Entry object
         '''
         entry = cls(
             category=data["category"],
             comment=data["comment"],
+            clock=clock
         )
         entry.id = data["id"]
         entry.start_time = datetime.datetime.fromisoformat(
@@ -88,19 +97,35 @@ class Module:
     Holds a list of Entries.
     '''
 
-    def __init__(self, name, ECTS=0, duration=0):
+    # clock to get the current time, replaced by a FakeClock in tests
+    clock = SystemClock()
+
+    def __init__(self, name, ECTS=0, duration=0, clock=None):
         '''creates and starts the module.
 
         name: name of the module as string
         ECTS: amount of ECTS (credits) default = 0
         duration: planned duration of the module default = 0 weeks
+        clock: optional clock to get the current time (default system time)
         '''
+        if clock is not None:
+            self.clock = clock
+        # incremented when the entries change, used to invalidate caches
+        self.revision = 0
         self.id = str(uuid.uuid4())
         self.entries = []
         self.name = name
         self.ECTS = ECTS
         self.start_module(duration=duration)
 
+    def touch(self):
+        '''increments the revision
+
+        add_entry and remove_entry increment it, it must be called if the
+        list of entries or an entry of the module is changed directly
+        '''
+        self.revision += 1
+
     def __eq__(self, other):
         '''can be used to compare Module objects
 
@@ -121,7 +146,7 @@ class Module:
 
         duration: planned duration of the module in weeks
         '''
-        self.start = datetime.datetime.now()
+        self.start = self.clock.now()
         self.set_plannedEnd(duration)
         self.stop = None
 
@@ -140,8 +165,9 @@ class Module:
 
         return: the created entry
         '''
-        entry = Entry(category=category, comment=comment)
+        entry = Entry(category=category, comment=comment, clock=self.clock)
         self.entries.append(entry)
+        self.touch()
         return entry
 
     def remove_entry(self, entry):
@@ -150,6 +176,7 @@ class Module:
         entry: the entry to be removed
         '''
         self.entries.remove(entry)
+        self.touch()
 
     def get_durations(self):
         '''Creates a list of the duration of each entry
@@ -178,7 +205,7 @@ class Module:
 
     def finish_module(self):
         '''stops the module'''
-        self.stop = datetime.datetime.now()
+        self.stop = self.clock.now()
 
     def get_categories(self):
         '''List all categories which are used in the entry list
@@ -207,18 +234,21 @@ class Module:
         }
 
     @classmethod
-    def from_json(cls, data):
+    def from_json(cls, data, clock=None):
         '''creates a Module object from a json object
 
         data: json object
+        clock: optional clock to get the current time
 
         returns: Module object
         '''
         module = cls(
             name=data["name"],
             ECTS=data["ECTS"],
+            clock=clock
         )
-        module.entries = [Entry.from_json(entry) for entry in data["entries"]]
+        module.entries = [Entry.from_json(entry, clock)
+                          for entry in data["entries"]]
         module.id = data["id"]
         module.start = datetime.datetime.fromisoformat(
             data["start"]) if data["start"] else None
@@ -235,13 +265,19 @@ class Semester:
     Holds a list of modules
     '''
 
-    def __init__(self, name, ECTS=0, plannedEnd=None):
+    # clock to get the current time, replaced by a FakeClock in tests
+    clock = SystemClock()
+
+    def __init__(self, name, ECTS=0, plannedEnd=None, clock=None):
         '''creates the semester
 
         name: the name of the semester
         ECTS: amount of ECTS in the semester
         plannedEnd: the plannedEnd of the semester
+        clock: optional clock for the modules and entries (default system time)
         '''
+        if clock is not None:
+            self.clock = clock
         self.id = str(uuid.uuid4())
         self.modules = []
         self.ECTS = ECTS
@@ -286,7 +322,7 @@ class Semester:
         '''
         mod = self.get_module(moduleName)
         if mod == None:
-            mod = Module(moduleName)
+            mod = Module(moduleName, clock=self.clock)
             self.add_module(mod)
         entry = mod.add_entry(category=category, comment=comment)
         return mod, entry
@@ -361,10 +397,11 @@ class Semester:
         }
 
     @classmethod
-    def from_json(cls, data):
+    def from_json(cls, data, clock=None):
         '''creates a Semester object from a json object 
 
         data: json object
+        clock: optional clock to get the current time
 
         returns: Semester object
         '''
@@ -372,11 +409,12 @@ class Semester:
             name=data["name"],
             ECTS=data["ECTS"],
             plannedEnd=datetime.datetime.fromisoformat(
-                data["plannedEnd"]) if data["plannedEnd"] else None
+                data["plannedEnd"]) if data["plannedEnd"] else None,
+            clock=clock
         )
         semester.id = data["id"]
         semester.modules = [Module.from_json(
-            module) for module in data["modules"]]
+            module, clock) for module in data["modules"]]
         return semester
 
 
@@ -387,13 +425,20 @@ class Study:
     Holds a list of semesters
     '''
 
-    def __init__(self, ECTS, hoursPerECTS, plannedEnd):
+    # clock to get the current time, replaced by a FakeClock in tests
+    clock = SystemClock()
+
+    def __init__(self, ECTS, hoursPerECTS, plannedEnd, clock=None):
         '''creates a study
 
         ECTS: amount of ECTS in the study
         hoursPerECTS: value how many work hours are necessary for each ECTS
         plannedEnd: the planned end of the study
+        clock: optional clock for the semesters, modules and entries
+               (default system time)
         '''
+        if clock is not None:
+            self.clock = clock
         self.semesters = []
         self.ECTS = ECTS
         self.hoursPerECTS = hoursPerECTS
@@ -428,12 +473,47 @@ class Study:
         '''
         sem = self.get_semester(semesterName)
         if sem == None:
-            sem = Semester(semesterName)
+            sem = Semester(semesterName, clock=self.clock)
             self.add_semester(sem)
         mod, entry = sem.add_entry(moduleName=moduleName, category=category,
                                    comment=comment)
         return sem, mod, entry
 
+    def add_entries(self, entries, modules=None):
+        '''adds several finished entries
+
+        the semester and the module of a group of entries are searched or
+        created once, so large imports do not search the lists per entry
+
+        entries: iterable of (semester name, module name, category, comment,
+                 start time, stop time)
+        modules: optional dict which is filled with (semester name, module
+                 name) -> (semester, module) while the entries are added,
+                 so the added modules are known if the iterable raises
+
+        returns: list of (semester, module) which got new entries
+        '''
+        if modules is None:
+            modules = {}
+        for semesterName, moduleName, category, comment, start, stop in entries:
+            key = (semesterName, moduleName)
+            if key not in modules:
+                sem = self.get_semester(semesterName)
+                if sem is None:
+                    sem = Semester(semesterName, clock=self.clock)
+                    self.add_semester(sem)
+                mod = sem.get_module(moduleName)
+                if mod is None:
+                    mod = Module(moduleName, clock=self.clock)
+                    sem.add_module(mod)
+                modules[key] = (sem, mod)
+            entry = Entry(category=category, comment=comment, clock=self.clock)
+            entry.start_time = start
+            entry.stop_time = stop
+            modules[key][1].entries.append(entry)
+            modules[key][1].touch()
+        return list(modules.values())
+
     def remove_entry(self, semester, module, entry):
         '''removes an entry
 
@@ -466,6 +546,34 @@ class Study:
             sum += semester_duration
         return durations, sum
 
+    def set_clock(self, clock):
+        '''sets the clock of the study and of all its objects
+
+        new semesters, modules and entries of the study use the clock as well
+
+        clock: the clock to get the current time
+        '''
+        self.clock = clock
+        for semester in self.semesters:
+            semester.clock = clock
+            for module in semester.modules:
+                module.clock = clock
+                for entry in module.entries:
+                    entry.clock = clock
+        for obj in (self.last_semester, self.last_module, self.last_entry):
+            if obj is not None:
+                obj.clock = clock
+
+    def iter_entries(self):
+        '''iterates over the entries without building a list
+
+        returns: generator of (semester, module, entry)
+        '''
+        for semester in self.semesters:
+            for module in semester.modules:
+                for entry in module.entries:
+                    yield semester, module, entry
+
     def get_semester(self, name):
         '''get a semester by its name
 
@@ -541,10 +649,11 @@ class Study:
         }
 
     @classmethod
-    def from_json(cls, data):
+    def from_json(cls, data, clock=None):
         '''creates a Study object from a json object
 
         data: json object
+        clock: optional clock to get the current time
 
         returns: Study object
         '''
@@ -553,13 +662,14 @@ class Study:
             hoursPerECTS=data["hoursPerECTS"],
             plannedEnd=datetime.datetime.fromisoformat(
                 data["plannedEnd"]) if data["plannedEnd"] else None,
+            clock=clock
         )
         study.semesters = [Semester.from_json(
-            semester) for semester in data["semesters"]]
+            semester, clock) for semester in data["semesters"]]
         study.last_semester = Semester.from_json(
-            data["last_semester"]) if data["last_semester"] != None else None
+            data["last_semester"], clock) if data["last_semester"] != None else None
         study.last_module = Module.from_json(
-            data["last_module"]) if data["last_module"] != None else None
+            data["last_module"], clock) if data["last_module"] != None else None
         study.last_entry = Entry.from_json(
-            data["last_entry"]) if data["last_entry"] != None else None
+            data["last_entry"], clock) if data["last_entry"] != None else None
         return study
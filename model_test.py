@@ -1,7 +1,7 @@
 import unittest
 import model
 import datetime
-from time import sleep
+from clock import FakeClock
 
 
 class UnitTestEntry(unittest.TestCase):
@@ -17,10 +17,11 @@ class UnitTestEntry(unittest.TestCase):
         '''
         Test the __eq__ check
         '''
-        e = model.Entry("a")
-        e1 = model.Entry("b")
-        sleep(1)
-        e2 = model.Entry("a")
+        clock = FakeClock()
+        e = model.Entry("a", clock=clock)
+        e1 = model.Entry("b", clock=clock)
+        clock.advance(seconds=1)
+        e2 = model.Entry("a", clock=clock)
         x = model.Module(name="")
 
         self.assertEqual(
@@ -38,15 +39,16 @@ class UnitTestEntry(unittest.TestCase):
         hard coded timeout is used
         '''
         timeout = 10
-        e = model.Entry("")
-        sleep(timeout)
+        clock = FakeClock()
+        e = model.Entry("", clock=clock)
+        clock.advance(seconds=timeout)
         duration = e.stop()
 
         expDelta = datetime.timedelta(seconds=timeout)
 
-        self.assertAlmostEqual(first=expDelta,
-                               second=duration,
-                               msg="Duration of entry deviated too much", delta=datetime.timedelta(seconds=0.1))
+        self.assertEqual(first=expDelta, second=duration,
+                         msg="Duration of entry deviated")
+        self.assertEqual(e.stop_time, clock.now())
 
     def test_get_duration(self):
         '''
@@ -54,25 +56,24 @@ class UnitTestEntry(unittest.TestCase):
         hard coded timeout is used
         '''
         timeout = 10
-        e = model.Entry("")
-        sleep(timeout)
+        clock = FakeClock()
+        e = model.Entry("", clock=clock)
+        clock.advance(seconds=timeout)
         duration_before_stop = e.get_duration()
-        sleep(timeout)
+        clock.advance(seconds=timeout)
         duration = e.stop()
 
         # Test if duration is correct before entry was stopped
-        self.assertAlmostEqual(
+        self.assertEqual(
             first=duration_before_stop,
             second=datetime.timedelta(seconds=timeout),
-            msg="Duration before entry was stopped deviated too much",
-            delta=datetime.timedelta(seconds=0.1))
+            msg="Duration before entry was stopped deviated")
 
         # Test if duration is correct after entry was stopped
-        self.assertAlmostEqual(
+        self.assertEqual(
             first=e.get_duration(),
             second=datetime.timedelta(seconds=2*timeout),
-            msg="Duration after entry was stopped deviated too much",
-            delta=datetime.timedelta(seconds=0.1))
+            msg="Duration after entry was stopped deviated")
 
         # Test if stop() and get_duration() return same duration
         self.assertEqual(first=duration, second=e.get_duration(),
@@ -80,7 +81,7 @@ class UnitTestEntry(unittest.TestCase):
                          and get_duration() are not equal")
 
         # Test if duration is constant after stop() was called
-        sleep(5*timeout)
+        clock.advance(seconds=5*timeout)
         self.assertEqual(first=duration, second=e.get_duration(),
                          msg="duration changed after stop()")
 
@@ -142,10 +143,11 @@ class UnitTestModule(unittest.TestCase):
         '''
         Test the __eq__ check
         '''
-        m = model.Module("a")
-        m1 = model.Module("b")
-        sleep(1)
-        m2 = model.Module("a")
+        clock = FakeClock()
+        m = model.Module("a", clock=clock)
+        m1 = model.Module("b", clock=clock)
+        clock.advance(seconds=1)
+        m2 = model.Module("a", clock=clock)
         e = model.Entry("")
 
         self.assertEqual(
@@ -317,6 +319,23 @@ class UnitTestModule(unittest.TestCase):
             mod_from_json.entries), "Entries length does not match")
 
 
+    def test_revision(self):
+        '''test if changes of the entries increment the revision'''
+        mod = model.Module("test_module")
+        revision = mod.revision
+        entry = mod.add_entry("test_category")
+        self.assertGreater(mod.revision, revision)
+
+        revision = mod.revision
+        mod.remove_entry(entry)
+        self.assertGreater(mod.revision, revision)
+
+        # direct changes are reported with touch
+        revision = mod.revision
+        mod.entries.append(entry)
+        mod.touch()
+        self.assertEqual(mod.revision, revision + 1)
+
 class UnitTestSemester(unittest.TestCase):
     def test_init(self):
         '''tests constructor of class Semester'''
@@ -333,7 +352,6 @@ class UnitTestSemester(unittest.TestCase):
         '''
         s = model.Semester("a")
         s1 = model.Semester("b")
-        sleep(1)
         s2 = model.Semester("a")
         e = model.Entry("")
 
@@ -881,5 +899,59 @@ class UnitTestStudy(unittest.TestCase):
             study.last_entry.id, study_from_json.last_entry.id, "Last entry does not match")
 
 
+    def test_add_entries(self):
+        '''tests if adding several entries works'''
+        study = model.Study(
+            ECTS=180, hoursPerECTS=30, plannedEnd=datetime.datetime.now())
+        study.add_entry(semesterName="sem", moduleName="mod", category="cat")
+        start = datetime.datetime(2024, 1, 1, 10)
+        stop = start + datetime.timedelta(hours=1)
+
+        modules = study.add_entries(iter([
+            ("sem", "mod", "cat", "", start, stop),
+            ("sem", "mod1", "cat1", "com", start, stop),
+            ("sem2", "mod", "cat", "", start, stop),
+            ("sem", "mod", "cat2", "", start, stop)]))
+
+        self.assertEqual([(sem.name, mod.name) for sem, mod in modules],
+                         [("sem", "mod"), ("sem", "mod1"), ("sem2", "mod")])
+        self.assertEqual(len(study.semesters), 2)
+        self.assertEqual(len(study.semesters[0].modules), 2)
+        # the existing module is used
+        entries = study.semesters[0].modules[0].entries
+        self.assertEqual(len(entries), 3)
+        self.assertEqual([e.category for e in entries], ["cat", "cat", "cat2"])
+        self.assertEqual(entries[1].start_time, start)
+        self.assertEqual(entries[1].stop_time, stop)
+        self.assertEqual(modules[1][1].entries[0].comment, "com")
+
+        self.assertEqual(study.add_entries([]), [])
+
+    def test_clock(self):
+        '''test if the clock of the study is used for new and loaded objects'''
+        clock = FakeClock()
+        study = model.Study(180, 30, clock.now(), clock=clock)
+        sem, mod, entry = study.add_entry("sem", "mod", "cat")
+        self.assertIs(sem.clock, clock)
+        self.assertIs(mod.clock, clock)
+        self.assertEqual(mod.start, clock.now())
+        self.assertEqual(entry.start_time, clock.now())
+
+        clock.advance(hours=2)
+        self.assertEqual(entry.get_duration(), datetime.timedelta(hours=2))
+        mod.finish_module()
+        self.assertEqual(mod.stop, clock.now())
+
+        loaded = model.Study.from_json(study.to_json(), clock)
+        loaded_entry = loaded.semesters[0].modules[0].entries[0]
+        clock.advance(hours=1)
+        self.assertIs(loaded_entry.clock, clock)
+        self.assertEqual(loaded_entry.get_duration(),
+                         datetime.timedelta(hours=3))
+
+        # the system time is used by default
+        self.assertIsNot(model.Entry("cat").clock, clock)
+
+
 if __name__ == '__main__':
     unittest.main()
@@ -1,32 +1,36 @@
 import tkinter as tk
 from tkinter import ttk
+from tkinter import font as tkfont
+from contextlib import contextmanager
 
+# horizontal space of a button in addition to its text (border and padding)
+BUTTON_PADDING = 8
 
-class Accordion_Element(ttk.Frame):
+
+class Accordion_Element:
     '''Is an Element in an Accordion
 
-    Extends ttk.Frame
-    Has two Buttons and a Frame for potential sub_elements.
+    Owns a ttk.Frame with two Buttons and a Frame for potential sub_elements.
     Clicking the first button calls a specific command
     Clicking the second button shows the Frame with subelememts
     and reorders the accordion.
     Holds a list of sub_elements
+    The frame and the buttons are created when the element is shown the
+    first time and the frame for the sub_elements when it is expanded.
+    So the sub_elements of a collapsed element do not create any widgets.
     '''
 
     def __init__(self, accordion, parent, name, command, sub_elements=None, level=0, row=0):
         '''constructor of accordion element
 
         accordion: the accordion
-        parent: the parent frame
+        parent: the parent frame or the parent Accordion_Element
         name: name of the element (= text of the button)
         command: command to execute at button click event
         sub_elements: list of sub_elements
         level: the level of the element inside the accordion
         row: row inside the grid (is set at reordereing)
         '''
-        super().__init__(parent)
-        self.grid(sticky='ew')
-
         self.sub_elements = []
         if sub_elements is not None:
             self.sub_elements.extend(sub_elements)
@@ -37,28 +41,70 @@ class Accordion_Element(ttk.Frame):
         self.visible = False
         self.parent = parent
         self.accordion = accordion
+        self.command = command
+
+        # widgets are created lazily
+        self.frame = None
+        self.element_btn = None
+        self.collapse_btn = None
+        self._sub_element_frame = None
+
+    def create(self):
+        '''creates the frame of the element
+
+        the frame is placed in the sub_element_frame of the parent element,
+        which is created by this if necessary
+        does nothing if the frame already exists
+        '''
+        if self.frame is not None:
+            return
+
+        master = self.parent
+        if isinstance(master, Accordion_Element):
+            master = master.sub_element_frame
+        self.frame = ttk.Frame(master)
+        self.frame.grid(sticky='ew')
+
+    def winfo_exists(self):
+        '''checks if the frame of the element exists
+
+        returns: False if the frame was not created yet or is destroyed
+        '''
+        return self.frame is not None and bool(self.frame.winfo_exists())
+
+    @property
+    def sub_element_frame(self):
+        '''frame for the sub_elements
+
+        is created at the first access
+        '''
+        if self._sub_element_frame is None:
+            self.create()
+            self._sub_element_frame = ttk.Frame(self.frame)
+        return self._sub_element_frame
 
-        # Create buttons for the element
-        style_name = f'Custom{level}.TButton'
-        self.accordion.create_style(style_name, level)
+    def build(self):
+        '''creates the frame and the buttons of the element
 
-        self.element_btn = ttk.Button(self, text=name, style=style_name)
+        does nothing if the buttons already exist
+        '''
+        if self.element_btn is not None:
+            return
+
+        self.create()
+        style_name = self.accordion.get_style(self.level)
+
+        self.element_btn = ttk.Button(self.frame, text=self.name, style=style_name,
+                                      command=lambda: self.command())
         self.element_btn.grid(row=self.row, column=0,
-                              sticky='ew', padx=level * 10, pady=(0, 2))
+                              sticky='ew', padx=self.level * 10, pady=(0, 2))
 
         self.collapse_btn = ttk.Button(
-            self, text="+", style=style_name, width=2)
+            self.frame, text="-" if self.visible else "+", style=style_name, width=2,
+            command=lambda: self.toggle_element())
         self.collapse_btn.grid(row=self.row, column=1,
                                sticky="e", padx=0, pady=(0, 0))
 
-        # Create frame for sub-elements
-        self.sub_element_frame = ttk.Frame(self)
-        self.sub_element_frame.grid(row=self.row + 1, column=0, sticky='ew')
-        self.sub_element_frame.grid_remove()
-
-        self.element_btn.config(command=lambda: command())
-        self.collapse_btn.config(command=lambda: self.toggle_element())
-
     def __eq__(self, other):
         '''can be used to compare Accordion_Element objects
 
@@ -83,6 +129,7 @@ class Accordion_Element(ttk.Frame):
         accordion is reordered
         text of the collapse button is toggled
         '''
+        self.build()
         self.visible = not self.visible
         if (self.visible):
             self.collapse_btn.config(text="-")
@@ -101,6 +148,7 @@ class Accordion_Element(ttk.Frame):
         returns next row
         '''
         # order the button
+        self.build()
         self.row = row
         self.element_btn.grid(row=row, column=0, sticky='ew',
                               padx=self.level * 10, pady=(0, 2))
@@ -121,8 +169,8 @@ class Accordion_Element(ttk.Frame):
             sub_row = 0
             for elem in self.sub_elements:
                 sub_row = elem.reorder(sub_row)
-        else:
-            self.sub_element_frame.grid_remove()
+        elif self._sub_element_frame is not None:
+            self._sub_element_frame.grid_remove()
 
         return row
 
@@ -137,7 +185,7 @@ class Accordion_Element(ttk.Frame):
 
         returns: the generated element
         '''
-        e = Accordion_Element(self.accordion, self.sub_element_frame, name,
+        e = Accordion_Element(self.accordion, self, name,
                               command=command, sub_elements=sub_elements, level=self.level + 1)
         self.sub_elements.append(e)
         self.accordion.update_canvas_width()
@@ -160,10 +208,14 @@ class Accordion_Element(ttk.Frame):
         for e in self.sub_elements:
             e.destroy()
 
-        self.sub_element_frame.destroy()
-        self.element_btn.destroy()
-        super().destroy()
-        del self
+        if self.frame is None:
+            return
+
+        if self._sub_element_frame is not None:
+            self._sub_element_frame.destroy()
+        if self.element_btn is not None:
+            self.element_btn.destroy()
+        self.frame.destroy()
 
 
 class Accordion(ttk.Frame):
@@ -193,7 +245,7 @@ class Accordion(ttk.Frame):
             )
         )
 
-        self.canvas.create_window(
+        self.canvas_window = self.canvas.create_window(
             (0, 0), window=self.scrollable_frame, anchor="nw")
         self.canvas.configure(yscrollcommand=self.scrollbar.set)
 
@@ -206,6 +258,55 @@ class Accordion(ttk.Frame):
 
         self.sections = []
 
+        # cached styles, fonts and text widths
+        self._styles = {}
+        self._fonts = {}
+        self._text_widths = {}
+
+        # batch update state
+        self._batch_depth = 0
+        self._reorder_pending = False
+        self._width_pending = False
+
+    def begin_update(self):
+        ''' start a batch update
+
+        reorder and width calculation are deferred until end_update is called
+        calls can be nested
+        '''
+        self._batch_depth += 1
+
+    def end_update(self):
+        ''' finish a batch update
+
+        executes the deferred reorder and width calculation once
+        '''
+        if self._batch_depth == 0:
+            raise RuntimeError("end_update called without begin_update")
+
+        self._batch_depth -= 1
+        if self._batch_depth > 0:
+            return
+
+        if self._reorder_pending:
+            self._reorder_pending = False
+            self.reorder()
+        if self._width_pending:
+            self._width_pending = False
+            self.update_canvas_width()
+
+    @contextmanager
+    def batch_update(self):
+        ''' context manager for a batch update
+
+        usage: with accordion.batch_update(): ...
+        '''
+        self.begin_update()
+        try:
+            yield self
+        finally:
+            self.end_update()
+
     def bind_mouse_scroll(self, widget):
         ''' bind the scroll event to the widget'''
         widget.bind_all("<MouseWheel>", self._on_mouse_wheel)  # Windows
@@ -242,7 +343,8 @@ class Accordion(ttk.Frame):
         '''
         s = Accordion_Element(self, self.scrollable_frame,
                               name, command=command, sub_elements=sub_elements)
-        s.grid(row=len(self.sections), column=0, sticky='ew')
+        s.create()
+        s.frame.grid(row=len(self.sections), column=0, sticky='ew')
         self.sections.append(s)
         self.reorder()
         self.update_canvas_width()
@@ -265,7 +367,12 @@ class Accordion(ttk.Frame):
         ''' reorder the accordion
 
         reorder each section
+        is deferred while a batch update is running
         '''
+        if self._batch_depth > 0:
+            self._reorder_pending = True
+            return
+
         row = 0
         for s in self.sections:
             row = s.reorder(row)
@@ -283,31 +390,87 @@ class Accordion(ttk.Frame):
         style.map(style_name, background=[
                   ('active', '#d0d0d0')], foreground=[('active', '#000000')])
 
+    def get_style(self, level):
+        ''' get the style name for the level of an accordion element
+
+        the style is created at the first call for a level
+
+        level: the level of the element
+
+        returns: the style name
+        '''
+        style_name = self._styles.get(level)
+        if style_name is None:
+            style_name = f'Custom{level}.TButton'
+            self.create_style(style_name, level)
+            self._styles[level] = style_name
+        return style_name
+
+    def get_text_width(self, text, level):
+        ''' get the width of a text using the font of the level
+
+        the widths are cached, so no widget has to be realized
+
+        text: the text to measure
+        level: the level of the element
+
+        returns: the width in pixels
+        '''
+        key = (text, level)
+        width = self._text_widths.get(key)
+        if width is None:
+            font = self._fonts.get(level)
+            if font is None:
+                font = tkfont.Font(
+                    root=self, family="Helvetica", size=10 - level)
+                self._fonts[level] = font
+            width = font.measure(text)
+            self._text_widths[key] = width
+        return width
+
+    def get_element_width(self, element):
+        ''' get the width of an element including its collapse button
+
+        element: the Accordion_Element
+
+        returns: the width in pixels
+        '''
+        # the collapse button has a width of two characters
+        collapse_width = self.get_text_width("00", element.level) + \
+            BUTTON_PADDING
+        return self.get_text_width(element.name, element.level) + \
+            BUTTON_PADDING + collapse_width + \
+            element.level * 10 + 20  # Including padding
+
+    def _get_max_width(self, elements):
+        ''' get the maximum width of the elements and their sub_elements
+
+        elements: list of Accordion_Elements
+
+        returns: the maximum width
+        '''
+        max_width = 0
+        for elem in elements:
+            max_width = max(max_width, self.get_element_width(elem),
+                            self._get_max_width(elem.sub_elements))
+        return max_width
+
     def update_canvas_width(self):
-        ''' update the canvas width based on the width of the widest element.'''
-        self.canvas.update_idletasks()
+        ''' update the canvas width based on the width of the widest element.
+
+        uses the cached text metrics of all elements (also collapsed ones)
+        is deferred while a batch update is running
+        '''
+        if self._batch_depth > 0:
+            self._width_pending = True
+            return
+
         # find the maximum width
-        max_width = 0
-        for section in self.sections:
-            width = section.element_btn.winfo_reqwidth() + \
-                section.collapse_btn.winfo_reqwidth() + \
-                section.level * 10 + 20  # Including padding
-            max_width = max(max_width, width)
-            for elem in section.sub_elements:
-                width = elem.element_btn.winfo_reqwidth() + \
-                    elem.collapse_btn.winfo_reqwidth() + \
-                    elem.level * 10 + 20  # Including padding
-                max_width = max(max_width, width)
-                for sub_elem in elem.sub_elements:
-                    width = sub_elem.element_btn.winfo_reqwidth() + \
-                        sub_elem.collapse_btn.winfo_reqwidth() + \
-                        sub_elem.level * 10 + 20  # Including padding
-                    max_width = max(max_width, width)
+        max_width = self._get_max_width(self.sections)
 
         # configure canvas
         self.canvas.config(width=max_width)
-        self.canvas.itemconfig(self.canvas.create_window(
-            (0, 0), window=self.scrollable_frame, anchor='nw'), width=max_width)
+        self.canvas.itemconfig(self.canvas_window, width=max_width)
 
     def destroy(self):
         ''' destroy all sections and the accordion '''
@@ -328,16 +491,17 @@ if __name__ == "__main__":
     accordion.grid(row=0, column=0, sticky='ns')
 
     # Example elements with multiple levels
-    s = accordion.add_section("Section 1", lambda: print("Section 1 clicked"))
-    e = s.add_element("Item 1.1", lambda: print("Item 1.1 clicked"))
-    e = s.add_element("Item 1.2", lambda: print("Item 1.2 clicked"))
-    e1 = e.add_element("Item 1.2.1", lambda: print("Item 1.2.1 clicked"))
-
-    s = accordion.add_section("Section 2", lambda: print("Section 2 clicked"))
-    e = s.add_element("Item 2.1", lambda: print("Item 2.1 clicked"))
-    e = s.add_element("Item 2.2", lambda: print("Item 2.2 clicked"))
-    e1 = e.add_element("Item 2.2.1", lambda: print("Item 2.2.1 clicked"))
-
-    accordion.reorder()
+    with accordion.batch_update():
+        s = accordion.add_section(
+            "Section 1", lambda: print("Section 1 clicked"))
+        e = s.add_element("Item 1.1", lambda: print("Item 1.1 clicked"))
+        e = s.add_element("Item 1.2", lambda: print("Item 1.2 clicked"))
+        e1 = e.add_element("Item 1.2.1", lambda: print("Item 1.2.1 clicked"))
+
+        s = accordion.add_section(
+            "Section 2", lambda: print("Section 2 clicked"))
+        e = s.add_element("Item 2.1", lambda: print("Item 2.1 clicked"))
+        e = s.add_element("Item 2.2", lambda: print("Item 2.2 clicked"))
+        e1 = e.add_element("Item 2.2.1", lambda: print("Item 2.2.1 clicked"))
 
     root.mainloop()
@@ -1,6 +1,7 @@
 import unittest
 import tkinter as tk
 from tkinter import ttk
+from unittest.mock import patch
 from my_accordion import Accordion, Accordion_Element
 
 
@@ -168,6 +169,7 @@ class TestAccordion(unittest.TestCase):
         section.toggle_element()
         element.toggle_element()
         self.accordion.update_canvas_width()
+        self.root.update_idletasks()
         self.assertGreater(self.accordion.scrollable_frame.winfo_width(
         ), section.collapse_btn.winfo_reqwidth())
         self.assertGreater(
@@ -208,6 +210,84 @@ class TestAccordion(unittest.TestCase):
         self.assertEqual(section2.row, 2)
         self.assertEqual(element3.row, 0)
 
+    def test_batch_update(self):
+        with patch.object(self.accordion.canvas, 'itemconfig',
+                          wraps=self.accordion.canvas.itemconfig) as mock_update:
+            with self.accordion.batch_update():
+                section1 = self.accordion.add_section(
+                    "Section 1", lambda: print("Section 1 clicked"))
+                section2 = self.accordion.add_section(
+                    "Section 2", lambda: print("Section 2 clicked"))
+                for i in range(5):
+                    section1.add_element(
+                        f"Item 1.{i}", lambda: print("Item clicked"))
+
+                # layout is deferred
+                mock_update.assert_not_called()
+                self.assertEqual(section2.row, 0)
+
+            # width is calculated once
+            self.assertEqual(mock_update.call_count, 1)
+
+        self.assertEqual(section1.row, 0)
+        self.assertEqual(section2.row, 1)
+
+        # the canvas window is reused
+        self.assertEqual(len(self.accordion.canvas.find_all()), 1)
+
+        with self.assertRaises(RuntimeError):
+            self.accordion.end_update()
+
+    def test_lazy_elements(self):
+        section = self.accordion.add_section(
+            "Section 1", lambda: print("Section 1 clicked"))
+        element = section.add_element(
+            "Item 1.1", lambda: print("Item 1.1 clicked"))
+        sub_element = element.add_element(
+            "Item 1.1.1", lambda: print("Item 1.1.1 clicked"))
+
+        # widgets of a collapsed section are not created
+        self.assertIsNotNone(section.element_btn)
+        self.assertIsNone(section._sub_element_frame)
+        self.assertIsNone(element.frame)
+        self.assertFalse(element.winfo_exists())
+        self.assertIsNone(element.element_btn)
+        self.assertIsNone(element.collapse_btn)
+        self.assertIsNone(element._sub_element_frame)
+        self.assertFalse(sub_element.winfo_exists())
+
+        # expanding creates the frame and the buttons of the next level only
+        section.toggle_element()
+        self.assertTrue(element.winfo_exists())
+        self.assertIsNotNone(element.element_btn)
+        self.assertEqual(element.element_btn.cget('text'), "Item 1.1")
+        self.assertIsNone(element._sub_element_frame)
+        self.assertFalse(sub_element.winfo_exists())
+
+        element.toggle_element()
+        self.assertTrue(sub_element.winfo_exists())
+        self.assertEqual(sub_element.frame.winfo_parent(),
+                         str(element._sub_element_frame))
+
+        # removing an element destroys its sub_elements
+        section.remove_element(element)
+        self.assertFalse(sub_element.winfo_exists())
+
+    def test_get_text_width(self):
+        width = self.accordion.get_text_width("Item 1.1", 1)
+        self.assertGreater(width, 0)
+        self.assertEqual(self.accordion._text_widths[("Item 1.1", 1)], width)
+        self.assertGreater(self.accordion.get_text_width(
+            "Item 1.1 long text", 1), width)
+
+        # width of collapsed elements is used for the canvas
+        section = self.accordion.add_section(
+            "S", lambda: print("Section clicked"))
+        element = section.add_element(
+            "Item 1.1 long text", lambda: print("Item 1.1 clicked"))
+        self.assertEqual(int(self.accordion.canvas.cget('width')),
+                         self.accordion.get_element_width(element))
+
     def test_create_style(self):
         style_name = "Custom1.TButton"
         level = 1
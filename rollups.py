@@ -0,0 +1,109 @@
+import datetime
+import numpy as np
+
+PERIODS = ("day", "week", "month")
+
+
+def get_bucket_index(times, period):
+    '''gets the index of the bucket of each time
+
+    days and months are counted since 1970-01-01, weeks start on monday
+
+    times: array of datetime64
+    period: day, week or month
+
+    returns: int64 array of the bucket indexes
+    '''
+    if period == "day":
+        return times.astype('datetime64[D]').astype(np.int64)
+    if period == "week":
+        # 1970-01-01 is a thursday, shift the days to start the weeks on monday
+        return (times.astype('datetime64[D]').astype(np.int64) + 3) // 7
+    if period == "month":
+        return times.astype('datetime64[M]').astype(np.int64)
+    raise ValueError(f"Period {period} is not supported.")
+
+
+def get_bucket_start(indexes, period):
+    '''gets the start of buckets
+
+    indexes: int64 array of bucket indexes
+    period: day, week or month
+
+    returns: array of datetime64[s]
+    '''
+    if period == "day":
+        starts = indexes.astype('datetime64[D]')
+    elif period == "week":
+        starts = (indexes * 7 - 3).astype('datetime64[D]')
+    elif period == "month":
+        starts = indexes.astype('datetime64[M]')
+    else:
+        raise ValueError(f"Period {period} is not supported.")
+    return starts.astype('datetime64[s]')
+
+
+def rollup(starts, stops, period="day"):
+    '''sums durations in time buckets
+
+    entries which cross the boundary of a bucket are split, so each bucket
+    gets only the time within it
+
+    starts: the start times (datetime or datetime64)
+    stops: the stop times (datetime or datetime64), as long as starts
+    period: day, week or month
+
+    returns: dict of bucket index -> seconds
+    '''
+    starts = np.asarray(starts, dtype='datetime64[s]')
+    stops = np.asarray(stops, dtype='datetime64[s]')
+    valid = stops > starts
+    starts, stops = starts[valid], stops[valid]
+    if len(starts) == 0:
+        return {}
+
+    first = get_bucket_index(starts, period)
+    last = get_bucket_index(stops, period)
+    counts = last - first + 1
+
+    # one piece per entry and bucket it touches
+    entry = np.repeat(np.arange(len(starts)), counts)
+    offset = np.arange(len(entry)) - np.repeat(np.cumsum(counts) - counts, counts)
+    bucket = first[entry] + offset
+    piece_start = np.maximum(starts[entry], get_bucket_start(bucket, period))
+    piece_stop = np.minimum(stops[entry], get_bucket_start(bucket + 1, period))
+    seconds = (piece_stop - piece_start).astype(np.int64)
+
+    buckets, inverse = np.unique(bucket, return_inverse=True)
+    sums = np.bincount(inverse, weights=seconds)
+    return {int(index): float(total) for index, total in zip(buckets, sums)
+            if total > 0}
+
+
+def merge_rollups(rollups):
+    '''adds rollups of several modules
+
+    rollups: iterable of dicts of bucket index -> seconds
+
+    returns: dict of bucket index -> seconds
+    '''
+    merged = {}
+    for item in rollups:
+        for index, seconds in item.items():
+            merged[index] = merged.get(index, 0) + seconds
+    return merged
+
+
+def to_series(buckets, period):
+    '''converts a rollup to lists for charts and reports
+
+    buckets: dict of bucket index -> seconds
+    period: day, week or month
+
+    returns: the starts of the buckets (datetime) and the durations (timedelta)
+             sorted by the start
+    '''
+    indexes = sorted(buckets)
+    starts = get_bucket_start(np.array(indexes, dtype=np.int64), period)
+    return ([start.astype(datetime.datetime) for start in starts],
+            [datetime.timedelta(seconds=buckets[index]) for index in indexes])
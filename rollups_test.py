@@ -0,0 +1,65 @@
+import unittest
+import datetime
+import numpy as np
+import rollups
+
+
+class RollupsTest(unittest.TestCase):
+
+    def setUp(self):
+        # wednesday 31.01. to thursday 01.02. and sunday 04.02. to monday 05.02.
+        self.starts = [datetime.datetime(2024, 1, 31, 23, 0),
+                       datetime.datetime(2024, 2, 4, 23, 30)]
+        self.stops = [datetime.datetime(2024, 2, 1, 1, 0),
+                      datetime.datetime(2024, 2, 5, 0, 30)]
+
+    def test_bucket_index(self):
+        times = np.array(["2024-01-28T12:00", "2024-01-29T00:00", "2024-02-04T23:59"],
+                         dtype='datetime64[s]')
+        weeks = rollups.get_bucket_index(times, "week")
+        self.assertEqual(weeks[1], weeks[2])
+        self.assertEqual(weeks[0] + 1, weeks[1])
+        # weeks start on monday
+        self.assertEqual(rollups.get_bucket_start(weeks, "week")[1],
+                         np.datetime64("2024-01-29T00:00:00"))
+
+        with self.assertRaises(ValueError):
+            rollups.get_bucket_index(times, "year")
+
+    def test_rollup_day(self):
+        starts, durations = rollups.to_series(
+            rollups.rollup(self.starts, self.stops, "day"), "day")
+        self.assertEqual(starts, [datetime.datetime(2024, 1, 31), datetime.datetime(2024, 2, 1),
+                                  datetime.datetime(2024, 2, 4), datetime.datetime(2024, 2, 5)])
+        self.assertEqual(durations, [datetime.timedelta(hours=1), datetime.timedelta(hours=1),
+                                     datetime.timedelta(minutes=30), datetime.timedelta(minutes=30)])
+
+    def test_rollup_week(self):
+        starts, durations = rollups.to_series(
+            rollups.rollup(self.starts, self.stops, "week"), "week")
+        self.assertEqual(starts, [datetime.datetime(2024, 1, 29), datetime.datetime(2024, 2, 5)])
+        self.assertEqual(durations, [datetime.timedelta(hours=2, minutes=30),
+                                     datetime.timedelta(minutes=30)])
+
+    def test_rollup_month(self):
+        starts, durations = rollups.to_series(
+            rollups.rollup(self.starts, self.stops, "month"), "month")
+        self.assertEqual(starts, [datetime.datetime(2024, 1, 1), datetime.datetime(2024, 2, 1)])
+        self.assertEqual(durations, [datetime.timedelta(hours=1), datetime.timedelta(hours=2)])
+
+    def test_rollup_long_entry(self):
+        '''tests an entry over several days and empty input'''
+        buckets = rollups.rollup([datetime.datetime(2024, 1, 1, 12)],
+                                 [datetime.datetime(2024, 1, 4)], "day")
+        self.assertEqual(list(buckets.values()), [43200, 86400, 86400])
+        self.assertEqual(rollups.rollup([], [], "day"), {})
+        # entries which stop before they start are ignored
+        self.assertEqual(rollups.rollup(self.stops, self.starts, "day"), {})
+
+    def test_merge_rollups(self):
+        self.assertEqual(rollups.merge_rollups([{1: 10.0, 2: 5.0}, {2: 5.0}, {}]),
+                         {1: 10.0, 2: 10.0})
+
+
+if __name__ == '__main__':
+    unittest.main()
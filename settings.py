@@ -6,18 +6,22 @@ class Settings:
     def __init__(self, filename='settings.json'):
         ''' init a settings object
 
-        filename: the filename to save the settings
+        filename: the filename to save the settings,
+                  None to keep the settings only in memory
         '''
         self.filename = filename
         self.settings = {
             "last_filename": None,
             "module_ECTS": 5,
-            "module_duration": 6
+            "module_duration": 6,
+            "prerender_charts": False
         }
         self.load_settings()
 
     def load_settings(self):
         ''' load the settings from the file '''
+        if self.filename is None:
+            return
         if os.path.exists(self.filename):
             with open(self.filename, 'r') as file:
                 self.settings = json.load(file)
@@ -26,6 +30,8 @@ class Settings:
 
     def save_settings(self):
         ''' save the settings to the file '''
+        if self.filename is None:
+            return
         with open(self.filename, 'w') as file:
             json.dump(self.settings, file, indent=4)
 
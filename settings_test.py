@@ -37,6 +37,13 @@ class TestSettings(unittest.TestCase):
         self.assertTrue(os.path.exists(self.test_filename))
         self.assertEqual(self.settings.get("last_filename"), None)
 
+    def test_in_memory(self):
+        # settings without a filename are not written
+        settings = Settings(filename=None)
+        settings.set("module_ECTS", 10)
+        self.assertEqual(settings.get("module_ECTS"), 10)
+        self.assertEqual(settings.get("module_duration"), 6)
+        self.assertFalse(os.path.exists("None"))
 
 if __name__ == '__main__':
     unittest.main()
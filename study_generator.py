@@ -0,0 +1,196 @@
+import argparse
+import datetime
+import json
+import random
+import uuid
+from model import Study, Semester, Module, Entry
+
+CATEGORIES = ("Reading", "Programming", "Exercises", "Exam preparation", "Meeting")
+DISTRIBUTIONS = ("exponential", "uniform", "fixed")
+
+
+class StudyGenerator:
+    '''Generates synthetic studies
+
+    the studies are deterministic: the same parameters and seed generate the
+    same study including the ids
+    '''
+
+    def __init__(self, seed=0, start=datetime.datetime(2020, 1, 1),
+                 semester_weeks=26, module_weeks=6, categories=CATEGORIES,
+                 mean_duration=datetime.timedelta(minutes=90), distribution="exponential",
+                 clock=None):
+        '''creates a generator
+
+        seed: the seed of the random numbers
+        start: the start of the study
+        semester_weeks: the duration of a semester in weeks
+        module_weeks: the planned duration of a module in weeks
+        categories: the categories of the entries
+        mean_duration: the mean duration of the entries
+        distribution: the distribution of the durations (exponential, uniform, fixed)
+        clock: optional clock of the generated study
+        '''
+        if distribution not in DISTRIBUTIONS:
+            raise ValueError(f"Distribution {distribution} is not supported.")
+        self.rng = random.Random(seed)
+        self.start = start
+        self.semester_weeks = semester_weeks
+        self.module_weeks = module_weeks
+        self.categories = categories
+        self.mean_duration = mean_duration
+        self.distribution = distribution
+        self.clock = clock
+
+    def generate(self, semesters=6, modules_per_semester=6, entries_per_module=100,
+                 running_entries=0):
+        '''generates a study
+
+        the modules of a semester start at the begin of the semester, all
+        modules except the ones of the last semester are finished.
+        The entries are spread over the planned duration of their module.
+
+        semesters: the number of semesters
+        modules_per_semester: the number of modules per semester
+        entries_per_module: the number of finished entries per module
+        running_entries: the number of modules with an additional running
+                         entry, starting with the last module
+
+        returns: the study
+        '''
+        semester_duration = datetime.timedelta(weeks=self.semester_weeks)
+        study = Study(ECTS=semesters * modules_per_semester * 5, hoursPerECTS=30,
+                      plannedEnd=self.start + semesters * semester_duration, clock=self.clock)
+        modules = []
+        for i in range(semesters):
+            sem_start = self.start + i * semester_duration
+            semester = Semester(f"Semester {i + 1}", modules_per_semester * 5,
+                                sem_start + semester_duration, self.clock)
+            semester.id = self._get_id()
+            for j in range(modules_per_semester):
+                module = self._generate_module(f"Module {i + 1}.{j + 1}", sem_start,
+                                               entries_per_module, i < semesters - 1)
+                semester.modules.append(module)
+                modules.append((semester, module))
+            study.semesters.append(semester)
+
+        for semester, module in modules[len(modules) - running_entries:]:
+            entry = self._generate_entry(module.plannedEnd)
+            entry.stop_time = None
+            module.entries.append(entry)
+            study.set_last_information(semester, module, entry)
+        return study
+
+    def _generate_module(self, name, start, entries, finished):
+        '''generates a module with its entries
+
+        name: the name of the module
+        start: the start of the module
+        entries: the number of entries
+        finished: True if the module is finished
+
+        returns: the module
+        '''
+        module = Module(name, ECTS=5, clock=self.clock)
+        module.id = self._get_id()
+        module.start = start
+        module.set_plannedEnd(self.module_weeks)
+        window = (module.plannedEnd - start).total_seconds()
+        module.entries = sorted(
+            (self._generate_entry(start + datetime.timedelta(seconds=self.rng.uniform(0, window)))
+             for _ in range(entries)), key=lambda entry: entry.start_time)
+        module.stop = None
+        if finished:
+            module.stop = max([module.plannedEnd] +
+                              [entry.stop_time for entry in module.entries])
+        return module
+
+    def _generate_entry(self, start_time):
+        '''generates a finished entry
+
+        start_time: the start of the entry (seconds are dropped)
+
+        returns: the entry
+        '''
+        entry = Entry(self.rng.choice(self.categories), clock=self.clock)
+        entry.id = self._get_id()
+        entry.start_time = start_time.replace(second=0, microsecond=0)
+        entry.stop_time = entry.start_time + self._get_duration()
+        return entry
+
+    def _get_duration(self):
+        '''gets a random duration of an entry, at least one minute
+
+        returns: the duration as timedelta
+        '''
+        mean = self.mean_duration.total_seconds()
+        if self.distribution == "exponential":
+            seconds = self.rng.expovariate(1 / mean)
+        elif self.distribution == "uniform":
+            seconds = self.rng.uniform(0, 2 * mean)
+        else:
+            seconds = mean
+        return datetime.timedelta(minutes=max(round(seconds / 60), 1))
+
+    def _get_id(self):
+        '''gets a deterministic uuid
+
+        returns: the uuid as string
+        '''
+        return str(uuid.UUID(int=self.rng.getrandbits(128), version=4))
+
+
+def generate_study(semesters=6, modules_per_semester=6, entries_per_module=100,
+                   running_entries=0, seed=0, **kwargs):
+    '''generates a synthetic study
+
+    semesters: the number of semesters
+    modules_per_semester: the number of modules per semester
+    entries_per_module: the number of finished entries per module
+    running_entries: the number of modules with an additional running entry
+    seed: the seed of the random numbers
+    **kwargs: further arguments of the StudyGenerator
+
+    returns: the study
+    '''
+    return StudyGenerator(seed, **kwargs).generate(
+        semesters, modules_per_semester, entries_per_module, running_entries)
+
+
+def write_study(study, filename):
+    '''writes a study to a study file
+
+    study: the study
+    filename: the name of the file
+    '''
+    with open(filename, 'w') as file:
+        json.dump(study.to_json(), file, indent=4)
+
+
+def main(argv=None):
+    '''generates a study file as defined by the command line arguments
+
+    argv: the arguments, sys.argv is used if None
+    '''
+    parser = argparse.ArgumentParser(description="Generate a synthetic study file")
+    parser.add_argument("filename", help="the study file (json)")
+    parser.add_argument("--semesters", type=int, default=6)
+    parser.add_argument("--modules", type=int, default=6,
+                        help="the number of modules per semester")
+    parser.add_argument("--entries", type=int, default=100,
+                        help="the number of entries per module")
+    parser.add_argument("--running", type=int, default=0,
+                        help="the number of running entries")
+    parser.add_argument("--distribution", choices=DISTRIBUTIONS, default="exponential",
+                        help="the distribution of the durations")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    study = generate_study(args.semesters, args.modules, args.entries, args.running,
+                           args.seed, distribution=args.distribution)
+    write_study(study, args.filename)
+    print(f"Study was successfully written to {args.filename}.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+import unittest
+import datetime
+import json
+import os
+import tempfile
+import model
+from study_generator import StudyGenerator, generate_study, write_study
+
+
+class StudyGeneratorTest(unittest.TestCase):
+
+    def test_generate(self):
+        study = generate_study(semesters=3, modules_per_semester=4,
+                               entries_per_module=20)
+
+        self.assertEqual(len(study.semesters), 3)
+        modules = [mod for sem in study.semesters for mod in sem.modules]
+        self.assertEqual(len(modules), 12)
+        for mod in modules:
+            self.assertEqual(len(mod.entries), 20)
+            for entry in mod.entries:
+                self.assertGreaterEqual(entry.start_time, mod.start)
+                self.assertLessEqual(entry.start_time, mod.plannedEnd)
+                self.assertGreaterEqual(
+                    entry.get_duration(), datetime.timedelta(minutes=1))
+            # entries are sorted by the start
+            self.assertEqual(mod.entries, sorted(
+                mod.entries, key=lambda entry: entry.start_time))
+
+        # only the modules of the last semester are not finished
+        self.assertTrue(all(mod.stop for mod in study.semesters[0].modules))
+        self.assertTrue(all(mod.stop is None for mod in study.semesters[-1].modules))
+        self.assertEqual(study.get_last_information(), (None, None, None))
+
+    def test_deterministic(self):
+        self.assertEqual(generate_study(2, 2, 10, seed=1).to_json(),
+                         generate_study(2, 2, 10, seed=1).to_json())
+        self.assertNotEqual(generate_study(2, 2, 10, seed=1).to_json(),
+                            generate_study(2, 2, 10, seed=2).to_json())
+
+    def test_running_entries(self):
+        study = generate_study(2, 2, 5, running_entries=2)
+        running = [entry for sem in study.semesters for mod in sem.modules
+                   for entry in mod.entries if entry.stop_time is None]
+        self.assertEqual(len(running), 2)
+
+        sem, mod, entry = study.get_last_information()
+        self.assertIs(sem, study.semesters[-1])
+        self.assertIs(mod, sem.modules[-1])
+        self.assertIsNone(entry.stop_time)
+
+    def test_distribution(self):
+        generator = StudyGenerator(
+            distribution="fixed", mean_duration=datetime.timedelta(minutes=45))
+        study = generator.generate(1, 1, 10)
+        self.assertEqual(study.get_durations()[1],
+                         datetime.timedelta(minutes=450))
+
+        with self.assertRaises(ValueError):
+            StudyGenerator(distribution="normal")
+
+    def test_write_study(self):
+        study = generate_study(2, 2, 10, running_entries=1)
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            filename = os.path.join(tmp_dir, "study.json")
+            write_study(study, filename)
+            with open(filename, 'r') as file:
+                data = json.load(file)
+        self.assertEqual(model.Study.from_json(data).to_json(), study.to_json())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,10 +1,17 @@
 from my_accordion import Accordion
-from controller import TimeTracker
+from controller import TimeTracker, instrumentation
 import tkinter as tk
 from tkinter import messagebox, ttk, Frame, Menu
-from charts import ChartType
+from chart_type import ChartType
 import datetime
+import os
 from date_time_frame import DateTimeFrame
+from diagnostics import SessionProfiler, StallDetector, get_active_profiler, start_memory_tracing, get_memory_report
+
+# interval of the chart refresh while tracking in milliseconds
+CHART_REFRESH_INTERVAL = 1000
+# delay of the prerendering after the last change of the study in milliseconds
+PRERENDER_DELAY = 500
 
 
 class TimeTrackerGUI:
@@ -22,6 +29,7 @@ class TimeTrackerGUI:
         self.root.title("TimeTracker")
         self.root.geometry('880x600')
         self.tracker = tracker
+        self._row_cache = {}
 
         self.setup_menu()
         self.setup_views()
@@ -31,6 +39,12 @@ class TimeTrackerGUI:
 
         self.chart = None
 
+        # TIMETRACKER_STALL_THRESHOLD=<ms> logs stalls of the main loop
+        self.stall_detector = None
+        threshold = os.environ.get("TIMETRACKER_STALL_THRESHOLD")
+        if threshold:
+            self.start_stall_detector(int(threshold) / 1000)
+
     def setup_menu(self):
         '''setup the menu
 
@@ -45,6 +59,10 @@ class TimeTrackerGUI:
             label="New", command=lambda: self.new_study(edit=False))
         filemenu.add_command(label="Open", command=lambda: self.open_study())
         filemenu.add_command(label="Save as", command=lambda: self.save_as())
+        filemenu.add_command(label="Import CSV", command=lambda: self.import_csv())
+        filemenu.add_command(label="Export CSV", command=lambda: self.export_csv())
+        filemenu.add_command(label="Export columns (npz)",
+                             command=lambda: self.export_npz())
         filemenu.add_separator()
         filemenu.add_command(label="Edit Settings",
                              command=lambda: self.edit_settings())
@@ -55,6 +73,19 @@ class TimeTrackerGUI:
         editmenu.add_command(label="Edit Semesters",
                              command=lambda: self.edit_semesters())
 
+        debugmenu = Menu(menu)
+        menu.add_cascade(label="Debug", menu=debugmenu)
+        debugmenu.add_command(label="Instrumentation",
+                              command=lambda: self.show_instrumentation())
+        debugmenu.add_command(label="Start profiling",
+                              command=lambda: self.toggle_profiling())
+        debugmenu.add_command(label="Stall statistics",
+                              command=lambda: self.show_stall_statistics())
+        debugmenu.add_command(label="Memory report",
+                              command=lambda: self.show_memory_report())
+        self.debugmenu = debugmenu
+        self.profiler = None
+
         helpmenu = Menu(menu)
         menu.add_cascade(label="Help", menu=helpmenu)
         helpmenu.add_command(
@@ -202,12 +233,28 @@ class TimeTrackerGUI:
 
         self.plot_frame = tk.Frame(self.chart_frame)
         self.plot_frame.grid(row=1, sticky='news')
+        # created at the first chart, reused for all following charts
+        self.chart_canvas = None
+        self._chart_refresh_job = None
+        # renders the charts in the background if enabled in the settings
+        self.chart_prerenderer = None
+        self._prerender_job = None
 
     def setup_observers(self):
         '''register observers'''
 
         self.tracker.on_status_change = self.update_tracking_label
-        self.tracker.on_treeview_update = self.update_treeview
+        self.tracker.on_treeview_update = self.on_study_change
+        self.tracker.on_entry_removed = self.invalidate_row
+
+    def on_study_change(self):
+        '''callback of the tracker if the study changed
+
+        updates the treeview and the shown chart
+        '''
+        self.update_treeview()
+        self.prerender_charts()
+        self.refresh_chart()
 
     def initial_load(self):
         '''load the initial data
@@ -283,11 +330,13 @@ class TimeTrackerGUI:
 
         window: the window which is displayed
         '''
-        self.chart_scope = self.tracker.create_new_study(
+        self.tracker.create_new_study(
             int(self.ECTS_var.get()),
             int(self.hoursPerECTS_var.get()),
             self.plannedEnd.get_datetime()
         )
+        self._row_cache.clear()
+        self.reset_chart()
         window.destroy()
 
         self.save_as()
@@ -322,6 +371,144 @@ class TimeTrackerGUI:
             filetypes=data, defaultextension=data)
         self.save_data(filename)
 
+    def import_csv(self):
+        '''import entries of a csv file into the current study'''
+        data = [('csv', '*.csv')]
+        filename = tk.filedialog.askopenfilename(
+            filetypes=data, defaultextension=data)
+        if not filename:
+            return
+        try:
+            self.tracker.import_from_csv(filename)
+        except ValueError as e:
+            messagebox.showerror("Error", f"Could not import {filename}: {e}")
+
+    def export_csv(self):
+        '''export the entries of the current study to a csv file'''
+        data = [('csv', '*.csv')]
+        filename = tk.filedialog.asksaveasfilename(
+            filetypes=data, defaultextension=data)
+        if filename:
+            self.tracker.export_to_csv(filename)
+
+    def export_npz(self):
+        '''export the entries of the current study as columns for analysis'''
+        data = [('numpy', '*.npz')]
+        filename = tk.filedialog.asksaveasfilename(
+            filetypes=data, defaultextension=data)
+        if filename:
+            self.tracker.export_to_npz(filename)
+
+    def show_instrumentation(self):
+        '''shows the recorded call counts and latencies of the hot paths'''
+
+        new_window = tk.Toplevel(self.root)
+        new_window.title("Instrumentation")
+        new_window.transient(self.root)
+
+        self.instrumentation_text = tk.Text(new_window, width=110, height=15)
+        self.instrumentation_text.grid(row=0, column=0, columnspan=4)
+
+        self.instrumentation_var = tk.BooleanVar(
+            value=instrumentation.enabled)
+        tk.Checkbutton(new_window, text="Enabled", variable=self.instrumentation_var,
+                       command=lambda: instrumentation.enable(self.instrumentation_var.get())).grid(
+            row=1, column=0, sticky='w')
+        tk.Button(new_window, text="Refresh", command=self.update_instrumentation).grid(
+            row=1, column=1)
+        tk.Button(new_window, text="Reset", command=lambda: (
+            instrumentation.reset(), self.update_instrumentation())).grid(row=1, column=2)
+        tk.Button(new_window, text="Save", command=self.save_instrumentation).grid(
+            row=1, column=3)
+
+        self.update_instrumentation()
+
+    def update_instrumentation(self):
+        '''updates the text of the instrumentation window'''
+        self.instrumentation_text.config(state=tk.NORMAL)
+        self.instrumentation_text.delete("1.0", tk.END)
+        self.instrumentation_text.insert(tk.END, instrumentation.get_report())
+        self.instrumentation_text.config(state=tk.DISABLED)
+
+    def save_instrumentation(self):
+        '''save the recorded instrumentation to the filesystem'''
+        data = [('json', '*.json')]
+        filename = tk.filedialog.asksaveasfilename(
+            filetypes=data, defaultextension=data)
+        if filename:
+            instrumentation.dump(filename)
+
+    def toggle_profiling(self, mode="cprofile"):
+        '''starts or stops the profiling of the session
+
+        the report is saved to the filesystem when the profiling is stopped
+
+        mode: the profiler mode (cprofile, sampling)
+        '''
+        if self.profiler is None or not self.profiler.running:
+            if get_active_profiler() is not None:
+                # started with TIMETRACKER_PROFILE, it writes the report on exit
+                messagebox.showinfo(
+                    "Profiling", "The session is already profiled, the report is written on exit.")
+                return
+            self.profiler = SessionProfiler(mode)
+            self.profiler.start()
+            self.debugmenu.entryconfig("Start profiling", label="Stop profiling")
+            return
+
+        self.profiler.stop()
+        self.debugmenu.entryconfig("Stop profiling", label="Start profiling")
+        data = [('text', '*.txt')]
+        filename = tk.filedialog.asksaveasfilename(
+            filetypes=data, defaultextension=data)
+        if filename:
+            self.profiler.write_report(filename)
+
+    def start_stall_detector(self, threshold=0.25):
+        '''starts the detection of main loop stalls
+
+        threshold: the latency in seconds which is logged as stall
+        '''
+        if self.stall_detector is None:
+            self.stall_detector = StallDetector(self.root, threshold=threshold)
+        self.stall_detector.start()
+
+    def show_stall_statistics(self):
+        '''shows the statistics of the main loop latency
+
+        the detector is started if it is not running
+        '''
+        if self.stall_detector is None or not self.stall_detector.running:
+            self.start_stall_detector()
+            messagebox.showinfo(
+                "Stall statistics", "Stall detection started. Stalls are logged to the console.")
+            return
+
+        stats = self.stall_detector.get_stats()
+        messagebox.showinfo("Stall statistics",
+                            f"Callbacks: {stats['ticks']}\n"
+                            f"Mean latency: {stats['mean_latency'] * 1000:.1f} ms\n"
+                            f"Max latency: {stats['max_latency'] * 1000:.1f} ms\n"
+                            f"Stalls (> {self.stall_detector.threshold * 1000:.0f} ms): {stats['stalls']}\n"
+                            f"Stalled time: {stats['stall_time']:.1f} s")
+
+    def show_memory_report(self):
+        '''shows the memory used by the study, the model objects and the figures
+
+        tracemalloc is started at the first report, so later reports show
+        the allocations since then
+        '''
+        new_window = tk.Toplevel(self.root)
+        new_window.title("Memory report")
+        new_window.transient(self.root)
+
+        self.memory_text = tk.Text(new_window, width=90, height=25)
+        self.memory_text.grid(row=0, column=0)
+        self.memory_text.insert(
+            tk.END, get_memory_report(self.tracker._study))
+        self.memory_text.config(state=tk.DISABLED)
+        start_memory_tracing()
+
     def edit_settings(self):
         '''edit the settings'''
 
@@ -346,8 +533,14 @@ class TimeTrackerGUI:
         self.duration_entry.grid(row=1, column=1, sticky='w')
         self.duration_var.set(self.tracker.settings.get("module_duration"))
 
+        self.prerender_var = tk.BooleanVar()
+        tk.Checkbutton(new_window, text="Prerender charts",
+                       variable=self.prerender_var).grid(row=2, column=0, columnspan=2, sticky='w')
+        self.prerender_var.set(
+            self.tracker.settings.get("prerender_charts", False))
+
         tk.Button(new_window, text="Save", command=self.save_settings).grid(
-            row=2, column=0, columnspan=2)
+            row=3, column=0, columnspan=2)
 
         # set position of the window
         center_x, center_y = self.get_center_position(new_window)
@@ -358,6 +551,8 @@ class TimeTrackerGUI:
         duration = int(self.duration_var.get())
         self.tracker.settings.set("module_ECTS", ects)
         self.tracker.settings.set("module_duration", duration)
+        self.tracker.settings.set("prerender_charts", self.prerender_var.get())
+        self.prerender_charts()
 
     def edit_semesters(self):
         '''edit the semesters
@@ -507,6 +702,7 @@ class TimeTrackerGUI:
         if started:
             self.start_stop_btn.config(text="Stop")
             self.current_duration_label.config(bg="lightgreen")
+            self.start_chart_refresh()
         else:
             self.start_stop_btn.config(text="Start")
             bgColor = self.root.cget("background")
@@ -545,6 +741,7 @@ class TimeTrackerGUI:
         self.category_combobox['values'] = self.tracker.get_category_names(
             semName=sem_name, modName=mod_name)
 
+    @instrumentation.timed("TimeTrackerGUI.update_treeview")
     def update_treeview(self):
         '''updates the treeview
 
@@ -572,15 +769,44 @@ class TimeTrackerGUI:
             tags = (self.tracker.get_object_id(semester),
                     self.tracker.get_object_id(module),
                     self.tracker.get_object_id(entry))
-            start_time = entry.start_time.strftime(
-                "%Y-%m-%d %H:%M:%S")
-            duration = str(entry.get_duration()).split('.')[
-                0]  # remove micros
+            start_time, duration = self.get_row_values(entry)
             self.tree.insert("", "end", text=semester.name,
                              values=(module.name, entry.category,
                                      entry.comment, start_time,
                                      duration), tags=tags)
 
+    def get_row_values(self, entry):
+        '''gets the formatted start time and duration of an entry
+
+        finished entries never change, therefore their values are cached
+        by the entry id. Running entries are formatted at every call.
+
+        entry: the entry to format
+
+        returns: start time and duration as strings
+        '''
+        values = self._row_cache.get(entry.id)
+        if values is not None:
+            return values
+
+        start_time = entry.start_time.strftime(
+            "%Y-%m-%d %H:%M:%S")
+        duration = str(entry.get_duration()).split('.')[
+            0]  # remove micros
+        values = (start_time, duration)
+        if entry.stop_time is not None:
+            self._row_cache[entry.id] = values
+        return values
+
+    def invalidate_row(self, entry):
+        '''removes the cached row values of an entry
+
+        callback for the tracker if an entry was edited or removed
+
+        entry: the entry which changed
+        '''
+        self._row_cache.pop(entry.id, None)
+
     def on_tree_item_click(self, event):
         '''click event of the treeview
 
@@ -694,10 +920,14 @@ class TimeTrackerGUI:
         if end != None:
             self.module_end.initialize_date_entry()
 
+    @instrumentation.timed("TimeTrackerGUI.generate_accordion")
     def generate_accordion(self, parent):
         '''generate an accordion
 
-        generates an accordion depending on the data of the tracker
+        generates an accordion depending on the data of the tracker.
+        The sections and elements are keyed by the ids of the semesters and
+        modules, so only the changed parts are added or removed. Nothing is
+        done if the study did not change since the last call.
 
         parent: the frame where the accordion is placed
         '''
@@ -706,48 +936,55 @@ class TimeTrackerGUI:
         if self.accordion is None:
             self.accordion = Accordion(parent)
             self.accordion.grid(row=0, column=0, sticky='ns')
+            self._accordion_version = None
+            # semester id -> (section, {module id -> element})
+            self._accordion_sections = {}
 
-        # remove deleted entries
-        semesterNames = self.tracker.get_semester_names()
-        for sec in self.accordion.sections:
-            if sec.name not in semesterNames:
-                # delete the section
-                self.accordion.remove_section(sec)
-                continue
-
-            moduleNames = self.tracker.get_module_names(sec.name)
-            for element in sec.sub_elements:
-                if element.name not in moduleNames:
-                    # delete the entry
-                    sec.remove_element(element)
+        if self._accordion_version == self.tracker.study_version:
+            return
+        self._accordion_version = self.tracker.study_version
+
+        semesters = {sem.id: sem for sem in self.tracker.get_semesters()}
+        changed = False
+        with self.accordion.batch_update():
+            # remove deleted entries
+            for sem_id, (section, elements) in list(self._accordion_sections.items()):
+                sem = semesters.get(sem_id)
+                if sem is None:
+                    # delete the section
+                    del self._accordion_sections[sem_id]
+                    self.accordion.remove_section(section)
+                    changed = True
                     continue
 
-        # add new entries
-        for sem in self.tracker.get_semesters():
-            foundSem = False
-            for sec in self.accordion.sections:
-                if sem.name == sec.name:
-                    # found the semester, check for the modules and continue with next semester
-                    foundSem = True
-                    for mod in self.tracker.get_modules(sem.name):
-                        foundMod = False
-                        for element in sec.sub_elements:
-                            if mod.name == element.name:
-                                # found the module continue with next module
-                                foundMod = True
-                                break
-                        if not foundMod:
-                            sec.add_element(
-                                mod.name, lambda mod=mod: self.print_chart(mod))
-                    break
-            if not foundSem:
-                section = self.accordion.add_section(
-                    sem.name, lambda sem=sem: self.print_chart(sem))
-                for mod in self.tracker.get_modules(sem.name):
-                    # add all modules because whole section was added
-                    section.add_element(
-                        mod.name, lambda mod=mod: self.print_chart(mod))
-        self.accordion.reorder()
+                module_ids = {mod.id for mod in sem.modules}
+                for mod_id in list(elements):
+                    if mod_id not in module_ids:
+                        # delete the entry
+                        section.remove_element(elements.pop(mod_id))
+                        changed = True
+
+            # add new entries
+            for sem_id, sem in semesters.items():
+                sem_key = self.tracker.get_object_id(sem)
+                if sem_id in self._accordion_sections:
+                    section, elements = self._accordion_sections[sem_id]
+                else:
+                    section = self.accordion.add_section(
+                        sem.name, lambda key=sem_key: self.print_chart_by_id(key))
+                    elements = {}
+                    self._accordion_sections[sem_id] = (section, elements)
+                    changed = True
+
+                for mod in sem.modules:
+                    if mod.id not in elements:
+                        elements[mod.id] = section.add_element(
+                            mod.name, lambda key=self.tracker.get_object_id(mod),
+                            parent_key=sem_key: self.print_chart_by_id(key, parent_key))
+                        changed = True
+
+            if changed:
+                self.accordion.reorder()
 
     def format_buttons(self, chart_type):
         '''formats the buttons based on the active chart type'''
@@ -766,28 +1003,158 @@ class TimeTrackerGUI:
         self.active_chart = chart_type
         self.print_chart(self.chart_scope)
 
+    def print_chart_by_id(self, obj_id, parent_id=None):
+        '''prints the chart of a serialized semester or module
+
+        the object is resolved at the time of the click, so the accordion
+        stays valid if the study was reloaded
+
+        obj_id: the id of the semester or module
+        parent_id: the id of the parent semester of a module
+        '''
+        parent = None
+        if parent_id is not None:
+            parent = self.tracker.get_object_by_id(parent_id)
+        scope = self.tracker.get_object_by_id(obj_id, parent)
+        if scope is not None:
+            self.print_chart(scope)
+
     def print_chart(self, scope):
         '''prints the chart
 
         generates the data depending on the scope, creates the chart defined
-        by the active chart type and plots it
+        by the active chart type and draws it into the persistent chart canvas
 
         scope: the data (study, Semester, Module) which will be printed
         '''
         self.chart_scope = scope
-        # prevent memory leak because matplotlib figure remains open
-        if self.chart:
-            self.chart.destroy()
+        if self.chart_canvas is None:
+            # matplotlib is imported at the first chart
+            from charts import ChartCanvas
+            self.chart_canvas = ChartCanvas(self.plot_frame)
+
+        # show the prerendered chart if it is up to date
+        png = self.get_prerendered_chart(scope)
+        if png is not None:
+            self.chart = None
+            self.chart_canvas.show_image(png)
+            return
 
         # create data depending on the chart type
         try:
             self.chart = self.tracker.generate_chart(scope, self.active_chart)
         except ValueError:
+            self.chart = None
+            self.chart_canvas.clear()
             messagebox.showerror(
                 "Error", "Chart could not be generated with the selected data!")
             return
 
-        self.chart.plot(self.plot_frame)
+        self.chart_canvas.show(self.chart)
+
+    def reset_chart(self):
+        '''removes the shown chart of the previous study
+
+        called when a study is loaded or created, so the chart and its scope
+        do not refer to the objects of the previous study anymore.
+        The scope is set to the new study.
+        '''
+        self.chart = None
+        self.chart_scope = self.tracker._study
+        if self.chart_canvas is not None:
+            self.chart_canvas.clear()
+
+    def refresh_chart(self):
+        '''updates the shown chart in place with the current data
+
+        the chart is cleared if its data can not be charted anymore.
+        A prerendered chart is replaced by a drawn chart.
+        '''
+        if self.chart is None:
+            if self.chart_canvas is not None and self.chart_canvas.image is not None:
+                self.redraw_prerendered_chart()
+            return
+
+        try:
+            self.tracker.update_chart(
+                self.chart, self.chart_scope, self.active_chart)
+        except ValueError:
+            self.chart = None
+            self.chart_canvas.clear()
+
+    def redraw_prerendered_chart(self):
+        '''draws the shown prerendered chart with the current data'''
+        try:
+            self.chart = self.tracker.generate_chart(
+                self.chart_scope, self.active_chart)
+        except ValueError:
+            self.chart = None
+            self.chart_canvas.clear()
+            return
+
+        self.chart_canvas.show(self.chart)
+
+    def prerender_charts(self):
+        '''schedules the rendering of all charts of the study
+
+        the charts are generated PRERENDER_DELAY after the last call,
+        so a burst of changes generates them only once
+        '''
+        if self._prerender_job is not None:
+            self.root.after_cancel(self._prerender_job)
+        self._prerender_job = self.root.after(
+            PRERENDER_DELAY, self.submit_charts)
+
+    def submit_charts(self):
+        '''generates all charts of the study and renders them in the background
+
+        only done if enabled in the settings and no tracking is running,
+        because the data of a running tracking changes continuously
+        '''
+        self._prerender_job = None
+        if not self.tracker.settings.get("prerender_charts", False):
+            if self.chart_prerenderer is not None:
+                self.chart_prerenderer.stop()
+                self.chart_prerenderer = None
+            return
+
+        if self.tracker.current_entry is not None:
+            return
+
+        if self.chart_prerenderer is None:
+            from charts import ChartPrerenderer
+            self.chart_prerenderer = ChartPrerenderer()
+        self.chart_prerenderer.submit(
+            self.tracker.study_version, self.tracker.generate_all_charts())
+
+    def get_prerendered_chart(self, scope):
+        '''gets the prerendered chart of the active chart type
+
+        scope: the data (study, Semester, Module) which will be printed
+
+        returns: the png or None if the chart is not prerendered or stale
+        '''
+        if self.chart_prerenderer is None or self.tracker.current_entry is not None:
+            return None
+        return self.chart_prerenderer.get(
+            self.tracker.get_chart_key(scope, self.active_chart),
+            self.tracker.study_version)
+
+    def start_chart_refresh(self):
+        '''starts the cyclic refresh of the chart while tracking'''
+        if self._chart_refresh_job is not None:
+            self.root.after_cancel(self._chart_refresh_job)
+        self._chart_refresh_job = self.root.after(
+            CHART_REFRESH_INTERVAL, self.refresh_chart_cyclic)
+
+    def refresh_chart_cyclic(self):
+        '''refreshes the shown chart while the tracking is running'''
+        self._chart_refresh_job = None
+        if self.tracker.current_entry is None:
+            return
+
+        self.refresh_chart()
+        self.start_chart_refresh()
 
     def get_center_position(self, window):
         '''get the center position of the window using the geometry of the root window'''
@@ -828,6 +1195,9 @@ class TimeTrackerGUI:
         '''
         try:
             self.tracker.import_from_json(filename)
+            self._row_cache.clear()
+            self.reset_chart()
+            self.prerender_charts()
             self.load_last_tracking()
         except FileNotFoundError as e:
             messagebox.showinfo(
@@ -843,7 +1213,16 @@ class TimeTrackerGUI:
         '''
         self.save_data()
 
-        if self.chart:
-            self.chart.destroy()
-            
+        if self._prerender_job is not None:
+            self.root.after_cancel(self._prerender_job)
+
+        if self.chart_prerenderer:
+            self.chart_prerenderer.stop()
+
+        if self.stall_detector:
+            self.stall_detector.stop()
+
+        if self.chart_canvas:
+            self.chart_canvas.destroy()
+
         self.root.destroy()
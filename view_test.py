@@ -1,10 +1,20 @@
 import unittest
 import tkinter as tk
 from model import Study
+import controller
 from controller import TimeTracker
+from settings import Settings
+import view
 from view import TimeTrackerGUI
+from charts import ChartType
 import datetime
 import os
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+import diagnostics
 from unittest.mock import patch
 
 
@@ -14,13 +24,17 @@ class TimeTrackerGUITest(unittest.TestCase):
         # Setup for GUI-Tests
         self.study = Study(ECTS=180, hoursPerECTS=30,
                            plannedEnd=datetime.datetime.now())
-        self.tracker = TimeTracker(self.study)
+        # the settings file is written to a temporary directory
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.tracker = TimeTracker(self.study, settings=Settings(
+            os.path.join(self.tmp_dir.name, "settings.json")))
         self.root = tk.Tk()
         self.root.withdraw()
         self.gui = TimeTrackerGUI(self.root, self.tracker)
 
     def tearDown(self):
         self.root.destroy()
+        self.tmp_dir.cleanup()
 
     def test_start_stop_button(self):
         # Simulate starting the tracking
@@ -63,10 +77,263 @@ class TimeTrackerGUITest(unittest.TestCase):
             self.gui.save_as()
             self.assertTrue(os.path.exists('test_tracker.json'))
 
+    def test_row_cache(self):
+        sem, mod, entry = self.tracker.add_new_entry(
+            "Semester1", "Module1", "Programming", "",
+            datetime.datetime(2024, 1, 1, 10, 0),
+            datetime.datetime(2024, 1, 1, 11, 30))
+
+        self.assertEqual(self.gui.get_row_values(entry),
+                         ("2024-01-01 10:00:00", "1:30:00"))
+        self.assertIn(entry.id, self.gui._row_cache)
+
+        # running entries are not cached
+        _, _, running = self.tracker.add_new_entry(
+            "Semester1", "Module1", "Programming", "",
+            datetime.datetime.now(), None)
+        self.gui.get_row_values(running)
+        self.assertNotIn(running.id, self.gui._row_cache)
+
+        # removing the entry invalidates the cache
+        self.gui.setup_observers()
+        self.tracker.remove_entry(sem, mod, entry)
+        self.assertNotIn(entry.id, self.gui._row_cache)
+
+    def test_generate_accordion(self):
+        start = datetime.datetime(2024, 1, 1, 10, 0)
+        stop = datetime.datetime(2024, 1, 1, 11, 0)
+        sem, mod1, entry1 = self.tracker.add_new_entry(
+            "Semester1", "Module1", "Programming", "", start, stop)
+        _, mod2, entry2 = self.tracker.add_new_entry(
+            "Semester1", "Module2", "Programming", "", start, stop)
+
+        self.gui.generate_accordion(self.gui.accordion_frame)
+        sections = self.gui.accordion.sections
+        self.assertEqual([s.name for s in sections], ["Semester1"])
+        self.assertEqual([e.name for e in sections[0].sub_elements],
+                         ["Module1", "Module2"])
+
+        # unchanged study keeps the existing elements
+        element = sections[0].sub_elements[0]
+        self.gui.generate_accordion(self.gui.accordion_frame)
+        self.assertIs(self.gui.accordion.sections[0].sub_elements[0], element)
+
+        # removed module is removed from the accordion
+        self.tracker.remove_entry(sem, mod2, entry2)
+        self.gui.generate_accordion(self.gui.accordion_frame)
+        self.assertEqual(
+            [e.name for e in self.gui.accordion.sections[0].sub_elements], ["Module1"])
+
+        # removed semester is removed from the accordion
+        self.tracker.remove_entry(sem, mod1, entry1)
+        self.gui.generate_accordion(self.gui.accordion_frame)
+        self.assertEqual(len(self.gui.accordion.sections), 0)
+
+    def test_print_chart(self):
+        start = datetime.datetime(2024, 1, 1, 10, 0)
+        sem, mod, _ = self.tracker.add_new_entry(
+            "Semester1", "Module1", "Programming", "", start,
+            start + datetime.timedelta(hours=1))
+
+        self.gui.active_chart = ChartType.PIE
+        self.gui.print_chart(sem)
+        chart_canvas = self.gui.chart_canvas
+        figure = chart_canvas.figure
+        self.assertEqual(figure.axes[0].get_title(), "Pie Chart for Semester1")
+
+        # the figure and canvas are reused for the next chart
+        self.gui.print_chart(mod)
+        self.assertIs(self.gui.chart_canvas, chart_canvas)
+        self.assertIs(chart_canvas.figure, figure)
+        self.assertEqual(len(figure.axes), 1)
+        self.assertEqual(figure.axes[0].get_title(), "Pie Chart for Module1")
+
+    def test_refresh_chart(self):
+        start = datetime.datetime(2024, 1, 1, 10, 0)
+        sem, _, _ = self.tracker.add_new_entry(
+            "Semester1", "Module1", "Programming", "", start,
+            start + datetime.timedelta(hours=1))
+        self.gui.setup_observers()
+        self.gui.active_chart = ChartType.PIE
+        self.gui.print_chart(sem)
+        chart = self.gui.chart
+
+        # changes of the study update the shown chart in place
+        self.tracker.add_new_entry(
+            "Semester1", "Module2", "Programming", "", start,
+            start + datetime.timedelta(hours=1))
+        self.assertIs(self.gui.chart, chart)
+        self.assertEqual(chart.labels, ["Module1", "Module2"])
+        self.assertEqual(len(self.gui.chart_canvas.figure.axes[0].patches), 2)
+
+    def test_load_data_resets_chart(self):
+        start = datetime.datetime(2024, 1, 1, 10, 0)
+        sem, _, _ = self.tracker.add_new_entry(
+            "Semester1", "Module1", "Programming", "", start,
+            start + datetime.timedelta(hours=1))
+        self.gui.setup_observers()
+        self.gui.active_chart = ChartType.PIE
+        self.gui.print_chart(sem)
+
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            filename = os.path.join(tmp_dir, "study.json")
+            self.tracker.export_to_json(filename)
+            self.gui.load_data(filename)
+
+        # the chart of the previous study is removed
+        self.assertIsNone(self.gui.chart)
+        self.assertIs(self.gui.chart_scope, self.tracker._study)
+        self.assertEqual(len(self.gui.chart_canvas.figure.axes), 0)
+
+        # changes of the loaded study do not update the old chart
+        self.tracker.add_new_entry(
+            "Semester1", "Module2", "Programming", "", start,
+            start + datetime.timedelta(hours=1))
+        self.assertIsNone(self.gui.chart)
+
+    def test_prerender_charts(self):
+        start = datetime.datetime(2024, 1, 1, 10, 0)
+        sem, _, _ = self.tracker.add_new_entry(
+            "Semester1", "Module1", "Programming", "", start,
+            start + datetime.timedelta(hours=1))
+        self.gui.setup_observers()
+        self.gui.active_chart = ChartType.PIE
+
+        # disabled by default
+        self.gui.submit_charts()
+        self.assertIsNone(self.gui.chart_prerenderer)
+
+        self.tracker.settings.settings["prerender_charts"] = True
+        self.gui.submit_charts()
+        self.assertTrue(self.gui.chart_prerenderer.wait(timeout=30))
+
+        # the prerendered chart is shown
+        self.gui.print_chart(sem)
+        self.assertIsNotNone(self.gui.chart_canvas.image)
+        self.assertIsNone(self.gui.chart)
+
+        # a change of the study draws the chart with the new data
+        self.tracker.add_new_entry(
+            "Semester1", "Module2", "Programming", "", start,
+            start + datetime.timedelta(hours=1))
+        self.assertIsNone(self.gui.chart_canvas.image)
+        self.assertEqual(self.gui.chart.labels, ["Module1", "Module2"])
+
+        self.tracker.settings.settings["prerender_charts"] = False
+        self.gui.submit_charts()
+        self.assertIsNone(self.gui.chart_prerenderer)
+
+    def test_prerender_charts_debounced(self):
+        self.tracker.settings.settings["prerender_charts"] = True
+        self.gui.setup_observers()
+        start = datetime.datetime(2024, 1, 1, 10, 0)
+        with patch.object(self.tracker, 'generate_all_charts',
+                          wraps=self.tracker.generate_all_charts) as generate:
+            # a burst of changes is not rendered on the Tk thread
+            for i in range(3):
+                self.tracker.add_new_entry(
+                    "Semester1", f"Module{i}", "Programming", "", start,
+                    start + datetime.timedelta(hours=1))
+            generate.assert_not_called()
+            self.assertIsNotNone(self.gui._prerender_job)
+
+            # the charts are generated once after the delay
+            time.sleep(view.PRERENDER_DELAY / 1000 + 0.2)
+            self.root.update()
+            self.assertEqual(generate.call_count, 1)
+            self.assertIsNone(self.gui._prerender_job)
+        self.assertTrue(self.gui.chart_prerenderer.wait(timeout=30))
+
+    def test_show_instrumentation(self):
+        with patch.object(controller.instrumentation, 'enabled', True):
+            controller.instrumentation.reset()
+            self.gui.update_treeview()
+            self.gui.show_instrumentation()
+            self.assertIn("TimeTrackerGUI.update_treeview",
+                          self.gui.instrumentation_text.get("1.0", tk.END))
+            controller.instrumentation.reset()
+
+    def test_toggle_profiling(self):
+        self.gui.toggle_profiling()
+        self.assertTrue(self.gui.profiler.running)
+        self.assertEqual(self.gui.debugmenu.entrycget(1, "label"), "Stop profiling")
+
+        self.gui.update_treeview()
+        with patch('tkinter.filedialog.asksaveasfilename', return_value=''):
+            self.gui.toggle_profiling()
+        self.assertFalse(self.gui.profiler.running)
+        self.assertIn("update_treeview", self.gui.profiler.get_report())
+        self.assertEqual(self.gui.debugmenu.entrycget(1, "label"), "Start profiling")
+
+    def test_toggle_profiling_session_profiler(self):
+        # the session profiler of TIMETRACKER_PROFILE is running
+        session_profiler = diagnostics.SessionProfiler()
+        session_profiler.start()
+        try:
+            with patch('tkinter.messagebox.showinfo') as showinfo:
+                self.gui.toggle_profiling()
+            showinfo.assert_called_once()
+            self.assertIsNone(self.gui.profiler)
+            self.assertEqual(self.gui.debugmenu.entrycget(1, "label"), "Start profiling")
+        finally:
+            session_profiler.stop()
+
+    def test_show_stall_statistics(self):
+        with patch('tkinter.messagebox.showinfo') as showinfo:
+            self.gui.show_stall_statistics()
+            self.assertTrue(self.gui.stall_detector.running)
+            self.gui.show_stall_statistics()
+            self.assertIn("Stalls", showinfo.call_args[0][1])
+        self.gui.stall_detector.stop()
+
+    def test_print_chart_memory(self):
+        start = datetime.datetime(2024, 1, 1, 10, 0)
+        sem, mod, _ = self.tracker.add_new_entry(
+            "Semester1", "Module1", "Programming", "", start,
+            start + datetime.timedelta(hours=1))
+        self.gui.active_chart = ChartType.PIE
+        self.gui.print_chart(sem)
+        self.root.update_idletasks()
+        figures = diagnostics.count_figures()
+        widgets = len(self.gui.plot_frame.winfo_children())
+
+        # switching the charts does not create figures or widgets
+        for _ in range(10):
+            self.gui.active_chart = ChartType.BURNDOWN
+            self.gui.print_chart(sem)
+            self.gui.active_chart = ChartType.PIE
+            self.gui.print_chart(sem)
+            self.gui.print_chart(mod)
+        self.root.update_idletasks()
+        self.assertEqual(diagnostics.count_figures(), figures)
+        self.assertEqual(len(self.gui.plot_frame.winfo_children()), widgets)
+
+    def test_show_memory_report(self):
+        self.tracker.add_new_entry(
+            "Semester1", "Module1", "Programming", "", datetime.datetime(2024, 1, 1, 10, 0),
+            datetime.datetime(2024, 1, 1, 11, 0))
+        try:
+            self.gui.show_memory_report()
+            self.assertIn("Semester1", self.gui.memory_text.get("1.0", tk.END))
+        finally:
+            tracemalloc.stop()
+
     def test_edit_semesters(self):
         self.gui.edit_semesters()
         self.assertIsNotNone(self.gui.edit_semester_tree)
 
 
+class LazyImportTest(unittest.TestCase):
+
+    def test_lazy_import(self):
+        '''the charting and calendar dependencies are not imported at startup'''
+        code = ("import sys, view; "
+                "print(sorted({'matplotlib', 'numpy', 'tkcalendar', 'charts'} & set(sys.modules)))")
+        result = subprocess.run([sys.executable, "-c", code], capture_output=True,
+                                text=True, cwd=os.path.dirname(os.path.abspath(__file__)))
+        self.assertEqual(result.returncode, 0, result.stderr)
+        self.assertEqual(result.stdout.strip(), "[]")
+
+
 if __name__ == '__main__':
     unittest.main()